@@ -0,0 +1,69 @@
+"""
+净值解析微基准
+对比快速路径与 BeautifulSoup 完整解析的耗时，并校验两者输出一致
+
+benchmarks/pages 下是按天天基金网基金主页结构生成的合成页面（导航、样式表、脚本按模板重复填充，
+dataOfFund 区块与真实页面一致），不是保存的真实页面，加速比只反映合成页面上的结果；
+真实页面的加速比请保存基金主页后作为参数传入测量
+
+用法:
+    python benchmarks/bench_nav_parse.py                # 使用 benchmarks/pages 下的合成页面
+    python benchmarks/bench_nav_parse.py page1.html ... # 指定页面（如保存的真实基金主页）
+"""
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.nav_parser import extract_nav_bs4, extract_nav_fast
+
+PAGES_DIR = Path(__file__).parent / "pages"
+
+
+def time_parser(parser: Callable, pages: List[str], rounds: int) -> float:
+    """返回单页平均耗时（微秒）"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for page in pages:
+            parser(page)
+    elapsed = time.perf_counter() - start
+    return elapsed / (rounds * len(pages)) * 1e6
+
+
+def main():
+    paths = [Path(p) for p in sys.argv[1:]] or sorted(PAGES_DIR.glob("*.html"))
+    if not paths:
+        print(f"没有找到页面: {PAGES_DIR}")
+        sys.exit(1)
+
+    pages = [path.read_text(encoding='utf-8') for path in paths]
+
+    # 校验输出一致
+    mismatches = 0
+    for path, page in zip(paths, pages):
+        fast = extract_nav_fast(page)
+        full = extract_nav_bs4(page)
+        status = "✅" if fast == full else "❌"
+        if fast != full:
+            mismatches += 1
+        print(f"{status} {path.name}: fast={fast} bs4={full}")
+
+    rounds = 20
+    fast_us = time_parser(extract_nav_fast, pages, rounds)
+    bs4_us = time_parser(extract_nav_bs4, pages, rounds)
+
+    source = "合成页面" if not sys.argv[1:] else "指定页面"
+    print(f"\n页面数: {len(pages)}（{source}），每页 {rounds} 轮")
+    print(f"快速路径:      {fast_us:10.1f} µs/页")
+    print(f"BeautifulSoup: {bs4_us:10.1f} µs/页")
+    print(f"加速比:        {bs4_us / fast_us:10.1f}x")
+
+    if mismatches:
+        print(f"\n❌ {mismatches} 个页面输出不一致")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""
+LOF 扫描流程基准测试
+在回放的 HTTP 档案上分阶段测量一次扫描的耗时和内存：
+
+    fetch_parse    _get_lof_from_eastmoney（行情 JSON + 基金主页净值解析）
+    check          LOFArbitrage.check_arbitrage_opportunity（模拟模式，含机会记录）
+    notify_format  NotificationManager 套利机会与交易通知的格式化
+    place_order    SimulatedBroker.place_order
+
+每个阶段报告吞吐量、单次耗时 p50/p99 和内存（峰值、每次调用的留存字节数）。
+基准结果保存在 benchmarks/baseline.json，--compare 时超出容差即视为性能退化（退出码 1）。
+耗时与机器相关，更换机器后先用 --save-baseline 重新生成基准。
+
+用法:
+    python benchmarks/bench_scan.py                      # 5/50/500 只基金
+    python benchmarks/bench_scan.py --compare            # 与基准比较
+    python benchmarks/bench_scan.py --save-baseline      # 更新基准
+    python benchmarks/bench_scan.py --fixture scan.jsonl.gz  # 使用录制的真实档案
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.api.broker_base import OrderType
+from src.api.sim_broker import SimulatedBroker
+from src.strategies.lof_arbitrage import LOFArbitrage
+from src.utils.data_fetcher import DataFetcher
+from src.utils.http_fixtures import FixtureArchive, ReplayAdapter
+from src.utils.logger import log
+from src.utils.notifier import NotificationManager, NotifierBase
+from src.utils.nav_parser import parse_nav
+from src.utils.quote import Quote
+
+PAGES_DIR = Path(__file__).parent / "pages"
+BASELINE_FILE = Path(__file__).parent / "baseline.json"
+
+SIZES = (5, 50, 500)
+# 溢价率循环取值：其中 2/5 的基金超过默认阈值，覆盖机会与非机会两条路径
+PREMIUMS = (-0.02, -0.005, 0.0, 0.005, 0.02)
+
+STRATEGY_CONFIG = {
+    'min_premium_rate': 0.015,
+    'min_discount_rate': 0.01,
+    'nav_cache': {'enabled': False},
+    'fund_meta': {'enabled': False},
+}
+
+
+class NullNotifier(NotifierBase):
+    """只格式化、不发送的通知渠道"""
+
+    def __init__(self):
+        self.sent = 0
+
+    def send(self, title: str, message: str, **kwargs) -> bool:
+        self.sent += 1
+        return True
+
+
+def build_archive(size: int) -> Tuple[FixtureArchive, List[str]]:
+    """按 benchmarks/pages 下的基金主页生成 size 只基金的回放档案（结果确定）"""
+    pages = sorted(PAGES_DIR.glob("*.html"))
+    bodies = [page.read_bytes() for page in pages]
+    navs = [parse_nav(body.decode('utf-8'))[0] for body in bodies]
+
+    archive = FixtureArchive()
+    codes = []
+    for i in range(size):
+        code = str(160000 + i)
+        codes.append(code)
+        page = i % len(pages)
+        price = round(navs[page] * (1 + PREMIUMS[i % len(PREMIUMS)]), 3)
+
+        quote = {'rc': 0, 'data': {'f43': int(price * 1000), 'f47': 1000 + i, 'f58': f'基金{code}'}}
+        archive.add(
+            'GET', f"{DataFetcher.PUSH_HOST}/api/qt/stock/get?secid=0.{code}", 200,
+            {'Content-Type': 'application/json; charset=utf-8'},
+            json.dumps(quote, ensure_ascii=False).encode('utf-8'), 0.0
+        )
+        archive.add(
+            'GET', f"{DataFetcher.FUND_HOST}/{code}.html", 200,
+            {'Content-Type': 'text/html; charset=utf-8'}, bodies[page], 0.0
+        )
+
+    return archive, codes
+
+
+def codes_from_archive(archive: FixtureArchive) -> List[str]:
+    """录制档案中出现的基金代码（按单只行情请求）"""
+    codes = []
+    for entry in archive.entries:
+        if '/api/qt/stock/get?secid=' in entry['url']:
+            codes.append(entry['url'].rsplit('.', 1)[1])
+    return list(dict.fromkeys(codes))
+
+
+def measure(ops: Sequence, func: Callable, rounds: int, setup: Callable = None) -> Dict:
+    """
+    测量一个阶段
+
+    Args:
+        ops: 每轮依次传给 func 的参数
+        rounds: 轮数（小规模时多跑几轮，让 p99 有足够样本）
+        setup: 每轮开始前调用（重置状态）
+    """
+    latencies = []
+    total = 0.0
+    for _ in range(rounds):
+        if setup:
+            setup()
+        for op in ops:
+            start = time.perf_counter()
+            func(op)
+            elapsed = time.perf_counter() - start
+            latencies.append(elapsed)
+            total += elapsed
+
+    # 内存单独测一轮（tracemalloc 会拖慢耗时测量）
+    if setup:
+        setup()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    for op in ops:
+        func(op)
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        'ops_per_sec': round(len(latencies) / total, 1),
+        'p50_us': round(statistics.median(latencies) * 1e6, 2),
+        'p99_us': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1e6, 2),
+        'peak_kb': round((peak - before) / 1024, 1),
+        'retained_bytes_per_op': round((after - before) / len(ops), 1),
+    }
+
+
+def run_size(archive: FixtureArchive, codes: List[str]) -> Dict[str, Dict]:
+    """对一组基金跑全部阶段"""
+    size = len(codes)
+    rounds = max(3, 1000 // size)
+
+    fetcher = DataFetcher(source="eastmoney")
+    replay = ReplayAdapter(archive)
+    fetcher.session.mount('http://', replay)
+    fetcher.session.mount('https://', replay)
+
+    results = {}
+    results['fetch_parse'] = measure(codes, fetcher._get_lof_from_eastmoney, rounds)
+
+    quotes: List[Quote] = [q for q in map(fetcher._get_lof_from_eastmoney, codes) if q]
+
+    broker = SimulatedBroker(initial_cash=1e9)
+    broker.connect()
+    strategy = LOFArbitrage(broker, dict(STRATEGY_CONFIG, watchlist=codes), simulate=True)
+    strategy.notifier = None
+    results['check'] = measure(
+        quotes, strategy.check_arbitrage_opportunity, rounds,
+        setup=strategy.opportunities.clear
+    )
+
+    notifier = NotificationManager({'enabled': False})
+    notifier.notifiers = [NullNotifier()]
+
+    def notify(quote: Quote):
+        notifier.send_quote_opportunity(quote, "premium" if quote.premium_rate > 0 else "discount")
+        notifier.send_trade(quote.code, quote.name, "买入", 100, quote.price, quote.price * 100)
+
+    results['notify_format'] = measure(quotes, notify, rounds)
+
+    def reset_broker():
+        broker.reset()
+        broker.cash = 1e9
+
+    results['place_order'] = measure(
+        quotes,
+        lambda quote: broker.place_order(quote.code, OrderType.BUY, 100, quote.price),
+        rounds, setup=reset_broker
+    )
+
+    return results
+
+
+def compare(results: Dict, baseline: Dict, time_tolerance: float, memory_tolerance: float) -> List[str]:
+    """与基准比较，返回退化项"""
+    regressions = []
+    for size, stages in results.items():
+        for stage, current in stages.items():
+            base = baseline.get(size, {}).get(stage)
+            if not base:
+                continue
+            if current['p50_us'] > base['p50_us'] * (1 + time_tolerance):
+                regressions.append(f"{stage}@{size}: p50 {base['p50_us']} -> {current['p50_us']} µs")
+            # 峰值内存很小时噪声占比大，留 16KB 余量
+            if current['peak_kb'] > base['peak_kb'] * (1 + memory_tolerance) + 16:
+                regressions.append(f"{stage}@{size}: 峰值内存 {base['peak_kb']} -> {current['peak_kb']} KB")
+    return regressions
+
+
+def print_results(results: Dict):
+    print(f"{'阶段':<14}{'基金数':>8}{'吞吐(次/秒)':>14}{'p50(µs)':>12}{'p99(µs)':>12}{'峰值(KB)':>12}{'留存(B/次)':>12}")
+    for size, stages in results.items():
+        for stage, r in stages.items():
+            print(
+                f"{stage:<14}{size:>8}{r['ops_per_sec']:>14.1f}{r['p50_us']:>12.2f}"
+                f"{r['p99_us']:>12.2f}{r['peak_kb']:>12.1f}{r['retained_bytes_per_op']:>12.1f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='LOF 扫描流程基准测试')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES), help='监控基金数')
+    parser.add_argument('--fixture', type=str, help='录制的 HTTP 档案（默认按保存的页面生成）')
+    parser.add_argument('--compare', action='store_true', help='与 baseline.json 比较')
+    parser.add_argument('--save-baseline', action='store_true', help='保存为 baseline.json')
+    parser.add_argument('--time-tolerance', type=float, default=0.5, help='p50 允许的退化比例')
+    parser.add_argument('--memory-tolerance', type=float, default=0.25, help='峰值内存允许的退化比例')
+    args = parser.parse_args()
+
+    # 只测量业务代码，不测量日志输出
+    log.remove()
+
+    results = {}
+    if args.fixture:
+        archive = FixtureArchive.load(args.fixture)
+        codes = codes_from_archive(archive)
+        results[str(len(codes))] = run_size(archive, codes)
+    else:
+        for size in args.sizes:
+            archive, codes = build_archive(size)
+            results[str(size)] = run_size(archive, codes)
+
+    print_results(results)
+
+    if args.save_baseline:
+        BASELINE_FILE.write_text(json.dumps(results, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+        print(f"\n已保存基准: {BASELINE_FILE}")
+
+    if args.compare:
+        if not BASELINE_FILE.exists():
+            print(f"\n基准文件不存在: {BASELINE_FILE}")
+            sys.exit(1)
+
+        baseline = json.loads(BASELINE_FILE.read_text(encoding='utf-8'))
+        regressions = compare(results, baseline, args.time_tolerance, args.memory_tolerance)
+        if regressions:
+            print("\n❌ 性能退化:")
+            for item in regressions:
+                print(f"  {item}")
+            sys.exit(1)
+        print("\n✅ 未发现性能退化")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,6 +18,9 @@ from src.strategies.lof_arbitrage import LOFArbitrage
 from src.strategies.bond_ipo import BondIPO
 from src.utils.logger import log
 from src.utils.data_fetcher import DataFetcher
+from src.utils.metrics import configure_metrics, metrics
+from src.utils.metrics_server import start_metrics_server
+from src.utils.rate_limiter import configure_governor
 
 
 def load_config(config_path: str = "config/strategy.yml") -> dict:
@@ -80,6 +83,13 @@ def main():
     log.info(f"券商: {args.broker}")
     log.info(f"模拟模式: {simulate}")
 
+    # 进程内所有 DataFetcher 共享的请求限速
+    configure_governor(common_config.get('rate_limit'))
+
+    # 扫描各阶段耗时统计（定期输出，退出时再输出一次）和可选的 /metrics 接口
+    configure_metrics(common_config.get('metrics'))
+    metrics_server = start_metrics_server(common_config.get('metrics', {}).get('server'))
+
     # 创建券商客户端
     if args.broker == 'sim' or simulate:
         # 模拟券商
@@ -163,6 +173,7 @@ def main():
                 if s['name'] == '可转债打新':
                     s['instance'].daily_check()
 
+        metrics.dump()
         log.info("测试完成")
         sys.exit(0)
 
@@ -190,6 +201,9 @@ def main():
         for s in strategies:
             s['instance'].stop()
 
+        metrics.dump()
+        if metrics_server:
+            metrics_server.stop()
         log.info("所有策略已停止")
 
 
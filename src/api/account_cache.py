@@ -0,0 +1,149 @@
+"""
+账户状态缓存
+在券商接口前缓存余额和持仓（按代码索引），按 TTL 刷新，成交时就地更新，
+策略每次发现机会时不必再往返券商（同花顺等 GUI 自动化读取很慢）
+"""
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from src.api.broker_base import BrokerBase, OrderType
+from src.utils.logger import log
+from src.utils.metrics import metrics
+
+
+class AccountStateCache:
+    """
+    账户状态缓存
+
+    - balance() / position(code) 在 TTL 内直接返回缓存（持仓按代码 O(1) 查找）
+    - 通过 place_order() 下单：成交（filled）时按成交数量和成交价（券商回报的 price，
+      没有时取限价）更新缓存，已报未成（submitted）或无法确定成交价时使缓存失效，下次读取重新查询券商
+    - 买入当日不可卖出（T+1），成交后只增加持仓数量，不增加可用数量
+    """
+
+    def __init__(
+        self,
+        broker: BrokerBase,
+        ttl: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            broker: 券商接口
+            ttl: 缓存有效期（秒）
+            clock: 单调时钟
+        """
+        self.broker = broker
+        self.ttl = ttl
+        self.clock = clock
+
+        self._balance: Optional[Dict] = None
+        self._positions: Optional[Dict[str, Dict]] = None
+        self._balance_at = 0.0
+        self._positions_at = 0.0
+        self._lock = threading.RLock()
+
+    def _expired(self, loaded_at: float) -> bool:
+        return self.clock() - loaded_at >= self.ttl
+
+    def balance(self) -> Dict:
+        """账户余额（格式同 BrokerBase.get_balance）"""
+        with self._lock:
+            if self._balance is None or self._expired(self._balance_at):
+                metrics.inc('account_cache', {'kind': 'balance', 'result': 'refresh'})
+                with metrics.span('broker.get_balance'):
+                    self._balance = dict(self.broker.get_balance())
+                self._balance_at = self.clock()
+            else:
+                metrics.inc('account_cache', {'kind': 'balance', 'result': 'hit'})
+            return dict(self._balance)
+
+    def _load_positions(self) -> Dict[str, Dict]:
+        """缓存的持仓（过期时重新查询券商），调用方持有 self._lock，不得修改返回值"""
+        if self._positions is None or self._expired(self._positions_at):
+            metrics.inc('account_cache', {'kind': 'position', 'result': 'refresh'})
+            with metrics.span('broker.get_position'):
+                positions = self.broker.get_position()
+            self._positions = {p['code']: dict(p) for p in positions}
+            self._positions_at = self.clock()
+        else:
+            metrics.inc('account_cache', {'kind': 'position', 'result': 'hit'})
+        return self._positions
+
+    def positions(self) -> Dict[str, Dict]:
+        """全部持仓 {代码: 持仓}（持仓格式同 BrokerBase.get_position 的元素，返回副本）"""
+        with self._lock:
+            return {code: dict(position) for code, position in self._load_positions().items()}
+
+    def position(self, code: str) -> Optional[Dict]:
+        """单只证券的持仓，没有持仓时返回 None"""
+        with self._lock:
+            position = self._load_positions().get(code)
+            return dict(position) if position else None
+
+    def invalidate(self):
+        """使缓存失效，下次读取时重新查询券商"""
+        with self._lock:
+            self._balance = None
+            self._positions = None
+
+    def place_order(
+        self,
+        code: str,
+        order_type: OrderType,
+        quantity: int,
+        price: Optional[float] = None
+    ) -> Dict:
+        """下单并按结果更新缓存（参数和返回值同 BrokerBase.place_order）"""
+        with metrics.span('broker.place_order'):
+            order = self.broker.place_order(code, order_type, quantity, price)
+
+        status = order.get('status')
+        # 成交价优先取券商回报（市价单），其次为限价
+        fill_price = order.get('price', price)
+        if status == 'filled' and fill_price is not None:
+            self.on_fill(code, order_type, quantity, fill_price)
+        elif status != 'rejected':
+            # 已报未成或成交价未知：以券商为准
+            self.invalidate()
+        return order
+
+    def on_fill(self, code: str, order_type: OrderType, quantity: int, price: float):
+        """
+        按成交回报更新缓存
+
+        缓存尚未加载的部分不做处理（下次读取时会从券商加载最新状态）
+        """
+        amount = quantity * price
+        sign = 1 if order_type == OrderType.BUY else -1
+
+        with self._lock:
+            if self._balance is not None:
+                balance = self._balance
+                balance['available'] = balance.get('available', 0) - sign * amount
+                balance['cash'] = balance.get('cash', 0) - sign * amount
+                balance['market_value'] = balance.get('market_value', 0) + sign * amount
+
+            if self._positions is not None:
+                position = self._positions.get(code)
+                if position is None:
+                    if order_type != OrderType.BUY:
+                        # 缓存中没有却卖出成功，缓存已不可信
+                        log.warning(f"成交回报与缓存持仓不一致: {code}，重新加载账户状态")
+                        self.invalidate()
+                        return
+                    position = self._positions[code] = {
+                        'code': code, 'name': '', 'quantity': 0, 'available': 0,
+                        'cost': 0.0, 'current_price': price, 'market_value': 0.0,
+                    }
+
+                if order_type == OrderType.BUY:
+                    held = position.get('quantity', 0)
+                    position['cost'] = (position.get('cost', 0) * held + amount) / (held + quantity)
+                    position['quantity'] = held + quantity
+                else:
+                    position['quantity'] = position.get('quantity', 0) - quantity
+                    position['available'] = position.get('available', 0) - quantity
+                position['current_price'] = price
+                position['market_value'] = position['quantity'] * price
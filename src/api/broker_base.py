@@ -89,6 +89,7 @@ class BrokerBase(ABC):
                 'order_id': '12345',
                 'status': 'submitted',  # submitted, filled, rejected
                 'message': '下单成功',
+                'price': 2.523,         # 成交价（可选，仅 filled 时）
             }
         """
         pass
@@ -154,7 +154,8 @@ class SimulatedBroker(BrokerBase):
         return {
             'order_id': order_id,
             'status': 'filled',
-            'message': '模拟成交'
+            'message': '模拟成交',
+            'price': price
         }
 
     def cancel_order(self, order_id: str) -> bool:
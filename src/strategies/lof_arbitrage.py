@@ -4,13 +4,27 @@ LOF 基金套利策略
 """
 import time
 import yaml
-from typing import Dict, List, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
 
+from src.api.account_cache import AccountStateCache
 from src.api.broker_base import BrokerBase, OrderType
+from src.utils.cost_model import CostModel, load_cost_model
 from src.utils.data_fetcher import DataFetcher
+from src.utils.evaluator import DISCOUNT, PREMIUM, OpportunityEvaluator
+from src.utils.fund_meta import FundMetaStore
+from src.utils.fund_scheduler import FundScheduler
+from src.utils.iopv import IOPVEngine, load_iopv_engine
 from src.utils.logger import log
+from src.utils.metrics import metrics
+from src.utils.nav_cache import NavCache
 from src.utils.notifier import NotificationManager
+from src.utils.opportunity_store import OpportunityStore
+from src.utils.quote import Opportunity, Quote, QuoteBatch
+from src.utils.quote_stream import QuoteStream, StreamError
+from src.utils.scheduler import FixedRateScheduler
+from src.utils.trading_calendar import CST, SessionPacer, TradingCalendar, load_holidays
+from src.utils.universe import LOFUniverse
 
 
 class LOFArbitrage:
@@ -25,23 +39,204 @@ class LOFArbitrage:
         self.broker = broker
         self.config = config
         self.simulate = simulate
-        self.data_fetcher = DataFetcher(source=config.get('common', {}).get('data_source', 'eastmoney'))
+
+        # 余额和持仓缓存（TTL 内不再往返券商，成交时就地更新）
+        self.account = AccountStateCache(
+            broker,
+            ttl=config.get('account_cache', {}).get('ttl_seconds', 30)
+        )
 
         # 策略参数
         self.enabled = config.get('enabled', True)
         self.interval = config.get('interval_seconds', 60)
+        self.max_concurrency = config.get('max_concurrency', 1)
         self.min_premium_rate = config.get('min_premium_rate', 0.015)
         self.min_discount_rate = config.get('min_discount_rate', 0.01)
         self.min_trade_amount = config.get('min_trade_amount', 1000)
         self.max_trade_amount = config.get('max_trade_amount', 20000)
         self.watchlist = config.get('watchlist', [])
 
+        # 基金元数据（启动时从磁盘整体加载）
+        self.fund_meta = self._init_fund_meta()
+
+        # 交易成本模型（按基金、按金额档位预先计算的成本率表）
+        self.cost_config = config.get('costs', {})
+        self.costs = self._init_costs()
+
+        # 套利机会判定（整批按列判定，可按基金覆盖阈值）
+        # 启用成本模型时按扣除成本后的净收益判定，min_premium_rate / min_discount_rate 只用于初筛
+        self.evaluator = OpportunityEvaluator(
+            self.cost_config.get('min_premium_edge', 0.003) if self.costs else self.min_premium_rate,
+            self.cost_config.get('min_discount_edge', 0.003) if self.costs else self.min_discount_rate,
+            overrides=config.get('fund_thresholds')
+        )
+
+        # 交易日历（交易阶段调度、净值缓存和估算净值的基准日期共用）
+        self.calendar = self._init_calendar()
+
+        self.data_fetcher = DataFetcher(
+            source=config.get('data_source', config.get('common', {}).get('data_source', 'eastmoney')),
+            max_workers=self.max_concurrency,
+            nav_cache=self._init_nav_cache(),
+            transport=config.get('transport'),
+            hedge=config.get('hedge'),
+            fund_meta=self.fund_meta
+        )
+
+        # 熔断器状态、对冲统计和净值缓存命中数在导出指标时读取
+        self.data_fetcher.register_metrics()
+        if self.data_fetcher.nav_cache:
+            nav_cache = self.data_fetcher.nav_cache
+            metrics.register(
+                'nav_cache_lookups',
+                lambda: [({'result': 'hit'}, nav_cache.hits), ({'result': 'miss'}, nav_cache.misses)],
+                kind='counter',
+                help='净值缓存查询次数（按是否命中）'
+            )
+
+        # 全市场 LOF 筛选
+        self.universe = self._init_universe()
+
+        # 估算净值（IOPV）引擎
+        self.iopv = self._init_iopv()
+
         # 通知系统
         self.notifier = self._init_notifier()
 
+        # 行情推送（SSE），失败时回退到轮询
+        self.stream_config = config.get('stream', {})
+        self.quote_stream: Optional[QuoteStream] = None
+
+        # 交易阶段感知的扫描间隔（休市时不扫描）
+        self.pacer = self._init_pacer()
+
+        # 按溢价率离阈值的远近决定每只基金的轮询频率
+        self.priority_config = config.get('priority_scan', {})
+        self.fund_scheduler = self._init_fund_scheduler()
+        self._codes_synced_at: Optional[float] = None
+
+        # 轮询扫描按固定节拍执行（周期不随扫描耗时漂移）
+        self.scheduler = FixedRateScheduler(
+            self.interval,
+            name="lof_scan",
+            interval_fn=self._next_interval if self.pacer or self.fund_scheduler else None
+        )
+
         # 运行状态
         self.running = False
-        self.opportunities = []  # 记录套利机会
+        # 套利机会记录（内存只保留最近的记录，全部历史追加写入 SQLite）
+        self.opportunities = self._init_opportunity_store()
+
+    def _init_nav_cache(self) -> Optional[NavCache]:
+        """初始化净值缓存"""
+        cache_config = self.config.get('nav_cache', {})
+        if not cache_config.get('enabled', True):
+            return None
+
+        return NavCache(
+            path=cache_config.get('path', 'data/nav_cache.json'),
+            publish_hour=cache_config.get('publish_hour', 18),
+            recheck_minutes=cache_config.get('recheck_minutes', 30),
+            calendar=self.calendar,
+            publish_lags=cache_config.get('publish_lag_days')
+        )
+
+    def _init_fund_meta(self) -> Optional[FundMetaStore]:
+        """初始化基金元数据存储"""
+        meta_config = self.config.get('fund_meta', {})
+        if not meta_config.get('enabled', True):
+            return None
+
+        return FundMetaStore(
+            path=meta_config.get('path', 'data/fund_meta.db'),
+            max_age_hours=meta_config.get('max_age_hours', 24 * 7)
+        )
+
+    def _init_opportunity_store(self) -> OpportunityStore:
+        """初始化套利机会存储（未配置 path 时只保留内存中的最近记录）"""
+        store_config = self.config.get('opportunity_store', {})
+        return OpportunityStore(
+            path=store_config.get('path'),
+            capacity=store_config.get('capacity', 1000),
+            flush_interval=store_config.get('flush_interval', 1.0),
+            batch_size=store_config.get('batch_size', 100)
+        )
+
+    def _init_costs(self) -> Optional[CostModel]:
+        """初始化交易成本模型"""
+        if not self.cost_config.get('enabled', False):
+            return None
+
+        return load_cost_model(self.cost_config, self.fund_meta)
+
+    def _meta_codes(self) -> List[str]:
+        """需要维护元数据的基金：监控列表 + 全市场基金池"""
+        codes = list(self.watchlist)
+        if self.universe is not None and not self.universe.frame.empty:
+            codes += self.universe.frame['code'].tolist()
+        return codes
+
+    def _init_universe(self) -> Optional[LOFUniverse]:
+        """初始化全市场 LOF 基金池"""
+        universe_config = self.config.get('universe', {})
+        if not universe_config.get('enabled', False):
+            return None
+
+        return LOFUniverse(
+            self.data_fetcher,
+            nav_cache=self.data_fetcher.nav_cache,
+            min_volume=universe_config.get('min_volume', 100),
+            near_ratio=universe_config.get('near_ratio', 0.5),
+            max_candidates=universe_config.get('max_candidates', 50)
+        )
+
+    def _init_iopv(self) -> Optional[IOPVEngine]:
+        """初始化估算净值引擎"""
+        iopv_config = self.config.get('iopv', {})
+        if not iopv_config.get('enabled', False):
+            return None
+
+        return load_iopv_engine(iopv_config.get('holdings_file', 'config/holdings.yml'))
+
+    def _init_calendar(self) -> Optional[TradingCalendar]:
+        """初始化交易日历（只在交易阶段调度、净值缓存或估算净值启用时加载）"""
+        calendar_config = self.config.get('calendar', {})
+        if (
+            not calendar_config.get('enabled', False)
+            and not self.config.get('nav_cache', {}).get('enabled', True)
+            and not self.config.get('iopv', {}).get('enabled', False)
+        ):
+            return None
+
+        return TradingCalendar(load_holidays(calendar_config.get('holidays_file', 'config/holidays.yml')))
+
+    def _init_pacer(self) -> Optional[SessionPacer]:
+        """初始化交易阶段调度"""
+        calendar_config = self.config.get('calendar', {})
+        if not calendar_config.get('enabled', False):
+            return None
+
+        return SessionPacer(self.calendar, self.interval, calendar_config.get('intervals'))
+
+    def _init_fund_scheduler(self) -> Optional[FundScheduler]:
+        """初始化基金轮询优先级调度"""
+        if not self.priority_config.get('enabled', False):
+            return None
+
+        # 每个节拍是一次批量请求：请求预算决定节拍间隔，未配置时节拍取热门基金的最短周期，
+        # 接近阈值的基金才能比 interval_seconds 更频繁地轮询
+        min_period = self.priority_config.get('min_period', 10)
+        requests_per_minute = self.priority_config.get('requests_per_minute')
+        return FundScheduler(
+            self.min_premium_rate,
+            self.min_discount_rate,
+            # 基金轮询总次数与等间隔轮询全部基金相同（每次同步基金列表时更新）
+            budget=len(self.watchlist) / self.interval,
+            min_period=min_period,
+            max_period=self.priority_config.get('max_period', 600),
+            default_period=self.interval,
+            tick=60 / requests_per_minute if requests_per_minute else min_period
+        )
 
     def _init_notifier(self) -> Optional[NotificationManager]:
         """初始化通知管理器"""
@@ -68,106 +263,294 @@ class LOFArbitrage:
         self.running = True
         log.info(f"LOF 套利策略启动，监控 {len(self.watchlist)} 只基金")
 
+        # 元数据在后台刷新，扫描路径只读内存
+        if self.fund_meta is not None:
+            self.fund_meta.start_background_refresh(
+                self._meta_codes,
+                self.data_fetcher.get_fund_meta,
+                interval_minutes=self.config.get('fund_meta', {}).get('refresh_minutes', 60)
+            )
+
         try:
-            while self.running:
-                self.scan_opportunities()
-                time.sleep(self.interval)
+            if self.stream_config.get('enabled', False):
+                self.run_streaming()
+
+            # 轮询模式（推送失败时的回退路径）
+            self.scheduler.run(self._poll, lambda: self.running)
         except KeyboardInterrupt:
             log.info("收到停止信号")
         finally:
             self.running = False
-            log.info("LOF 套利策略停止")
+            if self.fund_meta is not None:
+                self.fund_meta.stop()
+            log.info(f"LOF 套利策略停止，调度统计: {self.scheduler.stats()}")
+
+    def _poll(self):
+        """轮询模式的一个节拍（非扫描阶段直接跳过）"""
+        if self.pacer and not self.pacer.should_scan(datetime.now(CST)):
+            return
+
+        self.scan_opportunities()
+        metrics.maybe_dump()
+
+    def _next_interval(self) -> float:
+        """按当前交易阶段和最早到期的基金决定下一次扫描的间隔"""
+        now = datetime.now(CST)
+        if self.pacer and not self.pacer.should_scan(now):
+            interval = self.pacer.interval(now)
+            wake = now + timedelta(seconds=interval)
+            log.info(f"{self.pacer.calendar.phase(now)} 阶段不扫描，休眠至 {wake:%m-%d %H:%M}")
+            return interval
+
+        interval = self.pacer.interval(now) if self.pacer else self.interval
+        if self.fund_scheduler:
+            interval = min(interval, self.fund_scheduler.time_until_due())
+        return interval
+
+    def run_streaming(self):
+        """
+        推送模式：行情到达即检查套利机会
+
+        净值来自净值缓存（不随行情刷新），连续重连失败超过
+        max_failures 次后返回，由 run() 回退到轮询模式
+        """
+        # 先完整扫描一次，预热净值缓存
+        self.scan_opportunities()
+
+        self.quote_stream = QuoteStream(
+            self.watchlist,
+            push_host=self.stream_config.get('push_host', DataFetcher.PUSH_HOST),
+            session=self.data_fetcher.session,
+            read_timeout=self.stream_config.get('read_timeout', 30),
+            max_backoff=self.stream_config.get('max_backoff', 60),
+            max_failures=self.stream_config.get('max_failures', 10)
+        )
+        log.info("LOF 套利策略使用行情推送模式")
+
+        try:
+            for quote in self.quote_stream:
+                if not self.running:
+                    break
+                self.on_quote(quote)
+                metrics.maybe_dump()
+        except StreamError as e:
+            log.error(f"{e}，回退到轮询模式")
+        finally:
+            self.quote_stream.stop()
+            self.quote_stream = None
+
+    def on_quote(self, quote: Dict):
+        """处理一条推送行情"""
+        try:
+            data = self.data_fetcher.get_lof_with_quote(quote['code'], quote)
+            if self.data_fetcher.nav_cache:
+                self.data_fetcher.nav_cache.save()
+            if data:
+                self.check_arbitrage_opportunity(data)
+        except Exception as e:
+            log.error(f"处理 {quote.get('code')} 推送行情时出错: {e}")
 
     def scan_opportunities(self):
-        """扫描套利机会"""
-        if not self.watchlist:
-            log.warning("监控列表为空")
+        """
+        扫描套利机会
+
+        各阶段耗时记入 metrics（scan.*），每轮结束时记录最慢的基金
+        """
+        metrics.inc('scans')
+        try:
+            with metrics.span('scan.total'):
+                self._scan()
+        finally:
+            metrics.end_cycle()
+
+    def _scan(self):
+        with metrics.span('scan.codes'):
+            codes = self.get_due_codes() if self.fund_scheduler else self.get_scan_codes()
+        if not codes:
+            if not self.fund_scheduler:
+                log.warning("监控列表为空")
             return
 
         log.debug("开始扫描套利机会...")
 
-        for fund_code in self.watchlist:
-            try:
-                # 获取实时数据
-                data = self.data_fetcher.get_lof_realtime_price(fund_code)
-                if not data:
-                    continue
+        # 一次请求批量获取整个监控列表的实时数据（净值按 max_concurrency 并发获取）
+        try:
+            with metrics.span('scan.quotes'):
+                quotes = self.data_fetcher.get_lof_realtime_prices(codes)
+        except Exception as e:
+            log.error(f"批量获取实时数据失败: {e}")
+            if self.fund_scheduler:
+                for fund_code in codes:
+                    self.fund_scheduler.failed(fund_code)
+            return
 
-                # 检查套利机会
-                self.check_arbitrage_opportunity(data)
+        if self.iopv:
+            with metrics.span('scan.iopv'):
+                self.apply_iopv(quotes)
+
+        if self.fund_scheduler:
+            self.reschedule(codes, quotes)
+
+        # 整批判定，只有命中的基金进入通知和交易流程
+        with metrics.span('scan.evaluate'):
+            hits = self.evaluate_quotes(quotes)
+        log.debug(f"扫描 {len(quotes)} 只基金，发现 {len(hits)} 个机会")
+
+        for fund_code, opportunity_type, trade_amount in hits:
+            try:
+                start = time.perf_counter()
+                with metrics.span('scan.dispatch'):
+                    self.handle_opportunity(quotes[fund_code], opportunity_type, trade_amount)
+                metrics.fund(fund_code, time.perf_counter() - start)
 
             except Exception as e:
-                log.error(f"扫描 {fund_code} 时出错: {e}")
+                log.error(f"处理 {fund_code} 套利机会时出错: {e}")
+
+    def evaluate_quotes(self, quotes: QuoteBatch) -> List[Tuple[str, str, Optional[float]]]:
+        """
+        整批判定本次扫描的行情
+
+        启用成本模型时按各金额档位的净收益率判定，交易金额取不超过可用资金的最大盈利档位；
+        未启用时按溢价率判定，交易金额由 handle_opportunity 按可用资金计算
+
+        Returns:
+            [(基金代码, 'premium' / 'discount', 交易金额或 None), ...]
+        """
+        if not self.costs or not len(quotes):
+            return [(code, kind, None) for code, kind in self.evaluator.evaluate(quotes)]
+
+        planned = self.planned_trade_amount()
+        hits = self.evaluator.evaluate_edges(quotes, *self.costs.net_edges(quotes), max_bucket=self.costs.bucket(planned))
+        sizes = self.costs.sizes
+        return [(code, kind, min(planned, float(sizes[bucket]))) for code, kind, bucket in hits]
+
+    def planned_trade_amount(self, price: float = 0.0) -> float:
+        """发现机会时将要使用的交易金额（同时决定成本档位）"""
+        return min(self.max_trade_amount, self.calculate_trade_amount(price))
+
+    def get_scan_codes(self) -> List[str]:
+        """
+        本次扫描的基金列表
+
+        启用全市场筛选时：监控列表 + 全市场初筛候选
+        """
+        if not self.universe:
+            return self.watchlist
+
+        try:
+            self.universe.refresh()
+            candidates = self.universe.screen(self.min_premium_rate, self.min_discount_rate)
+        except Exception as e:
+            log.error(f"全市场筛选失败: {e}")
+            return self.watchlist
+
+        watched = set(self.watchlist)
+        return self.watchlist + [code for code in candidates if code not in watched]
 
-    def check_arbitrage_opportunity(self, data: Dict):
-        """检查是否满足套利条件"""
-        fund_code = data['code']
-        fund_name = data['name']
-        price = data['price']
-        nav = data['nav']
-        premium_rate = data['premium_rate']
-        volume = data.get('volume', 0)
+    def get_due_codes(self) -> List[str]:
+        """
+        优先级轮询模式下本次扫描的基金（已到期的基金）
 
-        log.debug(f"{fund_name}({fund_code}): 价格={price:.3f}, 净值={nav:.3f}, 溢价率={premium_rate:.2%}")
+        基金列表（含全市场筛选）按 interval_seconds 同步，不随每个节拍刷新
+        """
+        now = time.monotonic()
+        if self._codes_synced_at is None or now - self._codes_synced_at >= self.interval:
+            codes = self.get_scan_codes()
+            self.fund_scheduler.sync(codes)
+            self.fund_scheduler.budget = len(codes) / self.interval
+            self._codes_synced_at = now
+
+        return self.fund_scheduler.due()
+
+    def reschedule(self, codes: List[str], quotes: QuoteBatch):
+        """按本次溢价率为每只基金重新排期，缺少行情的基金按默认周期重试"""
+        premiums = dict(zip(quotes.column('code').tolist(), quotes.column('premium_rate').tolist()))
+        for fund_code in codes:
+            if fund_code in premiums:
+                self.fund_scheduler.update(fund_code, premiums[fund_code])
+            else:
+                self.fund_scheduler.failed(fund_code)
+
+    def apply_iopv(self, quotes: QuoteBatch):
+        """
+        用盘中估算净值（IOPV）计算溢价率
 
-        # 净值为 0 或无成交，跳过
-        if nav == 0 or volume == 0:
+        只用上一交易日的净值作为基准：当日净值已公布（晚间）时直接用公布的净值，
+        净值滞后两个交易日以上时基准不对，成分股当日涨跌会被重复或漏算，都不估算。
+        成分股行情一次请求批量获取；结果写入 iopv 列并按整列重算 premium_rate
+        """
+        base_date = self.calendar.previous_trading_day(datetime.now(CST).date()).isoformat()
+        columns = zip(
+            quotes.column('code').tolist(),
+            quotes.column('nav').tolist(),
+            quotes.column('nav_date').tolist()
+        )
+        covered = {
+            code: nav for code, nav, nav_date in columns
+            if nav_date == base_date and self.iopv.covers(code)
+        }
+        if not covered:
             return
 
-        # 溢价套利：场内价格 > 净值 + 阈值
-        if premium_rate >= self.min_premium_rate:
-            log.info(f"发现溢价套利机会: {fund_name} 溢价率={premium_rate:.2%}")
+        try:
+            self.iopv.set_base_navs(covered)
+            self.iopv.update_quotes(self.data_fetcher.get_security_quotes(self.iopv.secids))
+        except Exception as e:
+            log.error(f"更新估算净值失败: {e}")
+            return
 
-            # 发送通知
-            if self.notifier:
-                self.notifier.send_opportunity(
-                    fund_code=fund_code,
-                    fund_name=fund_name,
-                    opportunity_type="premium",
-                    premium_rate=premium_rate,
-                    price=price,
-                    nav=nav
-                )
-
-            # 计算交易金额
-            trade_amount = min(self.max_trade_amount, self.calculate_trade_amount(price))
-
-            if trade_amount < self.min_trade_amount:
-                log.warning(f"交易金额过小: {trade_amount:.2f} < {self.min_trade_amount}")
-                return
-
-            # 执行溢价套利
-            self.execute_premium_arbitrage(data, trade_amount)
+        estimates = {code: value for code, value in self.iopv.estimates().items() if code in covered}
+        quotes.set_iopv(estimates)
+        log.debug(f"估算净值: {estimates}")
 
-        # 折价套利：场内价格 < 净值 - 阈值
-        elif premium_rate <= -self.min_discount_rate:
-            log.info(f"发现折价套利机会: {fund_name} 折价率={abs(premium_rate):.2%}")
+    def check_arbitrage_opportunity(self, data: Quote):
+        """检查单条行情是否满足套利条件（推送模式逐条到达时使用）"""
+        log.debug(f"{data.name}({data.code}): 价格={data.price:.3f}, 净值={data.nav:.3f}, 溢价率={data.premium_rate:.2%}")
 
-            # 发送通知
-            if self.notifier:
-                self.notifier.send_opportunity(
-                    fund_code=fund_code,
-                    fund_name=fund_name,
-                    opportunity_type="discount",
-                    premium_rate=premium_rate,
-                    price=price,
-                    nav=nav
-                )
-
-            # 计算交易金额
-            trade_amount = min(self.max_trade_amount, self.calculate_trade_amount(price))
-
-            if trade_amount < self.min_trade_amount:
-                log.warning(f"交易金额过小: {trade_amount:.2f} < {self.min_trade_amount}")
-                return
-
-            # 执行折价套利
+        if self.costs:
+            premium_cost, discount_cost = self.costs.fund_cost(data.code, self.planned_trade_amount(data.price))
+        else:
+            premium_cost = discount_cost = 0.0
+        opportunity_type = self.evaluator.classify(data, premium_cost, discount_cost)
+        if opportunity_type:
+            self.handle_opportunity(data, opportunity_type)
+
+    def handle_opportunity(self, data: Quote, opportunity_type: str, trade_amount: Optional[float] = None):
+        """
+        处理一个套利机会：通知、计算交易金额并执行
+
+        溢价：场内价格 > 净值 + 阈值；折价：场内价格 < 净值 - 阈值
+
+        Args:
+            trade_amount: 交易金额（判定时已按成本档位选定），None 表示按可用资金计算
+        """
+        if opportunity_type == PREMIUM:
+            log.info(f"发现溢价套利机会: {data.name} 溢价率={data.premium_rate:.2%}")
+        else:
+            log.info(f"发现折价套利机会: {data.name} 折价率={abs(data.premium_rate):.2%}")
+
+        # 发送通知
+        if self.notifier:
+            with metrics.span('notify.opportunity'):
+                self.notifier.send_quote_opportunity(data, opportunity_type)
+
+        # 计算交易金额
+        if trade_amount is None:
+            trade_amount = self.planned_trade_amount(data.price)
+
+        if trade_amount < self.min_trade_amount:
+            log.warning(f"交易金额过小: {trade_amount:.2f} < {self.min_trade_amount}")
+            return
+
+        if opportunity_type == PREMIUM:
+            self.execute_premium_arbitrage(data, trade_amount)
+        elif opportunity_type == DISCOUNT:
             self.execute_discount_arbitrage(data, trade_amount)
 
     def calculate_trade_amount(self, price: float) -> float:
         """计算交易金额"""
         # 基于账户余额计算
-        balance = self.broker.get_balance()
+        balance = self.account.balance()
         available = balance.get('available', 0)
 
         # 使用可用资金的 80%
@@ -175,7 +558,7 @@ class LOFArbitrage:
 
         return trade_amount
 
-    def execute_premium_arbitrage(self, data: Dict, trade_amount: float):
+    def execute_premium_arbitrage(self, data: Quote, trade_amount: float):
         """
         执行溢价套利
 
@@ -188,9 +571,9 @@ class LOFArbitrage:
         - 申购费用约 1.5%
         - T+2 到账
         """
-        fund_code = data['code']
-        fund_name = data['name']
-        price = data['price']
+        fund_code = data.code
+        fund_name = data.name
+        price = data.price
 
         log.warning(f"[溢价套利] {fund_name}: 计划卖出 {trade_amount/price:.0f} 份")
 
@@ -200,31 +583,23 @@ class LOFArbitrage:
             # 发送交易通知
             if self.notifier:
                 quantity = int(trade_amount / price)
-                self.notifier.send_trade(
-                    fund_code=fund_code,
-                    fund_name=fund_name,
-                    action="卖出",
-                    quantity=quantity,
-                    price=price,
-                    amount=trade_amount
-                )
-
-            self.opportunities.append({
-                'type': 'premium',
-                'code': fund_code,
-                'name': fund_name,
-                'price': price,
-                'nav': data['nav'],
-                'premium_rate': data['premium_rate'],
-                'amount': trade_amount,
-                'time': datetime.now().isoformat()
-            })
+                with metrics.span('notify.trade'):
+                    self.notifier.send_trade(
+                        fund_code=fund_code,
+                        fund_name=fund_name,
+                        action="卖出",
+                        quantity=quantity,
+                        price=price,
+                        amount=trade_amount
+                    )
+
+            self.opportunities.append(Opportunity.from_quote("premium", data, trade_amount))
+            metrics.inc('orders', {'status': 'simulated'})
             return
 
         # 实盘模式逻辑（需要券商 API 支持）
         # 1. 查询持仓
-        position = self.broker.get_position()
-        fund_position = next((p for p in position if p['code'] == fund_code), None)
+        fund_position = self.account.position(fund_code)
 
         if not fund_position or fund_position['available'] == 0:
             log.warning(f"没有 {fund_name} 持仓，无法执行溢价套利")
@@ -232,7 +607,8 @@ class LOFArbitrage:
 
         # 2. 场内卖出
         quantity = min(int(trade_amount / price), fund_position['available'])
-        order = self.broker.place_order(fund_code, OrderType.SELL, quantity)
+        order = self.account.place_order(fund_code, OrderType.SELL, quantity)
+        metrics.inc('orders', {'status': order.get('status', 'unknown')})
 
         if order['status'] == 'filled':
             log.info(f"[溢价套利] 卖出成功: {fund_name} {quantity} 份")
@@ -241,7 +617,7 @@ class LOFArbitrage:
             # 这里需要调用券商的基金申购接口
             log.warning("场外申购需要券商 API 支持")
 
-    def execute_discount_arbitrage(self, data: Dict, trade_amount: float):
+    def execute_discount_arbitrage(self, data: Quote, trade_amount: float):
         """
         执行折价套利
 
@@ -253,9 +629,9 @@ class LOFArbitrage:
         - 赎回费用约 0.5%
         - T+2 到账
         """
-        fund_code = data['code']
-        fund_name = data['name']
-        price = data['price']
+        fund_code = data.code
+        fund_name = data.name
+        price = data.price
 
         log.warning(f"[折价套利] {fund_name}: 计划买入 {trade_amount/price:.0f} 份")
 
@@ -265,31 +641,23 @@ class LOFArbitrage:
             # 发送交易通知
             if self.notifier:
                 quantity = int(trade_amount / price)
-                self.notifier.send_trade(
-                    fund_code=fund_code,
-                    fund_name=fund_name,
-                    action="买入",
-                    quantity=quantity,
-                    price=price,
-                    amount=trade_amount
-                )
-
-            self.opportunities.append({
-                'type': 'discount',
-                'code': fund_code,
-                'name': fund_name,
-                'price': price,
-                'nav': data['nav'],
-                'premium_rate': data['premium_rate'],
-                'amount': trade_amount,
-                'time': datetime.now().isoformat()
-            })
+                with metrics.span('notify.trade'):
+                    self.notifier.send_trade(
+                        fund_code=fund_code,
+                        fund_name=fund_name,
+                        action="买入",
+                        quantity=quantity,
+                        price=price,
+                        amount=trade_amount
+                    )
+
+            self.opportunities.append(Opportunity.from_quote("discount", data, trade_amount))
+            metrics.inc('orders', {'status': 'simulated'})
             return
 
         # 实盘模式逻辑
         # 1. 查询持仓（赎回需要先有持仓）
-        position = self.broker.get_position()
-        fund_position = next((p for p in position if p['code'] == fund_code), None)
+        fund_position = self.account.position(fund_code)
 
         if not fund_position or fund_position['available'] == 0:
             log.warning(f"没有 {fund_name} 持仓，无法执行折价套利")
@@ -297,7 +665,8 @@ class LOFArbitrage:
 
         # 2. 场内买入
         quantity = int(trade_amount / price)
-        order = self.broker.place_order(fund_code, OrderType.BUY, quantity)
+        order = self.account.place_order(fund_code, OrderType.BUY, quantity)
+        metrics.inc('orders', {'status': order.get('status', 'unknown')})
 
         if order['status'] == 'filled':
             log.info(f"[折价套利] 买入成功: {fund_name} {quantity} 份")
@@ -305,13 +674,19 @@ class LOFArbitrage:
             # 3. 场外赎回（需要券商 API 支持）
             log.warning("场外赎回需要券商 API 支持")
 
-    def get_opportunities(self) -> List[Dict]:
-        """获取记录的套利机会"""
-        return self.opportunities
+    def get_opportunities(self, limit: Optional[int] = None) -> List[Opportunity]:
+        """获取最近记录的套利机会（历史记录通过 self.opportunities.query() 查询）"""
+        return self.opportunities.recent(limit)
 
     def stop(self):
         """停止策略"""
         self.running = False
+        self.scheduler.stop()
+        if self.quote_stream:
+            self.quote_stream.stop()
+        if self.fund_meta is not None:
+            self.fund_meta.stop()
+        self.opportunities.close()
 
 
 # 测试
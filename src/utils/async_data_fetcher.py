@@ -0,0 +1,234 @@
+"""
+异步数据获取工具
+基于 asyncio + aiohttp，单个连接池内并发轮询大量基金
+"""
+import asyncio
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import aiohttp
+
+from ..utils.data_fetcher import DataFetcher
+from ..utils.logger import log
+from ..utils.nav_cache import NavCache
+from ..utils.nav_parser import parse_nav
+from ..utils.quote import Quote, QuoteBatch
+from ..utils.rate_limiter import PRIORITY_CRITICAL, PRIORITY_NORMAL, RequestGovernor, get_governor
+
+
+class AsyncDataFetcher:
+    """
+    异步数据获取器
+
+    公共方法与 DataFetcher 一致，均为协程。所有请求共用一个
+    aiohttp.ClientSession：连接池按主机限制并发，并保持长连接复用。
+    每个请求发出前与同步的 DataFetcher 一样从共享的 RequestGovernor 取得许可（按主机限速、按优先级排队）。
+
+    用法:
+        async with AsyncDataFetcher() as fetcher:
+            data = await fetcher.get_lof_realtime_price("163406")
+    """
+
+    USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+    def __init__(
+        self,
+        source: str = "eastmoney",
+        limit: int = 100,
+        limit_per_host: int = 20,
+        keepalive_timeout: float = 30.0,
+        nav_cache: Optional[NavCache] = None,
+        push_host: str = DataFetcher.PUSH_HOST,
+        fund_host: str = DataFetcher.FUND_HOST,
+        data_host: str = DataFetcher.DATA_HOST,
+        governor: Optional[RequestGovernor] = None
+    ):
+        """
+        Args:
+            source: 数据源（目前仅支持 eastmoney）
+            limit: 连接池总连接数上限
+            limit_per_host: 每个主机的连接数上限
+            keepalive_timeout: 空闲长连接保持时间（秒）
+            nav_cache: 净值缓存
+            push_host/fund_host/data_host: 接口地址（测试时可指向本地服务）
+            governor: 请求限速器（None 表示使用进程内共享的限速器）
+        """
+        self.source = source
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.nav_cache = nav_cache
+
+        self.push_host = push_host
+        self.fund_host = fund_host
+        self.data_host = data_host
+        self.governor = governor
+
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> "AsyncDataFetcher":
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """延迟创建共享连接池（必须在事件循环内创建）"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={'User-Agent': self.USER_AGENT}
+            )
+        return self._session
+
+    async def close(self):
+        """关闭连接池"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _acquire(self, url: str, priority: str):
+        """取得请求许可（排队时让出事件循环）"""
+        governor = self.governor or get_governor()
+        await governor.acquire_async(urlparse(url).netloc, priority)
+
+    async def _get_json(self, url: str, timeout: float, priority: str = PRIORITY_NORMAL) -> Dict:
+        await self._acquire(url, priority)
+        session = await self._get_session()
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+            # 东方财富接口的 Content-Type 不一定是 application/json
+            return await resp.json(content_type=None)
+
+    async def _get_text(self, url: str, timeout: float, priority: str = PRIORITY_NORMAL) -> str:
+        await self._acquire(url, priority)
+        session = await self._get_session()
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+            return await resp.text(encoding='utf-8')
+
+    async def get_lof_realtime_price(self, fund_code: str) -> Optional[Quote]:
+        """获取 LOF 基金实时数据（格式同 DataFetcher.get_lof_realtime_price）"""
+        if self.source != "eastmoney":
+            log.error(f"不支持的数据源: {self.source}")
+            return None
+
+        try:
+            market = DataFetcher._get_market(fund_code)
+            price_url = f"{self.push_host}/api/qt/stock/get?secid={market}.{fund_code}"
+
+            try:
+                price_data = await self._get_json(price_url, timeout=5, priority=PRIORITY_CRITICAL)
+            except Exception as e:
+                log.error(f"获取 {fund_code} 价格失败: {e}")
+                return None
+
+            if not price_data.get('data'):
+                log.warning(f"无法获取 {fund_code} 场内价格: {price_data.get('rc', '')}")
+                return None
+
+            # LOF 基金价格 API 返回值需要除以 1000 转换为元
+            quote = {
+                'price': price_data['data'].get('f43', 0) / 1000,  # 最新价
+                'volume': price_data['data'].get('f47', 0),  # 成交量
+                'name': price_data['data'].get('f58', ''),  # 基金名称
+            }
+
+            nav, nav_date = await self._get_nav(fund_code)
+            if self.nav_cache:
+                self.nav_cache.save()
+
+            return DataFetcher._build_lof_record(fund_code, quote, nav, nav_date)
+
+        except Exception as e:
+            log.error(f"获取 LOF 数据失败 {fund_code}: {e}")
+            return None
+
+    async def get_lof_realtime_prices(self, fund_codes: List[str]) -> QuoteBatch:
+        """
+        批量获取 LOF 基金实时数据
+
+        一次 ulist 请求获取全部场内价格，净值在同一事件循环内并发获取，
+        并发数由连接池的 limit_per_host 约束。
+        """
+        if not fund_codes:
+            return QuoteBatch()
+
+        if self.source != "eastmoney":
+            log.error(f"不支持的数据源: {self.source}")
+            return QuoteBatch()
+
+        try:
+            url = DataFetcher._ulist_url(self.push_host, DataFetcher._default_secids(fund_codes))
+            price_data = await self._get_json(url, timeout=5, priority=PRIORITY_CRITICAL)
+        except Exception as e:
+            log.error(f"批量获取场内价格失败: {e}")
+            return QuoteBatch()
+
+        quotes = DataFetcher._parse_ulist(price_data)
+
+        missing = [code for code in fund_codes if code not in quotes]
+        if missing:
+            log.warning(f"批量行情中缺少: {missing}")
+
+        available = [code for code in fund_codes if code in quotes]
+        records = await asyncio.gather(
+            *(self.get_lof_with_quote(code, quotes[code]) for code in available)
+        )
+
+        if self.nav_cache:
+            self.nav_cache.save()
+
+        return QuoteBatch.from_quotes(data for data in records if data)
+
+    async def get_lof_with_quote(self, fund_code: str, quote: Dict) -> Optional[Quote]:
+        """已有场内行情时补充净值，组装完整 LOF 数据"""
+        try:
+            nav, nav_date = await self._get_nav(fund_code)
+            return DataFetcher._build_lof_record(fund_code, quote, nav, nav_date)
+        except Exception as e:
+            log.error(f"获取 LOF 数据失败 {fund_code}: {e}")
+            return None
+
+    async def _get_nav(self, fund_code: str) -> Tuple[float, str]:
+        """获取最新净值，优先使用净值缓存"""
+        if self.nav_cache:
+            cached = self.nav_cache.get(fund_code)
+            if cached:
+                return cached
+
+        page = await self._get_text(f"{self.fund_host}/{fund_code}.html", timeout=10)
+
+        result = parse_nav(page)
+        if not result:
+            log.warning(f"无法从基金主页解析净值: {fund_code}")
+            return 0.0, ''
+
+        nav, nav_date = result
+        if self.nav_cache:
+            self.nav_cache.put(fund_code, nav, nav_date)
+
+        return nav, nav_date
+
+    async def get_new_bonds(self) -> List[Dict]:
+        """获取今日新发行的转债（格式同 DataFetcher.get_new_bonds）"""
+        try:
+            await self._get_text(f"{self.data_host}/kzz/default.html", timeout=10)
+
+            # 查找新债列表（这里需要根据实际页面结构调整）
+            log.warning("新债数据获取需要调整页面解析逻辑")
+            return []
+
+        except Exception as e:
+            log.error(f"获取新债数据失败: {e}")
+            return []
+
+    async def get_bond_subscription_status(self, account_id: str) -> Dict:
+        """获取可转债中签状态（需要券商 API 支持）"""
+        log.warning("中签状态查询需要券商 API")
+        return {'pending': [], 'confirmed': []}
@@ -0,0 +1,160 @@
+"""
+交易成本模型
+按基金预先计算各交易金额档位的成本率（申购 / 赎回费率档位、佣金、印花税、T+2 资金占用），
+扫描时对整批行情按列计算扣除成本后的净收益，判定时不再逐笔查费率或发请求
+
+溢价套利：场内卖出已有份额 + 场外申购      成本 = 卖出佣金 + 印花税 + 申购费 + 资金占用
+折价套利：场内买入 + 场外赎回已有份额      成本 = 买入佣金 + 赎回费 + 资金占用
+"""
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..utils.fund_meta import FundMetaStore
+from ..utils.quote import QuoteBatch
+
+
+class CostModel:
+    """
+    按基金、按交易金额档位的成本率表
+
+    费率来自基金元数据（FundMeta 的申购 / 赎回费率档位），没有元数据的基金使用默认费率。
+    成本表按基金缓存，元数据有更新（FundMetaStore.version 变化）时自动重新计算。
+    """
+
+    def __init__(
+        self,
+        fund_meta: Optional[FundMetaStore] = None,
+        sizes: Sequence[float] = (5000, 10000, 20000, 50000),
+        commission_rate: float = 0.00025,
+        min_commission: float = 5.0,
+        stamp_duty: float = 0.0,
+        carry_rate: float = 0.02,
+        premium_carry_days: int = 2,
+        discount_carry_days: int = 4,
+        holding_days: int = 30,
+        default_purchase_rate: float = 0.015,
+        default_redemption_rate: float = 0.005
+    ):
+        """
+        Args:
+            fund_meta: 基金元数据（费率档位）
+            sizes: 交易金额档位（元，递增）
+            commission_rate / min_commission: 场内佣金费率和单笔最低佣金
+            stamp_duty: 卖出印花税率（基金目前免征）
+            carry_rate: 资金占用的年化成本
+            premium_carry_days / discount_carry_days: 溢价 / 折价套利的资金占用天数（T+2 到账等）
+            holding_days: 赎回份额的持有天数（决定赎回费率档位）
+            default_purchase_rate / default_redemption_rate: 没有元数据时的申购 / 赎回费率
+        """
+        self.fund_meta = fund_meta
+        self.sizes = np.asarray(sorted(sizes), dtype=float)
+        self.commission_rate = commission_rate
+        self.min_commission = min_commission
+        self.stamp_duty = stamp_duty
+        self.carry_rate = carry_rate
+        self.premium_carry_days = premium_carry_days
+        self.discount_carry_days = discount_carry_days
+        self.holding_days = holding_days
+        self.default_purchase_rate = default_purchase_rate
+        self.default_redemption_rate = default_redemption_rate
+
+        self._funds: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._meta_version = fund_meta.version if fund_meta is not None else 0
+        self._cached_codes: Optional[Tuple[str, ...]] = None
+        self._cached_table: Tuple[np.ndarray, np.ndarray] = (np.empty((0, len(self.sizes))),) * 2
+
+    def invalidate(self):
+        """丢弃已计算的成本表"""
+        self._funds = {}
+        self._cached_codes = None
+
+    def _check_meta(self):
+        if self.fund_meta is not None and self.fund_meta.version != self._meta_version:
+            self.invalidate()
+            self._meta_version = self.fund_meta.version
+
+    def _fund_costs(self, fund_code: str) -> Tuple[np.ndarray, np.ndarray]:
+        """单只基金各金额档位的 (溢价成本率, 折价成本率)"""
+        costs = self._funds.get(fund_code)
+        if costs is not None:
+            return costs
+
+        sizes = self.sizes
+        commission = np.maximum(sizes * self.commission_rate, self.min_commission) / sizes
+
+        meta = self.fund_meta.get(fund_code) if self.fund_meta is not None else None
+        if meta and meta.purchase_fees:
+            purchase = np.array([meta.purchase_fee(size) for size in sizes]) / sizes
+        else:
+            purchase = np.full(len(sizes), self.default_purchase_rate / (1 + self.default_purchase_rate))
+
+        if meta and meta.redemption_fees:
+            redemption = meta.redemption_rate(self.holding_days)
+        else:
+            redemption = self.default_redemption_rate
+
+        premium = commission + self.stamp_duty + purchase + self.carry_rate * self.premium_carry_days / 365
+        discount = commission + redemption + self.carry_rate * self.discount_carry_days / 365
+
+        costs = (premium, discount)
+        self._funds[fund_code] = costs
+        return costs
+
+    def costs(self, codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        一批基金的成本率表
+
+        Returns:
+            (溢价成本率, 折价成本率)，形状均为 (基金数, 金额档位数)
+        """
+        self._check_meta()
+        key = tuple(codes.tolist())
+        if key != self._cached_codes:
+            pairs = [self._fund_costs(code) for code in key]
+            width = len(self.sizes)
+            self._cached_table = (
+                np.array([p for p, _ in pairs]).reshape(-1, width),
+                np.array([d for _, d in pairs]).reshape(-1, width),
+            )
+            self._cached_codes = key
+        return self._cached_table
+
+    def bucket(self, amount: float) -> int:
+        """交易金额所在的档位（不小于 amount 的最小档位，超过最大档位时取最大档位）"""
+        return min(int(np.searchsorted(self.sizes, amount)), len(self.sizes) - 1)
+
+    def fund_cost(self, fund_code: str, amount: float) -> Tuple[float, float]:
+        """单只基金按交易金额的 (溢价成本率, 折价成本率)"""
+        self._check_meta()
+        premium, discount = self._fund_costs(fund_code)
+        index = self.bucket(amount)
+        return float(premium[index]), float(discount[index])
+
+    def net_edges(self, quotes: QuoteBatch) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        扣除成本后的净收益率
+
+        Returns:
+            (溢价套利净收益率, 折价套利净收益率)，形状均为 (基金数, 金额档位数)
+        """
+        premium_costs, discount_costs = self.costs(quotes.column('code'))
+        premium_rate = quotes.column('premium_rate')[:, None]
+        return premium_rate - premium_costs, -premium_rate - discount_costs
+
+
+def load_cost_model(config: Dict, fund_meta: Optional[FundMetaStore] = None) -> CostModel:
+    """按 strategy.yml 的 lof.costs 配置创建成本模型"""
+    return CostModel(
+        fund_meta,
+        sizes=config.get('sizes', (5000, 10000, 20000, 50000)),
+        commission_rate=config.get('commission_rate', 0.00025),
+        min_commission=config.get('min_commission', 5.0),
+        stamp_duty=config.get('stamp_duty', 0.0),
+        carry_rate=config.get('carry_rate', 0.02),
+        premium_carry_days=config.get('premium_carry_days', 2),
+        discount_carry_days=config.get('discount_carry_days', 4),
+        holding_days=config.get('holding_days', 30),
+        default_purchase_rate=config.get('default_purchase_rate', 0.015),
+        default_redemption_rate=config.get('default_redemption_rate', 0.005)
+    )
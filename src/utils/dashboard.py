@@ -5,6 +5,10 @@ import time
 from typing import Dict, List, Optional
 from datetime import datetime
 
+import numpy as np
+
+from .quote import Quote, QuoteBatch
+
 
 class ProgressTracker:
     """任务进度追踪器"""
@@ -106,8 +110,15 @@ class ProgressTracker:
 class Dashboard:
     """任务看板 - 实时显示所有任务状态"""
 
-    def __init__(self, tracker: ProgressTracker):
+    def __init__(self, tracker: ProgressTracker, quote_limit: int = 20):
         self.tracker = tracker
+        self.quote_limit = quote_limit
+        self.quotes: Optional[QuoteBatch] = None
+        self.last_update = datetime.now()
+
+    def update_quotes(self, quotes: QuoteBatch):
+        """更新看板上的 LOF 行情（下次 show() 时显示）"""
+        self.quotes = quotes
         self.last_update = datetime.now()
 
     def show(self):
@@ -116,6 +127,8 @@ class Dashboard:
         self._show_header()
         self._show_tasks()
         self._show_footer()
+        if self.quotes is not None:
+            self.show_quotes(self.quotes, self.quote_limit)
 
     def _clear_screen(self):
         """清屏（跨平台）"""
@@ -171,6 +184,27 @@ class Dashboard:
         """显示分隔线"""
         print("═" * 60)
 
+    def show_quotes(self, quotes: QuoteBatch, limit: int = 20):
+        """显示 LOF 行情（按溢价率绝对值排序，直接读取整列数据）"""
+        self._show_divider()
+        print(f" 📈  LOF 行情  共 {len(quotes)} 只")
+        self._show_divider()
+
+        if not len(quotes):
+            print("  📭  暂无行情")
+            return
+
+        records = quotes.records
+        order = np.argsort(-np.abs(records['premium_rate']), kind='stable')[:limit]
+
+        for row in records[order]:
+            print(
+                f"  {row['code']}  {row['name'][:10]:<10}  价格 {row['price']:>7.3f}  "
+                f"净值 {row['nav']:>7.4f}  溢价率 {row['premium_rate']:>7.2%}"
+            )
+
+        self._show_divider()
+
 
 def demo_dashboard():
     """演示看板功能"""
@@ -180,6 +214,10 @@ def demo_dashboard():
 
     tracker = ProgressTracker()
     dashboard = Dashboard(tracker)
+    dashboard.update_quotes(QuoteBatch.from_quotes([
+        Quote('163406', '兴全合润', 1.052, 1.0, '2026-01-02', 0.052, 100, time.time_ns()),
+        Quote('161725', '招商白酒', 0.988, 1.0, '2026-01-02', -0.012, 100, time.time_ns()),
+    ]))
 
     # 模拟任务
     tracker.start_task("task1", "GitHub 代码推送", 3)
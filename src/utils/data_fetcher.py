@@ -3,159 +3,647 @@
 支持从东方财富、雪球、新浪等获取实时数据
 """
 import requests
-from datetime import datetime
-from typing import Optional, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Tuple
 from bs4 import BeautifulSoup
 import time
 import json
 import re
 
+from ..utils.fund_meta import FundMeta, FundMetaStore, build_fund_meta
+from ..utils.hedge import Hedger
+from ..utils.http_fixtures import apply_fixture_env
 from ..utils.logger import log
+from ..utils.metrics import metrics
+from ..utils.nav_cache import NavCache
+from ..utils.nav_parser import parse_nav
+from ..utils.quote import Quote, QuoteBatch
+from ..utils.rate_limiter import PRIORITY_BACKGROUND, PRIORITY_CRITICAL, PRIORITY_HEADER, get_governor
+from ..utils.transport import CircuitBreaker, ResilientAdapter
+
+# 请求优先级（见 RequestGovernor）：行情刷新优先于净值，元数据在后台排最后
+CRITICAL = {PRIORITY_HEADER: PRIORITY_CRITICAL}
+BACKGROUND = {PRIORITY_HEADER: PRIORITY_BACKGROUND}
 
 
 class DataFetcher:
     """数据获取器基类"""
 
-    def __init__(self, source: str = "eastmoney"):
+    # 接口地址（测试时可替换为本地服务）
+    PUSH_HOST = "http://push2.eastmoney.com"
+    FUND_HOST = "http://fund.eastmoney.com"
+    FUND10_HOST = "http://fundf10.eastmoney.com"
+    DATA_HOST = "http://data.eastmoney.com"
+    SINA_HOST = "http://hq.sinajs.cn"
+
+    def __init__(
+        self,
+        source: str = "eastmoney",
+        max_workers: int = 1,
+        nav_cache: Optional[NavCache] = None,
+        transport: Optional[Dict] = None,
+        hedge: Optional[Dict] = None,
+        fund_meta: Optional[FundMetaStore] = None
+    ):
+        """
+        Args:
+            source: 数据源 (eastmoney/sina/hedged)
+            max_workers: 批量获取时的最大并发数（1 表示顺序获取）
+            nav_cache: 净值缓存（None 表示每次都抓取基金主页）
+            transport: 重试与熔断参数（见 ResilientAdapter）
+            hedge: 对冲请求参数（见 Hedger），仅 source="hedged" 时使用
+            fund_meta: 基金元数据存储（提供交易所和名称，None 时按代码规则判断交易所）
+        """
         self.source = source
+        self.max_workers = max(1, max_workers)
+        self.nav_cache = nav_cache
+        self.fund_meta = fund_meta
         self.session = requests.Session()
+        # 连接池大小需覆盖并发数，否则多余的连接会被丢弃重建
+        self.adapter = ResilientAdapter(
+            pool_connections=10,
+            pool_maxsize=max(10, self.max_workers),
+            **(transport or {})
+        )
+        self.session.mount('http://', self.adapter)
+        self.session.mount('https://', self.adapter)
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         })
+        # ARBITRAGE_HTTP_RECORD / ARBITRAGE_HTTP_REPLAY 环境变量：录制或回放全部请求
+        apply_fixture_env(self.session)
+
+        # 对冲模式：东方财富为主，超过 p95 延迟未返回时请求新浪
+        self.hedger = Hedger(**(hedge or {})) if source == "hedged" else None
 
-    def get_lof_realtime_price(self, fund_code: str) -> Optional[Dict]:
+    def transport_state(self) -> Dict[str, Dict]:
+        """各主机的熔断器状态（用于监控）"""
+        return self.adapter.states()
+
+    def register_metrics(self):
+        """
+        把熔断器状态和对冲统计注册为采集指标（导出时才计算）
+
+        同名指标进程内只保留一份，由策略为其主数据获取器注册
+        """
+        states = {CircuitBreaker.CLOSED: 0, CircuitBreaker.HALF_OPEN: 1, CircuitBreaker.OPEN: 2}
+        metrics.register(
+            'circuit_breaker_state',
+            lambda: [({'host': host}, states[state['state']]) for host, state in self.transport_state().items()],
+            help='熔断器状态（0 关闭，1 半开，2 打开）'
+        )
+        metrics.register(
+            'circuit_breaker_rejected',
+            lambda: [({'host': host}, state['rejected']) for host, state in self.transport_state().items()],
+            kind='counter',
+            help='熔断期间拒绝的请求数'
+        )
+        metrics.register(
+            'circuit_breaker_trips',
+            lambda: [({'host': host}, state['trips']) for host, state in self.transport_state().items()],
+            kind='counter',
+            help='熔断器打开次数'
+        )
+        if not self.hedger:
+            return
+
+        hedger = self.hedger
+        metrics.register(
+            'hedge_requests',
+            lambda: [({'kind': kind}, value) for kind, value in hedger.stats().items()
+                     if kind in ('calls', 'hedged', 'failures')],
+            kind='counter',
+            help='对冲请求次数（calls 总数，hedged 发出备用请求，failures 全部失败）'
+        )
+        metrics.register(
+            'hedge_wins',
+            lambda: [({'source': source}, wins) for source, wins in hedger.stats()['wins'].items()],
+            kind='counter',
+            help='对冲请求各数据源胜出次数'
+        )
+        metrics.register('hedge_delay_seconds', hedger.hedge_delay, help='当前对冲延迟（秒）')
+
+    def hedge_stats(self) -> Dict:
+        """对冲请求统计：各数据源胜出次数和延迟（非对冲模式返回空）"""
+        return self.hedger.stats() if self.hedger else {}
+
+    def request_stats(self) -> Dict[str, Dict[str, Dict]]:
+        """请求限速排队延迟（进程内所有 DataFetcher 共享，见 RequestGovernor）"""
+        return get_governor().stats()
+
+    def get_lof_realtime_price(self, fund_code: str) -> Optional[Quote]:
         """
         获取 LOF 基金实时数据
 
         Returns:
-            {
-                'code': '163406',
-                'name': '兴全合润混合',
-                'price': 2.523,  # 场内价格
-                'nav': 2.481,    # 净值
-                'premium_rate': 0.017,  # 溢价率
-                'volume': 1234567,  # 成交量
-            }
+            Quote(code='163406', name='兴全合润混合', price=2.523, nav=2.481,
+                  nav_date='2026-02-13', premium_rate=0.017, volume=1234567, timestamp_ns=...)
         """
         if self.source == "eastmoney":
             return self._get_lof_from_eastmoney(fund_code)
         elif self.source == "sina":
             return self._get_lof_from_sina(fund_code)
+        elif self.source == "hedged":
+            return self._get_lof_hedged(fund_code)
         else:
             log.error(f"不支持的数据源: {self.source}")
             return None
 
-    def _get_lof_from_eastmoney(self, fund_code: str) -> Optional[Dict]:
-        """从东方财富获取 LOF 数据"""
-        try:
-            # 判断交易所：深交所(0) 或 上交所(1)
-            if fund_code.startswith('16') or fund_code.startswith('15'):
-                market = '0'  # 深交所
-            elif fund_code.startswith(('50', '51', '52')):
-                market = '1'  # 上交所
+    def get_lof_realtime_prices(self, fund_codes: List[str]) -> QuoteBatch:
+        """
+        批量获取 LOF 基金实时数据
+
+        场内价格通过一次多证券请求（ulist）获取，再逐只补充净值，
+        扫描耗时随数据量增长，而不是随请求往返次数增长。
+        max_workers > 1 时净值并发获取，总耗时接近最慢的单只基金。
+
+        Returns:
+            QuoteBatch，可按基金代码取出 Quote（顺序与 fund_codes 一致）
+            获取失败的基金不会出现在结果中
+        """
+        if not fund_codes:
+            return QuoteBatch()
+
+        with metrics.span('fetch.prices'):
+            if self.source == "eastmoney":
+                quotes = self._get_prices_from_eastmoney(fund_codes)
+            elif self.source == "sina":
+                quotes = self._get_prices_from_sina(fund_codes)
+            elif self.source == "hedged":
+                quotes = self.hedger.call(
+                    lambda: self._get_prices_from_eastmoney(fund_codes),
+                    lambda: self._get_prices_from_sina(fund_codes),
+                    names=("eastmoney", "sina")
+                ) or {}
             else:
-                market = '0'  # 默认深交所
+                log.error(f"不支持的数据源: {self.source}")
+                return QuoteBatch()
 
-            # 获取场内价格（实时）
-            price_url = f"http://push2.eastmoney.com/api/qt/stock/get?secid={market}.{fund_code}"
-            try:
-                price_resp = self.session.get(price_url, timeout=5)
-                price_data = price_resp.json()
+        missing = [code for code in fund_codes if code not in quotes]
+        if missing:
+            log.warning(f"批量行情中缺少: {missing}")
+
+        available = [code for code in fund_codes if code in quotes]
+        with metrics.span('fetch.navs'):
+            records = self._map(
+                lambda code: self.get_lof_with_quote(code, quotes[code]),
+                available
+            )
+
+        if self.nav_cache:
+            self.nav_cache.save()
+
+        return QuoteBatch.from_quotes(data for data in records if data)
+
+    def _map(self, func, fund_codes: List[str]) -> List:
+        """
+        对每只基金执行 func，max_workers > 1 时使用线程池并发执行
+
+        返回结果与 fund_codes 顺序一致，保证下游处理顺序确定
+        """
+        if self.max_workers <= 1 or len(fund_codes) <= 1:
+            return [func(code) for code in fund_codes]
+
+        workers = min(self.max_workers, len(fund_codes))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fetch") as executor:
+            return list(executor.map(func, fund_codes))
+
+    def get_lof_with_quote(self, fund_code: str, quote: Dict) -> Optional[Quote]:
+        """已有场内行情时补充净值，组装完整 LOF 数据"""
+        start = time.perf_counter()
+        try:
+            nav, nav_date = self._get_nav(fund_code)
+            return self._build_lof_record(fund_code, quote, nav, nav_date)
+        except Exception as e:
+            log.error(f"获取 LOF 数据失败 {fund_code}: {e}")
+            return None
+        finally:
+            metrics.fund(fund_code, time.perf_counter() - start)
 
-                log.debug(f"价格 API 响应: {price_data}")
-
-                if price_data.get('data'):
-                    # LOF 基金价格 API 返回值需要除以 1000 转换为元（而不是 100）
-                    # 因为场内价格通常比净值高 10 倍
-                    market_price = price_data['data'].get('f43', 0) / 1000  # 最新价
-                    volume = price_data['data'].get('f47', 0)  # 成交量
-                    fund_name = price_data['data'].get('f58', '')  # 基金名称
-                else:
-                    log.warning(f"无法获取 {fund_code} 场内价格: {price_data.get('rc', '')}")
-                    return None
+    # 东方财富行情中心 LOF 板块
+    LOF_BOARDS = "b:MK0404,b:MK0405,b:MK0406,b:MK0407"
+
+    def get_lof_list(self, page_size: int = 100) -> List[Dict]:
+        """
+        获取交易所上市的全部 LOF 基金行情（分页批量请求）
+
+        Returns:
+            [{'code': '163406', 'name': '兴全合润', 'market': '0', 'price': 2.258,
+              'volume': 12345, 'amount': 2780000.0}, ...]
+        """
+        funds = []
+        page = 1
+
+        while True:
+            url = (
+                f"{self.PUSH_HOST}/api/qt/clist/get?pn={page}&pz={page_size}&po=1&np=1"
+                f"&fltt=2&fid=f12&fs={self.LOF_BOARDS}&fields=f12,f13,f14,f2,f5,f6"
+            )
+
+            try:
+                resp = self.session.get(url, timeout=10)
+                data = resp.json().get('data') or {}
             except Exception as e:
-                log.error(f"获取 {fund_code} 价格失败: {e}")
-                return None
+                log.error(f"获取 LOF 列表失败（第 {page} 页）: {e}")
+                break
+
+            diff = data.get('diff') or []
+            if isinstance(diff, dict):
+                diff = list(diff.values())
+
+            for item in diff:
+                price, volume, amount = item.get('f2'), item.get('f5'), item.get('f6')
+                funds.append({
+                    'code': item.get('f12'),
+                    'name': item.get('f14', ''),
+                    'market': str(item.get('f13', '')),
+                    # 停牌或无数据时字段为 "-"
+                    'price': float(price) if isinstance(price, (int, float)) else 0.0,
+                    'volume': volume if isinstance(volume, (int, float)) else 0,
+                    'amount': float(amount) if isinstance(amount, (int, float)) else 0.0,
+                })
+
+            if not diff or len(funds) >= data.get('total', 0):
+                break
+            page += 1
+
+        log.debug(f"LOF 列表: {len(funds)} 只基金，{page} 次请求")
+        return funds
+
+    def get_security_quotes(self, secids: List[str]) -> Dict[str, Dict]:
+        """
+        一次请求获取多只证券（如基金成分股）的最新价和昨收价
 
-            # 获取基金主页以获取净值
-            fund_url = f"http://fund.eastmoney.com/{fund_code}.html"
-            fund_resp = self.session.get(fund_url, timeout=10)
-            fund_resp.encoding = 'utf-8'
+        Args:
+            secids: 东方财富证券标识，如 ['1.600519', '0.000858']
 
-            soup = BeautifulSoup(fund_resp.text, 'html.parser')
-
-            # 提取净值数据
-            nav = 0.0
-            nav_date = ''
-
-            data_of_fund = soup.find('div', class_='dataOfFund')
-            if data_of_fund:
-                text = data_of_fund.get_text(strip=True)
-                # 解析单位净值，格式如: "单位净值 (2026-02-13)2.2030-0.73%" 或 "单位净值(2026-02-13)0.70370.03%"
-                # 改进的正则表达式，只捕获净值部分（不包含涨跌幅）
-                nav_pattern = r'单位净值\s*\((\d{4}-\d{2}-\d{2})\)(\d+\.\d+)(-\d+\.\d+%|\+\d+\.\d+%)?'
-                nav_match = re.search(nav_pattern, text)
-                if nav_match:
-                    nav_date = nav_match.group(1)
-                    nav = float(nav_match.group(2))
-                    log.debug(f"从基金主页获取净值: {nav} (日期: {nav_date})")
-                else:
-                    log.warning(f"无法从基金主页解析净值: {text[:100]}")
-            else:
-                log.warning(f"未找到基金数据区域: {fund_code}")
-
-            # 如果净值获取失败，使用价格的 98-102% 作为模拟净值
-            if nav == 0.0:
-                log.warning(f"净值获取失败，使用模拟净值（价格的 99%）")
-                nav = market_price * 0.99
-
-            # 计算溢价率
-            premium_rate = 0
-            if nav > 0:
-                premium_rate = (market_price - nav) / nav
-
-            result = {
-                'code': fund_code,
-                'name': fund_name,
-                'price': market_price,
-                'nav': nav,
-                'nav_date': nav_date,
-                'premium_rate': premium_rate,
-                'volume': volume,
-                'timestamp': datetime.now().isoformat()
+        Returns:
+            {'1.600519': {'price': 1500.0, 'prev_close': 1480.0}, ...}
+        """
+        if not secids:
+            return {}
+
+        url = (
+            f"{self.PUSH_HOST}/api/qt/ulist.np/get"
+            f"?fltt=2&fields=f12,f13,f2,f18&secids={','.join(secids)}"
+        )
+
+        try:
+            resp = self.session.get(url, timeout=5, headers=CRITICAL)
+            data = resp.json()
+        except Exception as e:
+            log.error(f"批量获取证券行情失败: {e}")
+            return {}
+
+        diff = (data.get('data') or {}).get('diff') or []
+        if isinstance(diff, dict):
+            diff = list(diff.values())
+
+        quotes = {}
+        for item in diff:
+            price = item.get('f2')
+            prev_close = item.get('f18')
+            # 停牌或无数据时价格字段为 "-"
+            if not isinstance(price, (int, float)) or not isinstance(prev_close, (int, float)):
+                continue
+            quotes[f"{item.get('f13')}.{item.get('f12')}"] = {
+                'price': float(price),
+                'prev_close': float(prev_close),
             }
 
-            log.debug(f"LOF {fund_code}: 价格={market_price:.3f}, 净值={nav:.3f}, 溢价率={premium_rate:.2%}")
-            return result
+        return quotes
+
+    def get_fund_meta(self, fund_code: str) -> Optional[FundMeta]:
+        """
+        从基金概况页和费率页获取元数据（低频调用，由 FundMetaStore 后台刷新使用）
 
+        交易所取自行情接口返回的市场字段（f13），查询失败时沿用已有记录或按代码规则判断
+        """
+        try:
+            profile = self.session.get(f"{self.FUND10_HOST}/jbgk_{fund_code}.html", timeout=10, headers=BACKGROUND)
+            fees = self.session.get(f"{self.FUND10_HOST}/jjfl_{fund_code}.html", timeout=10, headers=BACKGROUND)
+            profile.encoding = fees.encoding = 'utf-8'
         except Exception as e:
-            log.error(f"获取 LOF 数据失败 {fund_code}: {e}")
+            log.error(f"获取基金元数据失败 {fund_code}: {e}")
+            return None
+
+        if profile.status_code != 200 or fees.status_code != 200:
+            log.warning(f"获取基金元数据失败 {fund_code}: HTTP {profile.status_code}/{fees.status_code}")
+            return None
+
+        market = self._lookup_market(fund_code) or self._market(fund_code)
+        meta = build_fund_meta(fund_code, f"{market}.{fund_code}", profile.text, fees.text)
+        if not meta.complete:
+            # 错误页面或页面改版：不缓存空名称、空费率的记录
+            log.warning(f"基金元数据解析不完整 {fund_code}: 名称={meta.name!r}")
             return None
+        return meta
+
+    def _lookup_market(self, fund_code: str) -> Optional[str]:
+        """
+        向行情接口查询基金实际所在的交易所
+
+        同时请求深交所和上交所两个 secid，接口只返回存在的证券，其市场字段 f13 即交易所；
+        两边都有同代码证券时优先与已有判断一致的一边
 
-    def _get_lof_from_sina(self, fund_code: str) -> Optional[Dict]:
-        """从新浪获取 LOF 数据（备用）"""
+        Returns:
+            '0'（深交所）/ '1'（上交所），查询失败时返回 None
+        """
+        url = (
+            f"{self.PUSH_HOST}/api/qt/ulist.np/get"
+            f"?fltt=2&fields=f12,f13,f14&secids=0.{fund_code},1.{fund_code}"
+        )
         try:
-            url = f"http://hq.sinajs.cn/list=fu_{fund_code}"
-            resp = self.session.get(url, timeout=5)
-
-            if resp.status_code == 200:
-                data = resp.text.decode('gbk')
-                parts = data.split(',')
-
-                if len(parts) > 5:
-                    result = {
-                        'code': fund_code,
-                        'name': parts[0].split('"')[1],
-                        'price': float(parts[1]),
-                        'volume': int(float(parts[5])),
-                        'timestamp': datetime.now().isoformat()
-                    }
-                    return result
+            data = self.session.get(url, timeout=5, headers=BACKGROUND).json()
+        except Exception as e:
+            log.warning(f"查询 {fund_code} 所在交易所失败: {e}")
+            return None
+
+        diff = (data.get('data') or {}).get('diff') or []
+        if isinstance(diff, dict):
+            diff = list(diff.values())
+        markets = [str(item.get('f13')) for item in diff if item.get('f12') == fund_code and item.get('f13') is not None]
+        if not markets:
+            return None
+        guess = self._market(fund_code)
+        return guess if guess in markets else markets[0]
+
+    @staticmethod
+    def _get_market(fund_code: str) -> str:
+        """判断交易所：深交所(0) 或 上交所(1)"""
+        if fund_code.startswith('16') or fund_code.startswith('15'):
+            return '0'  # 深交所
+        elif fund_code.startswith(('50', '51', '52')):
+            return '1'  # 上交所
+        else:
+            return '0'  # 默认深交所
+
+    def _market(self, fund_code: str) -> str:
+        """交易所：优先使用基金元数据，没有记录时按代码规则判断"""
+        meta = self.fund_meta.get(fund_code) if self.fund_meta is not None else None
+        return meta.market if meta else self._get_market(fund_code)
+
+    def _get_prices_from_eastmoney(self, fund_codes: List[str]) -> Dict[str, Dict]:
+        """
+        一次请求获取多只基金的场内价格（ulist 接口）
 
+        Returns:
+            {'163406': {'name': '兴全合润', 'price': 2.523, 'volume': 1234567}, ...}
+        """
+        metas = [self.fund_meta.get(code) for code in fund_codes] if self.fund_meta is not None else []
+        # 元数据齐全时 secid 和名称都来自内存，行情请求不再返回名称字段
+        from_meta = bool(metas) and all(meta and meta.name for meta in metas)
+        if from_meta:
+            url = self._ulist_url(self.PUSH_HOST, [meta.secid for meta in metas], with_names=False)
+        else:
+            url = self._ulist_url(self.PUSH_HOST, [f"{self._market(code)}.{code}" for code in fund_codes])
+
+        try:
+            resp = self.session.get(url, timeout=5, headers=CRITICAL)
+            price_data = resp.json()
         except Exception as e:
-            log.error(f"从新浪获取 LOF 数据失败 {fund_code}: {e}")
+            log.error(f"批量获取场内价格失败: {e}")
+            return {}
+
+        quotes = self._parse_ulist(price_data)
+        if from_meta:
+            for meta in metas:
+                if meta.code in quotes:
+                    quotes[meta.code]['name'] = meta.name
+        return quotes
+
+    @staticmethod
+    def _ulist_url(push_host: str, secids: List[str], with_names: bool = True) -> str:
+        """多证券行情接口地址"""
+        fields = "f12,f14,f2,f5" if with_names else "f12,f2,f5"
+        # fltt=2 时价格直接以元返回，不需要再按小数位换算
+        return f"{push_host}/api/qt/ulist.np/get?fltt=2&fields={fields}&secids={','.join(secids)}"
+
+    @staticmethod
+    def _default_secids(fund_codes: List[str]) -> List[str]:
+        """按代码规则生成 secid（没有基金元数据时使用）"""
+        return [f"{DataFetcher._get_market(code)}.{code}" for code in fund_codes]
+
+    @staticmethod
+    def _parse_ulist(price_data: Dict) -> Dict[str, Dict]:
+        """解析多证券行情接口响应"""
+        log.debug(f"批量价格 API 响应: {price_data}")
+
+        diff = (price_data.get('data') or {}).get('diff') or []
+        # diff 可能是列表，也可能是以序号为键的字典
+        if isinstance(diff, dict):
+            diff = list(diff.values())
+
+        quotes = {}
+        for item in diff:
+            code = item.get('f12')
+            price = item.get('f2')
+            # 停牌或无数据时价格字段为 "-"
+            if not code or not isinstance(price, (int, float)):
+                continue
+
+            volume = item.get('f5')
+            quotes[code] = {
+                'name': item.get('f14', ''),
+                'price': float(price),
+                'volume': volume if isinstance(volume, (int, float)) else 0,
+            }
+
+        return quotes
+
+    def _get_nav(self, fund_code: str) -> Tuple[float, str]:
+        """获取最新净值，优先使用净值缓存"""
+        if self.nav_cache:
+            cached = self.nav_cache.get(fund_code)
+            if cached:
+                return cached
 
-        return None
+        nav, nav_date = self._get_nav_from_eastmoney(fund_code)
+
+        if self.nav_cache and nav > 0:
+            self.nav_cache.put(fund_code, nav, nav_date)
+
+        return nav, nav_date
+
+    def _get_nav_from_eastmoney(self, fund_code: str) -> Tuple[float, str]:
+        """
+        从基金主页获取最新单位净值
+
+        Returns:
+            (净值, 净值日期)，解析失败时返回 (0.0, '')
+        """
+        fund_url = f"{self.FUND_HOST}/{fund_code}.html"
+        with metrics.span('fetch.nav_page'):
+            fund_resp = self.session.get(fund_url, timeout=10)
+            fund_resp.encoding = 'utf-8'
+            text = fund_resp.text
+
+        # 快速路径定位 dataOfFund 区块，失败时回退到 BeautifulSoup 完整解析
+        with metrics.span('parse.nav'):
+            result = parse_nav(text)
+        if not result:
+            log.warning(f"无法从基金主页解析净值: {fund_code}")
+            return 0.0, ''
+
+        nav, nav_date = result
+        log.debug(f"从基金主页获取净值: {nav} (日期: {nav_date})")
+        return nav, nav_date
+
+    @staticmethod
+    def _build_lof_record(fund_code: str, quote: Dict, nav: float, nav_date: str) -> Quote:
+        """根据场内行情和净值组装 LOF 数据并计算溢价率"""
+        market_price = quote['price']
+
+        # 如果净值获取失败，使用价格的 98-102% 作为模拟净值
+        if nav == 0.0:
+            log.warning(f"净值获取失败，使用模拟净值（价格的 99%）")
+            nav = market_price * 0.99
+
+        # 计算溢价率
+        premium_rate = 0
+        if nav > 0:
+            premium_rate = (market_price - nav) / nav
+
+        result = Quote(
+            code=fund_code,
+            name=quote['name'],
+            price=market_price,
+            nav=nav,
+            nav_date=nav_date,
+            premium_rate=premium_rate,
+            volume=int(quote['volume']),
+            timestamp_ns=time.time_ns()
+        )
+
+        log.debug(f"LOF {fund_code}: 价格={market_price:.3f}, 净值={nav:.3f}, 溢价率={premium_rate:.2%}")
+        return result
+
+    def _get_price_from_eastmoney(self, fund_code: str) -> Optional[Dict]:
+        """
+        从东方财富获取单只基金场内价格
+
+        Returns:
+            {'name': '兴全合润', 'price': 2.523, 'volume': 1234567}，失败时返回 None
+        """
+        market = self._market(fund_code)
+        price_url = f"{self.PUSH_HOST}/api/qt/stock/get?secid={market}.{fund_code}"
+
+        try:
+            with metrics.span('fetch.price'):
+                price_resp = self.session.get(price_url, timeout=5, headers=CRITICAL)
+                price_data = price_resp.json()
+        except Exception as e:
+            log.error(f"获取 {fund_code} 价格失败: {e}")
+            return None
+
+        log.debug(f"价格 API 响应: {price_data}")
+
+        if not price_data.get('data'):
+            log.warning(f"无法获取 {fund_code} 场内价格: {price_data.get('rc', '')}")
+            return None
+
+        # LOF 基金价格 API 返回值需要除以 1000 转换为元（而不是 100）
+        # 因为场内价格通常比净值高 10 倍
+        return {
+            'price': price_data['data'].get('f43', 0) / 1000,  # 最新价
+            'volume': price_data['data'].get('f47', 0),  # 成交量
+            'name': price_data['data'].get('f58', ''),  # 基金名称
+        }
+
+    def _get_lof_from_eastmoney(self, fund_code: str) -> Optional[Quote]:
+        """从东方财富获取 LOF 数据"""
+        # 获取场内价格（实时）
+        quote = self._get_price_from_eastmoney(fund_code)
+        if not quote:
+            return None
+
+        return self._get_lof_and_save(fund_code, quote)
+
+    def _get_lof_hedged(self, fund_code: str) -> Optional[Quote]:
+        """对冲模式：场内价格取东方财富与新浪中先返回的有效结果"""
+        quote = self.hedger.call(
+            lambda: self._get_price_from_eastmoney(fund_code),
+            lambda: self._get_price_from_sina(fund_code),
+            names=("eastmoney", "sina")
+        )
+        if not quote:
+            return None
+
+        return self._get_lof_and_save(fund_code, quote)
+
+    def _get_lof_and_save(self, fund_code: str, quote: Dict) -> Optional[Quote]:
+        """补充净值（缓存未命中时抓取基金主页）并保存净值缓存"""
+        data = self.get_lof_with_quote(fund_code, quote)
+        if self.nav_cache:
+            self.nav_cache.save()
+        return data
+
+    def _get_lof_from_sina(self, fund_code: str) -> Optional[Quote]:
+        """从新浪获取 LOF 数据（备用，净值仍来自东方财富基金主页）"""
+        quote = self._get_price_from_sina(fund_code)
+        if not quote:
+            return None
+
+        return self._get_lof_and_save(fund_code, quote)
+
+    # 新浪行情单次请求的最大代码数（URL 长度限制）
+    SINA_BATCH_SIZE = 80
+
+    # var hq_str_sz163406="名称,今开,昨收,现价,最高,最低,买一,卖一,成交量(股),成交额,...";
+    SINA_LINE_PATTERN = re.compile(r'hq_str_(?:sh|sz)(\d{6})="([^"]*)"')
+
+    def _get_price_from_sina(self, fund_code: str) -> Optional[Dict]:
+        """
+        从新浪获取单只基金场内价格
+
+        返回格式同 _get_price_from_eastmoney
+        """
+        return self._get_prices_from_sina([fund_code]).get(fund_code)
+
+    def _get_prices_from_sina(self, fund_codes: List[str]) -> Dict[str, Dict]:
+        """
+        从新浪获取多只基金场内价格（格式同 _get_prices_from_eastmoney）
+
+        一次 list= 请求最多包含 SINA_BATCH_SIZE 只基金，响应整体按 GBK 解码一次后逐行解析
+        """
+        quotes = {}
+        for i in range(0, len(fund_codes), self.SINA_BATCH_SIZE):
+            batch = fund_codes[i:i + self.SINA_BATCH_SIZE]
+            symbols = ','.join(('sh' if self._market(code) == '1' else 'sz') + code for code in batch)
+
+            try:
+                # 新浪行情接口要求 Referer
+                resp = self.session.get(
+                    f"{self.SINA_HOST}/list={symbols}",
+                    timeout=5,
+                    headers={'Referer': 'https://finance.sina.com.cn', **CRITICAL}
+                )
+                if resp.status_code != 200:
+                    log.error(f"新浪行情请求失败: HTTP {resp.status_code}")
+                    continue
+                # 响应为 GBK 编码
+                quotes.update(self._parse_sina(resp.content.decode('gbk', errors='replace')))
+            except Exception as e:
+                log.error(f"从新浪获取场内价格失败: {e}")
+
+        return quotes
+
+    @classmethod
+    def _parse_sina(cls, text: str) -> Dict[str, Dict]:
+        """解析新浪行情响应（每行一只证券，停牌或无效代码的行被跳过）"""
+        quotes = {}
+        for code, body in cls.SINA_LINE_PATTERN.findall(text):
+            parts = body.split(',')
+            if len(parts) <= 9:
+                continue
+            try:
+                price = float(parts[3])
+                volume = int(float(parts[8])) // 100  # 股 -> 手，与东方财富一致
+            except ValueError:
+                continue
+            if price > 0:
+                quotes[code] = {'name': parts[0], 'price': price, 'volume': volume}
+        return quotes
 
     def get_new_bonds(self) -> List[Dict]:
         """
@@ -176,7 +664,7 @@ class DataFetcher:
             ]
         """
         try:
-            url = "http://data.eastmoney.com/kzz/default.html"
+            url = f"{self.DATA_HOST}/kzz/default.html"
             resp = self.session.get(url, timeout=10)
             resp.encoding = 'utf-8'
 
@@ -215,11 +703,11 @@ if __name__ == "__main__":
     # 测试 LOF 数据获取
     lof_data = fetcher.get_lof_realtime_price("163406")
     if lof_data:
-        print(json.dumps(lof_data, indent=2, ensure_ascii=False))
+        print(json.dumps(lof_data.to_dict(), indent=2, ensure_ascii=False))
 
     time.sleep(2)
 
     # 测试另一只基金
     lof_data2 = fetcher.get_lof_realtime_price("161725")
     if lof_data2:
-        print(json.dumps(lof_data2, indent=2, ensure_ascii=False))
+        print(json.dumps(lof_data2.to_dict(), indent=2, ensure_ascii=False))
@@ -0,0 +1,154 @@
+"""
+套利机会判定
+对一次扫描的全部基金按列（NumPy 掩码）一次性判定溢价 / 折价机会，
+只把命中的基金交给后续的通知和交易流程
+"""
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ..utils.quote import Quote, QuoteBatch
+
+PREMIUM = "premium"
+DISCOUNT = "discount"
+
+Threshold = Union[float, np.ndarray]
+
+
+class OpportunityEvaluator:
+    """
+    套利机会判定
+
+    溢价机会：溢价率 - 溢价成本 >= 溢价阈值
+    折价机会：-溢价率 - 折价成本 >= 折价阈值（溢价优先）
+    净值为 0 或无成交的基金不参与判定。
+
+    阈值可按基金覆盖（overrides），成本由调用方按基金传入（标量或与行情等长的数组）；
+    evaluate_edges 按 (基金数, 金额档位数) 的净收益率判定，并选出金额最大的盈利档位
+    """
+
+    def __init__(
+        self,
+        min_premium_rate: float,
+        min_discount_rate: float,
+        overrides: Optional[Dict[str, Dict]] = None
+    ):
+        """
+        Args:
+            min_premium_rate: 默认溢价阈值
+            min_discount_rate: 默认折价阈值
+            overrides: 按基金覆盖阈值，如 {'163406': {'min_premium_rate': 0.02}}
+        """
+        self.min_premium_rate = min_premium_rate
+        self.min_discount_rate = min_discount_rate
+        self.overrides = overrides or {}
+        # 基金列表通常每轮相同，缓存最近一次的阈值数组
+        self._cached_codes: Optional[Tuple[str, ...]] = None
+        self._cached_thresholds: Tuple[Threshold, Threshold] = (min_premium_rate, min_discount_rate)
+
+    def threshold(self, fund_code: str) -> Tuple[float, float]:
+        """单只基金的 (溢价阈值, 折价阈值)"""
+        override = self.overrides.get(fund_code, {})
+        return (
+            override.get('min_premium_rate', self.min_premium_rate),
+            override.get('min_discount_rate', self.min_discount_rate),
+        )
+
+    def thresholds(self, codes: np.ndarray) -> Tuple[Threshold, Threshold]:
+        """按基金的阈值数组（没有覆盖时直接返回标量，由 NumPy 广播）"""
+        if not self.overrides:
+            return self.min_premium_rate, self.min_discount_rate
+
+        key = tuple(codes.tolist())
+        if key != self._cached_codes:
+            pairs = [self.threshold(code) for code in key]
+            self._cached_thresholds = (
+                np.fromiter((p for p, _ in pairs), dtype=float, count=len(pairs)),
+                np.fromiter((d for _, d in pairs), dtype=float, count=len(pairs)),
+            )
+            self._cached_codes = key
+        return self._cached_thresholds
+
+    def evaluate(
+        self,
+        quotes: QuoteBatch,
+        premium_costs: Threshold = 0.0,
+        discount_costs: Threshold = 0.0
+    ) -> List[Tuple[str, str]]:
+        """
+        判定整批行情
+
+        Returns:
+            [(基金代码, 'premium' / 'discount'), ...]，顺序与行情一致
+        """
+        if not len(quotes):
+            return []
+
+        codes = quotes.column('code')
+        premium = quotes.column('premium_rate')
+        min_premium, min_discount = self.thresholds(codes)
+
+        valid = (quotes.column('nav') != 0) & (quotes.column('volume') != 0)
+        premium_hit = valid & (premium - premium_costs >= min_premium)
+        discount_hit = valid & ~premium_hit & (-premium - discount_costs >= min_discount)
+
+        hits = np.flatnonzero(premium_hit | discount_hit)
+        types = np.where(premium_hit[hits], PREMIUM, DISCOUNT)
+        return list(zip(codes[hits].tolist(), types.tolist()))
+
+    def evaluate_edges(
+        self,
+        quotes: QuoteBatch,
+        premium_edges: np.ndarray,
+        discount_edges: np.ndarray,
+        max_bucket: Optional[int] = None
+    ) -> List[Tuple[str, str, int]]:
+        """
+        按各金额档位的净收益率判定整批行情，并为每只命中的基金选出金额最大的盈利档位
+
+        Args:
+            premium_edges / discount_edges: 净收益率，形状为 (基金数, 金额档位数)（见 CostModel.net_edges）
+            max_bucket: 可用的最大档位（可用资金所在档位），None 表示全部档位
+
+        Returns:
+            [(基金代码, 'premium' / 'discount', 档位), ...]，顺序与行情一致
+        """
+        if not len(quotes):
+            return []
+
+        if max_bucket is not None:
+            premium_edges = premium_edges[:, :max_bucket + 1]
+            discount_edges = discount_edges[:, :max_bucket + 1]
+
+        codes = quotes.column('code')
+        min_premium, min_discount = self.thresholds(codes)
+        valid = ((quotes.column('nav') != 0) & (quotes.column('volume') != 0))[:, None]
+
+        premium_ok = valid & (premium_edges >= np.reshape(min_premium, (-1, 1)))
+        discount_ok = valid & (discount_edges >= np.reshape(min_discount, (-1, 1)))
+        premium_hit = premium_ok.any(axis=1)
+        discount_hit = ~premium_hit & discount_ok.any(axis=1)
+
+        # 每行最后一个满足条件的列即金额最大的盈利档位
+        width = premium_ok.shape[1]
+        buckets = np.where(
+            premium_hit,
+            width - 1 - np.argmax(premium_ok[:, ::-1], axis=1),
+            width - 1 - np.argmax(discount_ok[:, ::-1], axis=1),
+        )
+
+        hits = np.flatnonzero(premium_hit | discount_hit)
+        types = np.where(premium_hit[hits], PREMIUM, DISCOUNT)
+        return list(zip(codes[hits].tolist(), types.tolist(), buckets[hits].tolist()))
+
+    def classify(self, quote: Quote, premium_cost: float = 0.0, discount_cost: float = 0.0) -> Optional[str]:
+        """判定单条行情（推送模式逐条到达时使用），规则同 evaluate"""
+        if quote.nav == 0 or quote.volume == 0:
+            return None
+
+        min_premium, min_discount = self.threshold(quote.code)
+        if quote.premium_rate - premium_cost >= min_premium:
+            return PREMIUM
+        if -quote.premium_rate - discount_cost >= min_discount:
+            return DISCOUNT
+        return None
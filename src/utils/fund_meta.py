@@ -0,0 +1,359 @@
+"""
+基金元数据存储
+证券代码（secid）、名称、类型、申赎费率、跟踪指数等低频变化的数据，
+保存在 SQLite 中，启动时整体加载到内存，后台按较慢的节奏刷新
+"""
+import json
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from ..utils.logger import log
+
+# 默认数据库文件
+DEFAULT_DB_FILE = Path(__file__).parent.parent.parent / "data" / "fund_meta.db"
+
+
+@dataclass(frozen=True, slots=True)
+class FundMeta:
+    """基金元数据"""
+
+    code: str
+    secid: str                 # 东方财富证券代码，如 '0.163406'
+    name: str = ''
+    fund_type: str = ''        # 如 '混合型-偏股'
+    # 申购费率分档：(起始金额(元), 费率, 每笔固定费用(元))
+    purchase_fees: Tuple[Tuple[float, float, float], ...] = ()
+    # 赎回费率分档：(起始持有天数, 费率)
+    redemption_fees: Tuple[Tuple[int, float], ...] = ()
+    tracked_index: str = ''    # 跟踪标的（非指数基金为空）
+    updated_at: float = 0.0    # 最近一次从网页刷新的时间戳
+
+    @property
+    def complete(self) -> bool:
+        """名称和费率都已解析（概况页 / 费率页返回错误页面时为 False）"""
+        return bool(self.name and (self.purchase_fees or self.redemption_fees))
+
+    @property
+    def market(self) -> str:
+        """交易所：深交所(0) 或 上交所(1)"""
+        return self.secid.split('.', 1)[0]
+
+    def purchase_fee(self, amount: float) -> float:
+        """申购 amount 元的费用（元），没有费率数据时返回 0"""
+        tier = None
+        for tier_start in self.purchase_fees:
+            if amount >= tier_start[0]:
+                tier = tier_start
+        if not tier:
+            return 0.0
+        _, rate, fixed = tier
+        return fixed if fixed else amount * rate / (1 + rate)
+
+    def redemption_rate(self, holding_days: int) -> float:
+        """持有 holding_days 天赎回的费率，没有费率数据时返回 0"""
+        rate = 0.0
+        for min_days, tier_rate in self.redemption_fees:
+            if holding_days >= min_days:
+                rate = tier_rate
+        return rate
+
+
+class FundMetaStore:
+    """
+    基金元数据存储
+
+    - 读取只访问内存字典，不涉及磁盘和网络
+    - 写入同时更新内存和 SQLite（只由后台刷新线程调用）
+    - 超过 max_age_hours 未刷新的记录视为过期，由后台线程重新抓取
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS fund_meta (
+            code TEXT PRIMARY KEY,
+            secid TEXT NOT NULL,
+            name TEXT NOT NULL DEFAULT '',
+            fund_type TEXT NOT NULL DEFAULT '',
+            purchase_fees TEXT NOT NULL DEFAULT '[]',
+            redemption_fees TEXT NOT NULL DEFAULT '[]',
+            tracked_index TEXT NOT NULL DEFAULT '',
+            updated_at REAL NOT NULL DEFAULT 0
+        )
+    """
+
+    def __init__(self, path: Optional[str] = str(DEFAULT_DB_FILE), max_age_hours: float = 24 * 7):
+        """
+        Args:
+            path: SQLite 文件路径（None 表示只在内存中保存）
+            max_age_hours: 记录的有效期（小时），过期后由后台刷新
+        """
+        self.path = Path(path) if path else None
+        self.max_age_seconds = max_age_hours * 3600
+
+        self._metas: Dict[str, FundMeta] = {}
+        # 每次写入加一，依赖元数据的缓存（如成本表）据此判断是否需要重算
+        self.version = 0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.load()
+
+    def get(self, fund_code: str) -> Optional[FundMeta]:
+        return self._metas.get(fund_code)
+
+    def __contains__(self, fund_code: str) -> bool:
+        return fund_code in self._metas
+
+    def __len__(self) -> int:
+        return len(self._metas)
+
+    def put(self, meta: FundMeta):
+        """保存一条元数据（内存 + 磁盘）"""
+        with self._lock:
+            self._metas[meta.code] = meta
+            self.version += 1
+            if not self.path:
+                return
+
+            try:
+                with self._connect() as conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO fund_meta VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            meta.code, meta.secid, meta.name, meta.fund_type,
+                            json.dumps(meta.purchase_fees), json.dumps(meta.redemption_fees),
+                            meta.tracked_index, meta.updated_at,
+                        )
+                    )
+            except Exception as e:
+                log.warning(f"保存基金元数据失败 {meta.code}: {e}")
+
+    def stale(self, fund_codes: Iterable[str], now: Optional[float] = None) -> List[str]:
+        """缺失或已过期的基金代码"""
+        now = time.time() if now is None else now
+        result = []
+        for code in fund_codes:
+            meta = self._metas.get(code)
+            if not meta or now - meta.updated_at >= self.max_age_seconds:
+                result.append(code)
+        return result
+
+    def refresh(self, fund_codes: Iterable[str], fetch: Callable[[str], Optional[FundMeta]]) -> int:
+        """
+        刷新缺失或过期的记录
+
+        Args:
+            fund_codes: 需要元数据的基金
+            fetch: 抓取单只基金元数据的函数（如 DataFetcher.get_fund_meta）
+
+        Returns:
+            成功刷新的数量
+        """
+        refreshed = 0
+        for code in self.stale(fund_codes):
+            if self._stop_event.is_set():
+                break
+            try:
+                meta = fetch(code)
+            except Exception as e:
+                log.warning(f"刷新基金元数据失败 {code}: {e}")
+                continue
+            if not meta:
+                continue
+            existing = self.get(code)
+            if not meta.complete and existing is not None and existing.complete:
+                # 不用残缺的记录覆盖完整的记录，保留旧记录等下一轮重试
+                log.warning(f"基金元数据不完整，保留已有记录: {code}")
+                continue
+            self.put(meta)
+            refreshed += 1
+
+        if refreshed:
+            log.info(f"已刷新基金元数据: {refreshed} 只基金")
+        return refreshed
+
+    def start_background_refresh(
+        self,
+        codes: Callable[[], Iterable[str]],
+        fetch: Callable[[str], Optional[FundMeta]],
+        interval_minutes: float = 60
+    ):
+        """
+        启动后台刷新线程：立即检查一次，之后每 interval_minutes 分钟检查一次
+
+        Args:
+            codes: 返回当前需要元数据的基金代码（每轮调用一次）
+            fetch: 抓取单只基金元数据的函数
+        """
+        if self._thread and self._thread.is_alive():
+            return
+
+        def loop():
+            while not self._stop_event.is_set():
+                try:
+                    self.refresh(list(codes()), fetch)
+                except Exception as e:
+                    log.warning(f"基金元数据后台刷新出错: {e}")
+                self._stop_event.wait(interval_minutes * 60)
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=loop, name="fund-meta-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """停止后台刷新"""
+        self._stop_event.set()
+
+    def load(self):
+        """从 SQLite 加载全部记录到内存"""
+        if not self.path or not self.path.exists():
+            return
+
+        try:
+            with self._connect() as conn:
+                rows = conn.execute("SELECT * FROM fund_meta").fetchall()
+
+            metas = {}
+            for code, secid, name, fund_type, purchase, redemption, tracked_index, updated_at in rows:
+                metas[code] = FundMeta(
+                    code, secid, name, fund_type,
+                    tuple(tuple(tier) for tier in json.loads(purchase)),
+                    tuple(tuple(tier) for tier in json.loads(redemption)),
+                    tracked_index, updated_at
+                )
+
+            with self._lock:
+                self._metas.update(metas)
+            log.info(f"已加载基金元数据: {len(metas)} 只基金")
+
+        except Exception as e:
+            log.warning(f"加载基金元数据失败: {e}")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """打开数据库连接，退出时提交并关闭"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        try:
+            with conn:
+                conn.execute(self.SCHEMA)
+                yield conn
+        finally:
+            conn.close()
+
+
+# 费率分档的起始条件，如 "大于等于100万元"、"大于等于1年"
+BOUND_PATTERN = re.compile(r'大于(?:等于)?\s*([\d.]+)\s*(万元|元|天|日|个月|月|年)')
+UNIT_SCALE = {'万元': 10000, '元': 1, '天': 1, '日': 1, '个月': 30, '月': 30, '年': 365}
+
+
+def parse_profile_page(html: str) -> Dict[str, str]:
+    """
+    解析基金概况页（jbgk）
+
+    Returns:
+        {'name': '兴全合润混合(LOF)', 'fund_type': '混合型-偏股', 'tracked_index': ''}
+    """
+    soup = BeautifulSoup(html, 'lxml')
+    info = {}
+    for th in soup.find_all('th'):
+        td = th.find_next_sibling('td')
+        if td:
+            info[th.get_text(strip=True)] = td.get_text(strip=True)
+
+    tracked_index = info.get('跟踪标的', '')
+    if '无跟踪标的' in tracked_index:
+        tracked_index = ''
+
+    return {
+        'name': info.get('基金简称', ''),
+        'fund_type': info.get('基金类型', ''),
+        'tracked_index': tracked_index,
+    }
+
+
+def parse_fee_page(html: str) -> Tuple[Tuple[Tuple[float, float, float], ...], Tuple[Tuple[int, float], ...]]:
+    """
+    解析基金费率页（jjfl），费率取原费率（不含销售平台折扣）
+
+    Returns:
+        (申购费率分档, 赎回费率分档)，格式同 FundMeta
+    """
+    soup = BeautifulSoup(html, 'lxml')
+    purchase, redemption = [], []
+
+    for label in soup.find_all('label'):
+        title = label.get_text(strip=True)
+        # 只取前端收费（页面可能同时列出后端收费）
+        if '后端' in title:
+            continue
+        if title.startswith('申购费率'):
+            target = purchase
+        elif title.startswith('赎回费率'):
+            target = redemption
+        else:
+            continue
+
+        # 同一个费率区块内的第一张表
+        box = label.find_parent(class_='boxitem') or label.parent
+        table = box.find('table') if box else None
+        if not table:
+            continue
+
+        for row in table.find_all('tr'):
+            cells = [td.get_text(strip=True) for td in row.find_all('td')]
+            tier = _parse_fee_row(cells)
+            if tier is not None:
+                target.append(tier)
+
+    purchase_tiers = tuple((float(start), rate, fixed) for start, rate, fixed in purchase)
+    redemption_tiers = tuple((int(start), rate) for start, rate, _ in redemption)
+    return purchase_tiers, redemption_tiers
+
+
+def _parse_fee_row(cells: List[str]) -> Optional[Tuple[float, float, float]]:
+    """解析一行费率：(起始金额或天数, 费率, 固定费用)，不是费率行时返回 None"""
+    fee_index = next(
+        (i for i, text in enumerate(cells) if text.endswith('%') or text.startswith('每笔')),
+        None
+    )
+    if fee_index is None:
+        return None
+
+    start = 0.0
+    for text in cells[:fee_index]:
+        match = BOUND_PATTERN.search(text)
+        if match:
+            start = float(match.group(1)) * UNIT_SCALE[match.group(2)]
+            break
+
+    fee_text = cells[fee_index]
+    if fee_text.startswith('每笔'):
+        fixed = re.search(r'[\d.]+', fee_text)
+        return start, 0.0, float(fixed.group()) if fixed else 0.0
+
+    return start, float(fee_text.rstrip('%')) / 100, 0.0
+
+
+def build_fund_meta(fund_code: str, secid: str, profile_html: str, fee_html: str) -> FundMeta:
+    """由概况页和费率页组装元数据"""
+    profile = parse_profile_page(profile_html)
+    purchase_fees, redemption_fees = parse_fee_page(fee_html)
+    return FundMeta(
+        code=fund_code,
+        secid=secid,
+        name=profile['name'],
+        fund_type=profile['fund_type'],
+        purchase_fees=purchase_fees,
+        redemption_fees=redemption_fees,
+        tracked_index=profile['tracked_index'],
+        updated_at=time.time(),
+    )
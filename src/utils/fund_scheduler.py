@@ -0,0 +1,197 @@
+"""
+基金轮询优先级调度
+每只基金按溢价率距离阈值的远近和近期溢价波动决定轮询周期：
+接近阈值或波动大的基金更频繁地轮询，远离阈值的基金降低频率，
+总请求量保持在全局预算内（默认与等间隔轮询全部基金相同）
+
+到期时间对齐到 tick 的整数倍：同一时段到期的基金合并为一次批量请求，
+HTTP 请求数不超过每 tick 一次
+"""
+import heapq
+import itertools
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+class _FundState:
+    """单只基金的轮询状态"""
+
+    __slots__ = ('premium_rate', 'volatility', 'raw_period', 'period', 'due', 'version')
+
+    def __init__(self, period: float, due: float):
+        self.premium_rate: Optional[float] = None
+        self.volatility = 0.0
+        self.raw_period = period
+        self.period = period
+        self.due = due
+        self.version = 0
+
+
+class FundScheduler:
+    """
+    按下次到期时间排序的基金轮询堆
+
+    - 周期 = min_period × (到最近阈值的距离 / 近期溢价波动)，即预计需要几次“典型波动”才会触及阈值
+    - 所有基金的轮询频率之和按 budget（每秒轮询次数）整体缩放后，再限制在 [min_period, max_period]；
+      合计需求增量维护，每只基金在自己重新排期时使用当时的缩放系数，一轮轮询后收敛
+    - 新加入或获取失败的基金立即 / 按默认周期重新轮询
+    - tick > 0 时到期时间向上对齐到 tick 的整数倍，due() 一次取出同一时段的全部基金，
+      批量请求的次数不超过每 tick 一次（周期下限同时提高到 tick）
+    """
+
+    def __init__(
+        self,
+        min_premium_rate: float,
+        min_discount_rate: float,
+        budget: float,
+        min_period: float = 10.0,
+        max_period: float = 600.0,
+        default_period: float = 60.0,
+        min_volatility: float = 0.0005,
+        smoothing: float = 0.3,
+        tick: float = 0.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            min_premium_rate / min_discount_rate: 策略的溢价、折价阈值
+            budget: 全局预算（所有基金合计每秒轮询次数）
+            min_period / max_period: 单只基金轮询周期的上下限（秒）
+            default_period: 尚无溢价率数据或获取失败时的周期（秒）
+            min_volatility: 波动率下限，避免溢价率长期不变的基金周期被无限拉长
+            smoothing: 溢价率变化的指数移动平均系数
+            tick: 批量请求的最小间隔（秒），0 表示不对齐
+        """
+        self.min_premium_rate = min_premium_rate
+        self.min_discount_rate = min_discount_rate
+        self.budget = budget
+        self.min_period = min_period
+        self.max_period = max_period
+        self.default_period = default_period
+        self.min_volatility = min_volatility
+        self.smoothing = smoothing
+        self.tick = tick
+        self.clock = clock
+
+        self._funds: Dict[str, _FundState] = {}
+        self._heap: List = []  # (到期时间, 序号, 基金代码, 版本)
+        self._demand = 0.0     # 所有基金未缩放周期的频率之和
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def _push(self, fund_code: str, state: _FundState):
+        # 重新排期时旧条目留在堆中，按版本号识别后丢弃（惰性删除）
+        state.version += 1
+        heapq.heappush(self._heap, (state.due, next(self._seq), fund_code, state.version))
+
+    def _align(self, due: float) -> float:
+        """到期时间向上对齐到 tick 的整数倍"""
+        if self.tick <= 0:
+            return due
+        return math.ceil(due / self.tick - 1e-9) * self.tick
+
+    def sync(self, fund_codes: Iterable[str]):
+        """更新基金集合：新基金立即到期，不再监控的基金移除"""
+        codes = list(dict.fromkeys(fund_codes))
+        now = self.clock()
+        with self._lock:
+            for code in set(self._funds) - set(codes):
+                self._demand -= 1.0 / self._funds.pop(code).raw_period
+            for code in codes:
+                if code not in self._funds:
+                    state = _FundState(self.default_period, now)
+                    self._funds[code] = state
+                    self._demand += 1.0 / state.raw_period
+                    self._push(code, state)
+
+    def due(self, limit: Optional[int] = None) -> List[str]:
+        """
+        取出已到期的基金（按到期时间先后）
+
+        对齐模式下半个 tick 内到期的基金也一并取出（与本时段合并为一次请求）。
+        取出的基金需要通过 update() 或 failed() 重新排期
+        """
+        horizon = self.clock() + self.tick / 2
+        result = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= horizon:
+                if limit is not None and len(result) >= limit:
+                    break
+                _, _, code, version = heapq.heappop(self._heap)
+                state = self._funds.get(code)
+                if state is None or state.version != version:
+                    continue
+                result.append(code)
+        return result
+
+    def time_until_due(self) -> float:
+        """距离最早到期基金的时间（秒），没有基金时返回 max_period"""
+        with self._lock:
+            while self._heap:
+                due, _, code, version = self._heap[0]
+                state = self._funds.get(code)
+                if state is not None and state.version == version:
+                    return max(0.0, due - self.clock())
+                heapq.heappop(self._heap)
+        return self.max_period
+
+    def _raw_period(self, state: _FundState) -> float:
+        """未按预算缩放的周期"""
+        if state.premium_rate is None:
+            return self.default_period
+
+        distance = min(
+            abs(self.min_premium_rate - state.premium_rate),
+            abs(state.premium_rate + self.min_discount_rate)
+        )
+        # 已越过阈值的基金按最短周期跟踪
+        if state.premium_rate >= self.min_premium_rate or state.premium_rate <= -self.min_discount_rate:
+            distance = 0.0
+
+        steps = distance / max(state.volatility, self.min_volatility)
+        return self.min_period * max(1.0, steps)
+
+    def _scale(self) -> float:
+        """让所有基金的轮询频率之和等于预算的缩放系数"""
+        if self._demand <= 0 or self.budget <= 0:
+            return 1.0
+        return self._demand / self.budget
+
+    def update(self, fund_code: str, premium_rate: float):
+        """记录一次轮询结果并重新排期"""
+        now = self.clock()
+        with self._lock:
+            state = self._funds.get(fund_code)
+            if state is None:
+                return
+
+            if state.premium_rate is not None:
+                change = abs(premium_rate - state.premium_rate)
+                state.volatility += self.smoothing * (change - state.volatility)
+            state.premium_rate = premium_rate
+
+            raw_period = self._raw_period(state)
+            self._demand += 1.0 / raw_period - 1.0 / state.raw_period
+            state.raw_period = raw_period
+
+            period = raw_period * self._scale()
+            state.period = min(self.max_period, max(self.min_period, self.tick, period))
+            state.due = self._align(now + state.period)
+            self._push(fund_code, state)
+
+    def failed(self, fund_code: str):
+        """获取失败：按默认周期重试"""
+        now = self.clock()
+        with self._lock:
+            state = self._funds.get(fund_code)
+            if state is None:
+                return
+            state.due = self._align(now + self.default_period)
+            self._push(fund_code, state)
+
+    def periods(self) -> Dict[str, float]:
+        """各基金当前的轮询周期（秒）"""
+        with self._lock:
+            return {code: state.period for code, state in self._funds.items()}
@@ -0,0 +1,171 @@
+"""
+对冲请求（hedged request）
+主数据源超过 p95 延迟仍未返回时，向备用数据源发出第二个请求，取先返回的有效结果
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+from ..utils.logger import log
+
+
+class LatencyTracker:
+    """滑动窗口延迟统计"""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float):
+        with self._lock:
+            self._samples.append(latency)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """p 取 0~100；样本为空时返回 None"""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * p / 100))
+        return samples[index]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+class Hedger:
+    """
+    对冲请求执行器
+
+    - 主请求在 p95 延迟内返回有效结果：不发备用请求，请求量不变
+    - 超过 p95 延迟或主请求返回无效结果：发出备用请求，取先返回的有效结果
+    - 落败的请求：尚未开始的直接取消，已发出的结果被丢弃
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95,
+        initial_delay: float = 0.5,
+        min_delay: float = 0.05,
+        max_delay: float = 2.0,
+        min_samples: int = 20,
+        max_workers: int = 8
+    ):
+        """
+        Args:
+            percentile: 对冲延迟取主数据源延迟的百分位
+            initial_delay: 样本不足时使用的对冲延迟（秒）
+            min_delay/max_delay: 对冲延迟的上下限（秒）
+            min_samples: 开始使用统计延迟所需的最少样本数
+            max_workers: 执行请求的线程数
+        """
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+
+        self.primary_latency = LatencyTracker()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedge")
+        self._lock = threading.Lock()
+
+        self.calls = 0
+        self.hedged = 0  # 发出备用请求的次数
+        self.wins: Dict[str, int] = {}  # 数据源 -> 胜出次数
+        self.win_latency: Dict[str, LatencyTracker] = {}  # 数据源 -> 胜出时的延迟
+        self.failures = 0
+
+    def hedge_delay(self) -> float:
+        """当前对冲延迟：主数据源延迟的 p95（限制在上下限之间）"""
+        if len(self.primary_latency) < self.min_samples:
+            return self.initial_delay
+        delay = self.primary_latency.percentile(self.percentile)
+        return min(self.max_delay, max(self.min_delay, delay))
+
+    def call(
+        self,
+        primary: Callable[[], Any],
+        secondary: Callable[[], Any],
+        is_valid: Callable[[Any], bool] = bool,
+        names: tuple = ("primary", "secondary")
+    ) -> Any:
+        """
+        执行对冲请求
+
+        Returns:
+            先返回的有效结果；两个数据源都失败时返回 None
+        """
+        start = time.perf_counter()
+        delay = self.hedge_delay()
+
+        primary_future = self._executor.submit(primary)
+
+        def record_latency(future: Future):
+            # 主请求返回有效结果时（无论胜负）记录延迟，用于计算 p95；
+            # 熔断、连接被拒等立即失败的延迟接近 0，计入会把 p95 压到 min_delay，几乎每次都对冲
+            if self._valid(future, is_valid):
+                self.primary_latency.record(time.perf_counter() - start)
+
+        primary_future.add_done_callback(record_latency)
+        sources = {primary_future: names[0]}
+
+        done, _ = wait([primary_future], timeout=delay)
+        if not done or not self._valid(primary_future, is_valid):
+            self._launch(secondary, sources, names[1])
+
+        pending = set(sources)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if self._valid(future, is_valid):
+                    for loser in pending:
+                        loser.cancel()
+                    self._record_win(sources[future], time.perf_counter() - start)
+                    return future.result()
+
+        with self._lock:
+            self.calls += 1
+            self.failures += 1
+        return None
+
+    def _launch(self, secondary: Callable[[], Any], sources: Dict[Future, str], name: str):
+        with self._lock:
+            self.hedged += 1
+        sources[self._executor.submit(secondary)] = name
+
+    @staticmethod
+    def _valid(future: Future, is_valid: Callable[[Any], bool]) -> bool:
+        if not future.done() or future.cancelled() or future.exception() is not None:
+            return False
+        return bool(is_valid(future.result()))
+
+    def _record_win(self, source: str, latency: float):
+        with self._lock:
+            self.calls += 1
+            self.wins[source] = self.wins.get(source, 0) + 1
+            if source not in self.win_latency:
+                self.win_latency[source] = LatencyTracker()
+        self.win_latency[source].record(latency)
+        log.debug(f"对冲请求由 {source} 胜出，耗时 {latency * 1000:.0f} ms")
+
+    def stats(self) -> Dict:
+        """胜出数据源及延迟统计"""
+        with self._lock:
+            wins = dict(self.wins)
+            trackers = dict(self.win_latency)
+            calls, hedged, failures = self.calls, self.hedged, self.failures
+
+        return {
+            'calls': calls,
+            'hedged': hedged,
+            'failures': failures,
+            'hedge_delay': self.hedge_delay(),
+            'wins': wins,
+            'win_latency_p50': {source: t.percentile(50) for source, t in trackers.items()},
+            'win_latency_p95': {source: t.percentile(95) for source, t in trackers.items()},
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,201 @@
+"""
+HTTP 录制与回放
+录制 DataFetcher.session 的原始响应到压缩档案，回放时按 URL 返回录制内容，
+使解析和扫描流程可以在固定数据上离线、可重复地测试和测量
+
+用法:
+    # 录制
+    ARBITRAGE_HTTP_RECORD=fixtures/scan.jsonl.gz python -m src.utils.data_fetcher
+
+    # 回放（不访问网络）；ARBITRAGE_HTTP_REPLAY_LATENCY=1 按原始延迟回放
+    ARBITRAGE_HTTP_REPLAY=fixtures/scan.jsonl.gz python -m src.utils.data_fetcher
+"""
+import atexit
+import base64
+import gzip
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from ..utils.logger import log
+
+# 环境变量：设置后所有 DataFetcher 自动录制 / 回放
+RECORD_ENV = "ARBITRAGE_HTTP_RECORD"
+REPLAY_ENV = "ARBITRAGE_HTTP_REPLAY"
+REPLAY_LATENCY_ENV = "ARBITRAGE_HTTP_REPLAY_LATENCY"
+
+
+class FixtureArchive:
+    """
+    录制档案（gzip 压缩的 JSON Lines，每行一次请求）
+
+    {"method": "GET", "url": "...", "status": 200, "headers": {...},
+     "body": "<base64>", "latency": 0.083}
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else None
+        self.entries: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def add(self, method: str, url: str, status: int, headers: Dict, body: bytes, latency: float):
+        with self._lock:
+            self.entries.append({
+                'method': method,
+                'url': url,
+                'status': status,
+                'headers': headers,
+                'body': base64.b64encode(body).decode('ascii'),
+                'latency': round(latency, 6),
+            })
+
+    def save(self, path: Optional[str] = None):
+        path = Path(path) if path else self.path
+        with self._lock:
+            entries = list(self.entries)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        log.info(f"已保存 HTTP 录制档案: {path}（{len(entries)} 次请求）")
+
+    @classmethod
+    def load(cls, path: str) -> "FixtureArchive":
+        archive = cls(path)
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            archive.entries = [json.loads(line) for line in f if line.strip()]
+        return archive
+
+
+class RecordingAdapter(BaseAdapter):
+    """
+    录制适配器：请求交给原适配器发送，同时把响应写入档案
+
+    流式请求（如 SSE 推送）不录制，直接透传
+    """
+
+    def __init__(self, inner: BaseAdapter, archive: FixtureArchive):
+        super().__init__()
+        self.inner = inner
+        self.archive = archive
+
+    def send(self, request, stream=False, **kwargs):
+        start = time.perf_counter()
+        response = self.inner.send(request, stream=stream, **kwargs)
+        if stream:
+            return response
+
+        body = response.content
+        self.archive.add(
+            request.method, request.url, response.status_code,
+            dict(response.headers), body, time.perf_counter() - start
+        )
+        return response
+
+    def close(self):
+        self.inner.close()
+
+    def __getattr__(self, name):
+        # 透传原适配器的其他接口（如 ResilientAdapter.states()）
+        return getattr(self.inner, name)
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    回放适配器：按 (方法, URL) 返回录制的响应，不访问网络
+
+    - 同一 URL 录制了多次时按录制顺序依次返回，用完后重复最后一次
+    - 档案中没有的请求抛出 ConnectionError（与网络故障的处理路径一致）
+    - latency_scale > 0 时按原始延迟 × latency_scale 等待后再返回
+    """
+
+    def __init__(self, archive: FixtureArchive, latency_scale: float = 0.0):
+        super().__init__()
+        self.latency_scale = latency_scale
+        self._responses: Dict[Tuple[str, str], Deque[Dict]] = {}
+        self._lock = threading.Lock()
+        for entry in archive.entries:
+            self._responses.setdefault((entry['method'], entry['url']), deque()).append(entry)
+
+        self.served = 0
+        self.missed = 0
+
+    def send(self, request, **kwargs):
+        with self._lock:
+            entries = self._responses.get((request.method, request.url))
+            if not entries:
+                self.missed += 1
+                raise requests.exceptions.ConnectionError(f"回放档案中没有该请求: {request.url}", request=request)
+            entry = entries.popleft() if len(entries) > 1 else entries[0]
+            self.served += 1
+
+        if self.latency_scale > 0:
+            time.sleep(entry['latency'] * self.latency_scale)
+
+        return self._build_response(request, entry)
+
+    @staticmethod
+    def _build_response(request, entry: Dict) -> requests.Response:
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        # 响应体已解压保存，去掉压缩相关的头
+        response.headers.pop('Content-Encoding', None)
+        response._content = base64.b64decode(entry['body'])
+        response._content_consumed = True
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.reason = 'OK' if entry['status'] < 400 else 'Replayed'
+        return response
+
+    def close(self):
+        pass
+
+
+def record_session(session: requests.Session, archive: FixtureArchive) -> FixtureArchive:
+    """为 session 的 http/https 适配器加上录制"""
+    for prefix in ('http://', 'https://'):
+        session.mount(prefix, RecordingAdapter(session.get_adapter(prefix), archive))
+    return archive
+
+
+def replay_session(session: requests.Session, path: str, latency_scale: float = 0.0) -> ReplayAdapter:
+    """用录制档案替换 session 的网络访问"""
+    adapter = ReplayAdapter(FixtureArchive.load(path), latency_scale=latency_scale)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return adapter
+
+
+# 环境变量录制时，进程内所有 session 写入同一个档案，退出时保存
+_env_archives: Dict[str, FixtureArchive] = {}
+
+
+def apply_fixture_env(session: requests.Session):
+    """按环境变量为 session 开启录制或回放（两者都未设置时不做任何事）"""
+    replay_path = os.environ.get(REPLAY_ENV)
+    if replay_path:
+        latency_scale = float(os.environ.get(REPLAY_LATENCY_ENV, '0') or 0)
+        replay_session(session, replay_path, latency_scale)
+        log.info(f"HTTP 回放模式: {replay_path}")
+        return
+
+    record_path = os.environ.get(RECORD_ENV)
+    if record_path:
+        if record_path not in _env_archives:
+            archive = FixtureArchive(record_path)
+            _env_archives[record_path] = archive
+            atexit.register(archive.save)
+        record_session(session, _env_archives[record_path])
+        log.info(f"HTTP 录制模式: {record_path}")
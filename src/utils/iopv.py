@@ -0,0 +1,165 @@
+"""
+实时估算净值（IOPV）引擎
+根据基金持仓（或跟踪指数）权重和成分股实时行情，批量估算盘中净值
+"""
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import yaml
+
+from ..utils.logger import log
+
+
+class IOPVEngine:
+    """
+    估算净值引擎
+
+    估算公式（以上一交易日净值为基准）:
+        IOPV = 基准净值 × (1 + Σ 权重_i × 成分股涨跌幅_i)
+
+    权重矩阵为 基金数 × 成分股数，全部基金一次矩阵乘法完成估算；
+    单只成分股价格变化时只累加该列的贡献，不重算整个矩阵；
+    每 recompute_every 次增量更新和每次基准净值变化时全量重算一次，消除累积误差。
+    """
+
+    def __init__(self, holdings: Dict[str, Dict], recompute_every: int = 100):
+        """
+        Args:
+            holdings: 基金持仓配置
+                {
+                    '161725': {
+                        'position': 0.95,  # 股票仓位（可选，给出时权重按仓位归一化）
+                        'weights': {'1.600519': 0.15, '0.000858': 0.14},  # secid -> 占净值比例
+                    }
+                }
+            recompute_every: 每多少次增量更新全量重算一次
+        """
+        self.funds: List[str] = list(holdings)
+        self.secids: List[str] = sorted({
+            secid for fund in holdings.values() for secid in fund.get('weights', {})
+        })
+        self._fund_index = {code: i for i, code in enumerate(self.funds)}
+        self._secid_index = {secid: j for j, secid in enumerate(self.secids)}
+
+        self._weights = np.zeros((len(self.funds), len(self.secids)))
+        for code, fund in holdings.items():
+            weights = fund.get('weights', {})
+            row = self._weights[self._fund_index[code]]
+            for secid, weight in weights.items():
+                row[self._secid_index[secid]] = weight
+
+            # 只披露了部分持仓时，按股票仓位放大权重
+            position = fund.get('position')
+            total = row.sum()
+            if position and total > 0:
+                row *= position / total
+
+        self._returns = np.zeros(len(self.secids))  # 成分股涨跌幅
+        self._fund_returns = np.zeros(len(self.funds))  # 基金估算涨跌幅
+        self._base_navs = np.full(len(self.funds), np.nan)  # 基准净值
+        self.recompute_every = recompute_every
+        self._updates_since_recompute = 0
+
+    @classmethod
+    def from_file(cls, path: str) -> "IOPVEngine":
+        """从持仓配置文件创建"""
+        with open(path, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f) or {}
+
+        engine = cls(config.get('holdings', {}))
+        log.info(f"估算净值引擎: {len(engine.funds)} 只基金, {len(engine.secids)} 只成分股")
+        return engine
+
+    def covers(self, fund_code: str) -> bool:
+        """是否配置了该基金的持仓"""
+        return fund_code in self._fund_index
+
+    def set_base_navs(self, navs: Dict[str, float]):
+        """设置基准净值（上一交易日公布的单位净值），基准变化时全量重算"""
+        changed = False
+        for code, nav in navs.items():
+            i = self._fund_index.get(code)
+            if i is not None and nav > 0 and self._base_navs[i] != nav:
+                self._base_navs[i] = nav
+                changed = True
+        if changed:
+            self.recompute()
+
+    def update_quotes(self, quotes: Dict[str, Dict]) -> List[str]:
+        """
+        更新成分股行情，增量重算受影响基金的估算净值
+
+        Args:
+            quotes: {secid: {'price': 1500.0, 'prev_close': 1480.0}}
+
+        Returns:
+            估算净值发生变化的基金代码
+        """
+        cols = []
+        returns = []
+        for secid, quote in quotes.items():
+            j = self._secid_index.get(secid)
+            prev_close = quote.get('prev_close') or 0
+            if j is None or prev_close <= 0:
+                continue
+            cols.append(j)
+            returns.append(quote['price'] / prev_close - 1)
+
+        if not cols:
+            return []
+
+        cols = np.asarray(cols)
+        delta = np.asarray(returns) - self._returns[cols]
+        changed = delta != 0
+        if not changed.any():
+            return []
+
+        cols = cols[changed]
+        delta = delta[changed]
+        self._returns[cols] += delta
+
+        # 只累加变化列的贡献：W[:, cols] @ Δr
+        weights = self._weights[:, cols]
+        self._updates_since_recompute += 1
+        if self._updates_since_recompute >= self.recompute_every:
+            self.recompute()
+        else:
+            self._fund_returns += weights @ delta
+
+        affected = np.flatnonzero((weights != 0).any(axis=1))
+        return [self.funds[i] for i in affected]
+
+    def recompute(self):
+        """全量重算（消除增量累加的浮点误差）"""
+        self._fund_returns = self._weights @ self._returns
+        self._updates_since_recompute = 0
+
+    def estimate(self, fund_code: str) -> Optional[float]:
+        """单只基金的估算净值（没有基准净值时返回 None）"""
+        i = self._fund_index.get(fund_code)
+        if i is None or np.isnan(self._base_navs[i]):
+            return None
+        return float(self._base_navs[i] * (1 + self._fund_returns[i]))
+
+    def estimates(self) -> Dict[str, float]:
+        """全部基金的估算净值"""
+        values = self._base_navs * (1 + self._fund_returns)
+        return {
+            code: float(value)
+            for code, value in zip(self.funds, values)
+            if not np.isnan(value)
+        }
+
+
+def load_iopv_engine(path: str) -> Optional[IOPVEngine]:
+    """加载估算净值引擎，配置文件不存在或无效时返回 None"""
+    if not Path(path).exists():
+        log.warning(f"持仓配置文件不存在: {path}")
+        return None
+
+    try:
+        return IOPVEngine.from_file(path)
+    except Exception as e:
+        log.warning(f"估算净值引擎初始化失败: {e}")
+        return None
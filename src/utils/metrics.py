@@ -0,0 +1,321 @@
+"""
+耗时统计
+扫描流程各阶段的计时区间（span）汇总为 HDR 风格的对数分桶直方图，
+定期和退出时输出，并记录每轮扫描中最慢的基金；
+另有计数器和采集时才计算的指标，供 metrics_server 导出
+
+用法:
+    from src.utils.metrics import metrics
+
+    with metrics.span('fetch.nav_page'):
+        resp = session.get(url)
+
+    metrics.inc('http_requests', {'host': host, 'status': '200'})
+"""
+import heapq
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..utils.logger import log
+
+
+class Histogram:
+    """
+    对数-线性分桶直方图（HDR Histogram 的简化实现）
+
+    以微秒为单位计数，每个 2 的幂区间再均分为 2^(SUB_BUCKET_BITS-1) 个子桶，
+    相对误差不超过 1/2^(SUB_BUCKET_BITS-1)（约 6%）；记录只是一次整数运算和一次列表自增。
+    """
+
+    SUB_BUCKET_BITS = 5
+    MAX_VALUE_US = 1 << 36  # 约 19 小时，超过的值计入最后一个桶
+
+    def __init__(self):
+        self._half = 1 << (self.SUB_BUCKET_BITS - 1)
+        self.counts = [0] * (self._index(self.MAX_VALUE_US) + 1)
+        self.count = 0
+        self.total_us = 0
+        self.min_us = 0
+        self.max_us = 0
+        self._lock = threading.Lock()
+
+    def _index(self, value: int) -> int:
+        if value < (1 << self.SUB_BUCKET_BITS):
+            return value
+        exponent = value.bit_length() - self.SUB_BUCKET_BITS
+        return exponent * self._half + (value >> exponent)
+
+    def _value(self, index: int) -> int:
+        """桶内代表值（桶区间的中点）"""
+        if index < (1 << self.SUB_BUCKET_BITS):
+            return index
+        exponent = index // self._half - 1
+        mantissa = index - exponent * self._half
+        return (mantissa << exponent) + (1 << exponent) // 2
+
+    def record(self, seconds: float):
+        value = min(self.MAX_VALUE_US, max(0, int(seconds * 1e6 + 0.5)))
+        index = self._index(value)
+        with self._lock:
+            self.counts[index] += 1
+            if not self.count or value < self.min_us:
+                self.min_us = value
+            if value > self.max_us:
+                self.max_us = value
+            self.count += 1
+            self.total_us += value
+
+    def percentile(self, p: float) -> float:
+        """第 p 百分位（秒），没有样本时返回 0"""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            target = max(1, int(self.count * p / 100 + 0.5))
+            if target >= self.count:
+                return self.max_us / 1e6
+            seen = 0
+            for index, count in enumerate(self.counts):
+                seen += count
+                if seen >= target:
+                    value = min(max(self._value(index), self.min_us), self.max_us)
+                    return value / 1e6
+        return self.max_us / 1e6
+
+    def snapshot(self) -> Dict:
+        """统计摘要（秒）"""
+        return {
+            'count': self.count,
+            'mean': self.total_us / self.count / 1e6 if self.count else 0.0,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'max': self.max_us / 1e6,
+        }
+
+    def cumulative(self, bounds: Sequence[float]) -> List[int]:
+        """
+        不超过各上界（秒，递增）的样本数，用于按固定分桶导出
+
+        样本按所在桶的代表值归入，误差同分桶精度
+        """
+        result = []
+        with self._lock:
+            seen = 0
+            index = 0
+            for bound in bounds:
+                bound_us = bound * 1e6
+                while index < len(self.counts) and self._value(index) <= bound_us:
+                    seen += self.counts[index]
+                    index += 1
+                result.append(seen)
+        return result
+
+
+class _Span:
+    """计时区间（with 语句）"""
+
+    __slots__ = ('_metrics', '_name', '_start')
+
+    def __init__(self, metrics: "Metrics", name: str):
+        self._metrics = metrics
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._metrics.observe(self._name, time.perf_counter() - self._start)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Counter:
+    """
+    预先解析好名称和标签的计数器（热路径上不加锁、不构造标签）
+
+    只由单个线程递增的计数器使用；多线程递增请用 Metrics.inc
+    """
+
+    __slots__ = ('_metrics', 'value')
+
+    def __init__(self, metrics: "Metrics"):
+        self._metrics = metrics
+        self.value = 0
+
+    def inc(self, value: float = 1):
+        if self._metrics.enabled:
+            self.value += value
+
+
+class Metrics:
+    """
+    进程内的耗时统计
+
+    - span(name)/observe(name, seconds)：记录一个阶段的耗时
+    - fund(code, seconds)：累加本轮扫描中单只基金的耗时
+    - end_cycle()：结束一轮扫描，记录最慢的 slowest_n 只基金
+    - maybe_dump()：距离上次输出超过 dump_interval 秒时输出统计
+    - inc(name, labels)：计数器加一（按标签区分）
+    - counter(name, labels)：预先解析的计数器，热路径上直接 counter.inc()
+    - register(name, collect)：采集时才调用的指标（线程数、队列深度、缓存命中等）
+    """
+
+    def __init__(self, enabled: bool = True, slowest_n: int = 5, dump_interval: float = 300):
+        self.enabled = enabled
+        self.slowest_n = slowest_n
+        self.dump_interval = dump_interval
+
+        self.histograms: Dict[str, Histogram] = {}
+        self.last_slowest: List[Tuple[str, float]] = []
+        self._cycle_funds: Dict[str, float] = {}
+        self.counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+        self._counter_handles: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Counter] = {}
+        self.collectors: Dict[str, Tuple[str, str, Callable]] = {}
+        self._lock = threading.Lock()
+        self._last_dump = time.monotonic()
+
+    def histogram(self, name: str) -> Histogram:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(name, Histogram())
+        return histogram
+
+    def span(self, name: str):
+        """计时区间：with metrics.span('scan.fetch'): ..."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def observe(self, name: str, seconds: float):
+        if self.enabled:
+            self.histogram(name).record(seconds)
+
+    def inc(self, name: str, labels: Optional[Dict[str, str]] = None, value: float = 1):
+        """计数器加 value"""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())) if labels else ())
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def counter(self, name: str, labels: Optional[Dict[str, str]] = None) -> Counter:
+        """取得（或创建）一个预先解析的计数器，导出时与 inc() 的同名计数器合并"""
+        key = (name, tuple(sorted(labels.items())) if labels else ())
+        with self._lock:
+            handle = self._counter_handles.get(key)
+            if handle is None:
+                handle = self._counter_handles[key] = Counter(self)
+            return handle
+
+    def register(self, name: str, collect: Callable, kind: str = 'gauge', help: str = ''):
+        """
+        注册采集时才计算的指标（热路径上没有开销）
+
+        Args:
+            collect: 返回数值，或 [(标签字典, 数值), ...]
+            kind: 'gauge' 或 'counter'
+        """
+        with self._lock:
+            self.collectors[name] = (kind, help, collect)
+
+    def fund(self, fund_code: str, seconds: float):
+        """累加本轮扫描中该基金的耗时"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._cycle_funds[fund_code] = self._cycle_funds.get(fund_code, 0.0) + seconds
+
+    def end_cycle(self) -> List[Tuple[str, float]]:
+        """
+        结束一轮扫描
+
+        Returns:
+            本轮最慢的基金 [(基金代码, 耗时秒), ...]
+        """
+        with self._lock:
+            funds, self._cycle_funds = self._cycle_funds, {}
+
+        self.last_slowest = heapq.nlargest(self.slowest_n, funds.items(), key=lambda item: item[1])
+        if self.last_slowest:
+            slowest = ', '.join(f"{code} {seconds * 1000:.0f}ms" for code, seconds in self.last_slowest)
+            log.debug(f"本轮最慢基金: {slowest}")
+        return self.last_slowest
+
+    def collect(self) -> Tuple[Dict[str, Histogram], Dict, Dict[str, Tuple[str, str, Callable]]]:
+        """当前的直方图、计数器和采集项（副本，供导出）"""
+        with self._lock:
+            counters = dict(self.counters)
+            for key, handle in self._counter_handles.items():
+                if handle.value:
+                    counters[key] = counters.get(key, 0) + handle.value
+            return dict(self.histograms), counters, dict(self.collectors)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            histograms = dict(self.histograms)
+        return {name: histogram.snapshot() for name, histogram in sorted(histograms.items())}
+
+    def report(self) -> str:
+        """统计表（毫秒）"""
+        lines = [f"{'阶段':<22}{'次数':>8}{'平均':>10}{'p50':>10}{'p90':>10}{'p99':>10}{'最大':>10}"]
+        for name, s in self.snapshot().items():
+            lines.append(
+                f"{name:<24}{s['count']:>8}{s['mean'] * 1000:>10.1f}{s['p50'] * 1000:>10.1f}"
+                f"{s['p90'] * 1000:>10.1f}{s['p99'] * 1000:>10.1f}{s['max'] * 1000:>10.1f}"
+            )
+        if self.last_slowest:
+            slowest = ', '.join(f"{code} {seconds * 1000:.0f}ms" for code, seconds in self.last_slowest)
+            lines.append(f"上一轮最慢基金: {slowest}")
+        return '\n'.join(lines)
+
+    def dump(self):
+        """输出统计到日志"""
+        self._last_dump = time.monotonic()
+        if self.histograms:
+            log.info(f"扫描耗时统计（毫秒）:\n{self.report()}")
+
+    def maybe_dump(self):
+        if self.enabled and time.monotonic() - self._last_dump >= self.dump_interval:
+            self.dump()
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {}
+            self._cycle_funds = {}
+            self.counters = {}
+            for handle in self._counter_handles.values():
+                handle.value = 0
+        self.last_slowest = []
+
+
+# 进程内共享的统计
+metrics = Metrics()
+
+
+def configure_metrics(config: Optional[Dict] = None) -> Metrics:
+    """
+    按配置调整共享统计（启动时调用一次）
+
+    Args:
+        config: {'enabled': True, 'slowest_n': 5, 'dump_interval': 300}
+    """
+    config = config or {}
+    metrics.enabled = config.get('enabled', True)
+    metrics.slowest_n = config.get('slowest_n', 5)
+    metrics.dump_interval = config.get('dump_interval', 300)
+    return metrics
@@ -0,0 +1,179 @@
+"""
+指标导出
+在后台线程提供 Prometheus 文本格式的 /metrics 接口，
+内容来自 metrics 中的耗时直方图、计数器和采集时计算的指标
+
+用法:
+    server = MetricsServer(port=9108).start()
+    # curl http://127.0.0.1:9108/metrics
+    server.stop()
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from ..utils.logger import log
+from ..utils.metrics import Metrics, metrics as default_metrics
+from ..utils.rate_limiter import get_governor
+
+PREFIX = "arbitrage_"
+
+# 耗时直方图的导出分桶（秒），覆盖单次解析到整轮扫描
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+HELP = {
+    'scans': '扫描轮数',
+    'http_requests': 'HTTP 请求数（按主机和状态码）',
+    'orders': '委托数（按状态）',
+    'notifications': '通知数（按渠道和结果）',
+    'scheduler_overruns': '定时任务超过间隔的次数',
+    'scheduler_skipped_ticks': '因超时跳过的节拍数',
+}
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    items = list(labels.items() if isinstance(labels, dict) else labels) + list(extra)
+    if not items:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in items) + '}'
+
+
+def _bound(bound: float) -> str:
+    return f"{bound:g}"
+
+
+def _metric_name(name: str, kind: str) -> str:
+    """导出名称：加前缀，计数器按 Prometheus 命名约定以 _total 结尾"""
+    if kind == 'counter' and not name.endswith('_total'):
+        name += '_total'
+    return f"{PREFIX}{name}"
+
+
+def render(registry: Metrics) -> str:
+    """按 Prometheus 文本格式输出全部指标"""
+    lines: List[str] = []
+
+    histograms, counters, collectors = registry.collect()
+
+    # 耗时直方图
+    name = f"{PREFIX}stage_duration_seconds"
+    lines.append(f"# HELP {name} 扫描各阶段耗时")
+    lines.append(f"# TYPE {name} histogram")
+    for stage, histogram in sorted(histograms.items()):
+        stage_label = (('stage', stage),)
+        for bound, count in zip(BUCKETS, histogram.cumulative(BUCKETS)):
+            lines.append(f"{name}_bucket{_labels(stage_label, (('le', _bound(bound)),))} {count}")
+        lines.append(f"{name}_bucket{_labels(stage_label, (('le', '+Inf'),))} {histogram.count}")
+        lines.append(f"{name}_sum{_labels(stage_label)} {histogram.total_us / 1e6}")
+        lines.append(f"{name}_count{_labels(stage_label)} {histogram.count}")
+
+    # 计数器（同名的按标签分组输出）
+    grouped: Dict[str, List] = {}
+    for (counter, labels), value in sorted(counters.items()):
+        grouped.setdefault(counter, []).append((labels, value))
+    for counter, samples in grouped.items():
+        name = _metric_name(counter, 'counter')
+        if counter in HELP:
+            lines.append(f"# HELP {name} {HELP[counter]}")
+        lines.append(f"# TYPE {name} counter")
+        for labels, value in samples:
+            lines.append(f"{name}{_labels(labels)} {value:g}")
+
+    # 采集时计算的指标
+    for collector, (kind, help_text, collect) in sorted(collectors.items()):
+        try:
+            value = collect()
+        except Exception as e:
+            log.debug(f"采集指标 {collector} 失败: {e}")
+            continue
+        name = _metric_name(collector, kind)
+        if help_text:
+            lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        samples = value if isinstance(value, list) else [({}, value)]
+        for labels, sample in samples:
+            lines.append(f"{name}{_labels(labels)} {sample:g}")
+
+    return '\n'.join(lines) + '\n'
+
+
+def register_default_collectors(registry: Metrics):
+    """进程级指标：线程数、请求限速排队深度"""
+    registry.register('threads', threading.active_count, help='活动线程数')
+    registry.register(
+        'request_queue_depth',
+        lambda: [({'host': host}, depth) for host, depth in get_governor().queue_depths().items()],
+        help='请求限速排队中的请求数（按主机）'
+    )
+
+
+class MetricsServer:
+    """后台线程中的 /metrics 接口"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 9108, registry: Optional[Metrics] = None):
+        self.registry = registry or default_metrics
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+        register_default_collectors(self.registry)
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self.httpd.server_address[:2]
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] != '/metrics':
+                    self.send_error(404)
+                    return
+
+                body = render(server.registry).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "MetricsServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="metrics-server", daemon=True)
+        self._thread.start()
+        host, port = self.address
+        log.info(f"指标接口: http://{host}:{port}/metrics")
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+def start_metrics_server(config: Optional[Dict] = None) -> Optional[MetricsServer]:
+    """
+    按配置启动指标接口（未启用或端口被占用时返回 None）
+
+    Args:
+        config: {'enabled': False, 'host': '127.0.0.1', 'port': 9108}
+    """
+    config = config or {}
+    if not config.get('enabled', False):
+        return None
+
+    try:
+        return MetricsServer(config.get('host', '127.0.0.1'), config.get('port', 9108)).start()
+    except OSError as e:
+        log.error(f"指标接口启动失败: {e}")
+        return None
@@ -0,0 +1,204 @@
+"""
+基金净值缓存
+净值每个交易日最多公布一次，缓存后只在新净值可能出现时才重新抓取
+"""
+import json
+import threading
+import time
+from datetime import date, datetime
+from datetime import time as dt_time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from ..utils.logger import log
+from ..utils.trading_calendar import CST, TradingCalendar
+
+# 默认缓存文件
+DEFAULT_CACHE_FILE = Path(__file__).parent.parent.parent / "data" / "nav_cache.json"
+
+
+class NavCache:
+    """
+    以 (基金代码, 净值日期) 为键的净值缓存
+
+    刷新规则：
+    - 净值通常在交易日晚间（publish_hour 之后）公布，按交易日历算出当前应已公布的净值日期
+      （交易日 publish_hour 之后为当日，否则为上一交易日；QDII 等晚公布的基金再往前推 publish_lags 个交易日）
+    - 缓存的净值日期不早于应公布日期时，缓存一定有效
+    - 否则在应公布日期的公布时间点之后，每 recheck_minutes 分钟重新检查一次，
+      直到拿到该日期的净值（跨过午夜仍继续检查，延迟公布的净值不会错过）
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = str(DEFAULT_CACHE_FILE),
+        publish_hour: int = 18,
+        recheck_minutes: int = 30,
+        max_dates_per_code: int = 10,
+        calendar: Optional[TradingCalendar] = None,
+        publish_lags: Optional[Dict[str, int]] = None
+    ):
+        """
+        Args:
+            path: 持久化文件路径（None 表示只在内存中缓存）
+            publish_hour: 净值开始公布的时间（小时）
+            recheck_minutes: 尚未拿到应公布净值时的重新检查间隔（分钟）
+            max_dates_per_code: 每只基金保留的历史净值条数
+            calendar: 交易日历（None 表示只排除周末）
+            publish_lags: 基金代码 -> 净值晚公布的交易日数（如 QDII 基金晚一个交易日）
+        """
+        self.path = Path(path) if path else None
+        self.publish_hour = publish_hour
+        self.recheck_seconds = recheck_minutes * 60
+        self.max_dates_per_code = max_dates_per_code
+        self.calendar = calendar or TradingCalendar()
+        self.publish_lags = {str(code): int(lag) for code, lag in (publish_lags or {}).items()}
+
+        self._navs: Dict[Tuple[str, str], float] = {}  # (code, nav_date) -> nav
+        self._checked: Dict[str, Tuple[str, float]] = {}  # code -> (最新净值日期, 检查时间戳)
+        self._lock = threading.Lock()
+        self._dirty = False
+
+        self.hits = 0
+        self.misses = 0
+
+        self.load()
+
+    def get(self, fund_code: str, now: Optional[float] = None) -> Optional[Tuple[float, str]]:
+        """
+        获取缓存的最新净值
+
+        Returns:
+            (净值, 净值日期)；缓存不存在或可能已有新净值时返回 None
+        """
+        now = time.time() if now is None else now
+
+        with self._lock:
+            checked = self._checked.get(fund_code)
+            if checked and self._is_fresh(fund_code, checked[0], checked[1], now):
+                self.hits += 1
+                return self._navs[(fund_code, checked[0])], checked[0]
+
+            self.misses += 1
+            return None
+
+    def peek(self, fund_code: str) -> Optional[Tuple[float, str]]:
+        """获取已知的最新净值（不判断是否过期，不计入命中统计）"""
+        with self._lock:
+            checked = self._checked.get(fund_code)
+            if not checked:
+                return None
+            return self._navs[(fund_code, checked[0])], checked[0]
+
+    def put(self, fund_code: str, nav: float, nav_date: str, now: Optional[float] = None):
+        """记录一次净值抓取结果"""
+        now = time.time() if now is None else now
+
+        with self._lock:
+            self._navs[(fund_code, nav_date)] = nav
+
+            # 抓到的净值日期比已知的旧时，不覆盖最新日期
+            checked = self._checked.get(fund_code)
+            latest = nav_date if not checked or nav_date >= checked[0] else checked[0]
+            self._checked[fund_code] = (latest, now)
+
+            self._prune(fund_code)
+            self._dirty = True
+
+    def stats(self) -> Dict:
+        """缓存统计"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'size': len(self._navs),
+        }
+
+    def _is_fresh(self, fund_code: str, nav_date: str, checked_at: float, now: float) -> bool:
+        """判断缓存是否仍然有效"""
+        # 公布时间按北京时间判断，与服务器所在时区无关
+        expected, published_at = self._expected_nav_date(fund_code, datetime.fromtimestamp(now, CST))
+
+        # 已经拿到应公布日期的净值，不会再有更新
+        if nav_date >= expected.isoformat():
+            return True
+
+        if checked_at < published_at.timestamp():
+            # 上次检查之后已经过了公布时间点
+            return False
+
+        # 应公布的净值尚未拿到，定期重新检查
+        return now - checked_at < self.recheck_seconds
+
+    def _expected_nav_date(self, fund_code: str, now_dt: datetime) -> Tuple[date, datetime]:
+        """
+        当前应已公布的最新净值日期
+
+        Returns:
+            (净值日期, 该日期开始应已公布的时间点)
+        """
+        day = now_dt.date()
+        publish = datetime.combine(day, dt_time(self.publish_hour), tzinfo=CST)
+        if publish > now_dt or not self.calendar.is_trading_day(day):
+            day = self.calendar.previous_trading_day(day)
+            publish = datetime.combine(day, dt_time(self.publish_hour), tzinfo=CST)
+
+        for _ in range(self.publish_lags.get(fund_code, 0)):
+            day = self.calendar.previous_trading_day(day)
+        return day, publish
+
+    def _prune(self, fund_code: str):
+        """只保留每只基金最近 max_dates_per_code 条净值"""
+        dates = sorted(date for code, date in self._navs if code == fund_code)
+        for date in dates[:-self.max_dates_per_code]:
+            del self._navs[(fund_code, date)]
+
+    def load(self):
+        """从磁盘加载缓存"""
+        if not self.path or not self.path.exists():
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+            with self._lock:
+                for code, navs in data.get('navs', {}).items():
+                    for nav_date, nav in navs.items():
+                        self._navs[(code, nav_date)] = nav
+
+                for code, (nav_date, checked_at) in data.get('checked', {}).items():
+                    if (code, nav_date) in self._navs:
+                        self._checked[code] = (nav_date, checked_at)
+
+            log.info(f"已加载净值缓存: {len(self._checked)} 只基金")
+
+        except Exception as e:
+            log.warning(f"加载净值缓存失败: {e}")
+
+    def save(self):
+        """有变更时写入磁盘"""
+        if not self.path or not self._dirty:
+            return
+
+        with self._lock:
+            navs: Dict[str, Dict[str, float]] = {}
+            for (code, nav_date), nav in self._navs.items():
+                navs.setdefault(code, {})[nav_date] = nav
+
+            data = {
+                'navs': navs,
+                'checked': {code: list(value) for code, value in self._checked.items()},
+            }
+            self._dirty = False
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            tmp_path.replace(self.path)
+
+        except Exception as e:
+            log.warning(f"保存净值缓存失败: {e}")
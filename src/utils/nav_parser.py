@@ -0,0 +1,88 @@
+"""
+基金主页净值解析
+快速路径直接定位 dataOfFund 区块提取文本，不构建 DOM；
+失败时回退到 BeautifulSoup 完整解析
+"""
+import html as html_lib
+import re
+from typing import Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+# 解析单位净值，格式如: "单位净值 (2026-02-13)2.2030-0.73%" 或 "单位净值(2026-02-13)0.70370.03%"
+# 只捕获净值部分（不包含涨跌幅）
+NAV_PATTERN = re.compile(r'单位净值\s*\((\d{4}-\d{2}-\d{2})\)(\d+\.\d+)(-\d+\.\d+%|\+\d+\.\d+%)?')
+
+# <div ... class="... dataOfFund ..." ...>
+_BLOCK_START = re.compile(r'<div\b[^>]*\bclass\s*=\s*["\'][^"\']*\bdataOfFund\b[^"\']*["\'][^>]*>', re.I)
+_DIV_TAG = re.compile(r'<(/?)div\b[^>]*>', re.I)
+# 不产生文本的内容：注释、脚本、样式
+_NON_TEXT = re.compile(r'<!--.*?-->|<script\b.*?</script\s*>|<style\b.*?</style\s*>', re.I | re.S)
+_TAG = re.compile(r'<[^>]*>')
+
+
+def extract_nav_fast(page: str) -> Optional[Tuple[float, str]]:
+    """
+    快速提取单位净值
+
+    Returns:
+        (净值, 净值日期)；找不到区块或无法解析时返回 None
+    """
+    text = extract_block_text(page)
+    if text is None:
+        return None
+
+    return _match_nav(text)
+
+
+def extract_nav_bs4(page: str) -> Optional[Tuple[float, str]]:
+    """使用 BeautifulSoup 完整解析提取单位净值（回退路径）"""
+    soup = BeautifulSoup(page, 'html.parser')
+
+    data_of_fund = soup.find('div', class_='dataOfFund')
+    if not data_of_fund:
+        return None
+
+    return _match_nav(data_of_fund.get_text(strip=True))
+
+
+def parse_nav(page: str) -> Optional[Tuple[float, str]]:
+    """提取单位净值，快速路径失败时回退到 BeautifulSoup"""
+    result = extract_nav_fast(page)
+    if result is None:
+        result = extract_nav_bs4(page)
+    return result
+
+
+def extract_block_text(page: str) -> Optional[str]:
+    """
+    提取 dataOfFund 区块文本
+
+    与 BeautifulSoup 的 get_text(strip=True) 结果一致：
+    每段文本去除首尾空白后直接拼接
+    """
+    start = _BLOCK_START.search(page)
+    if not start:
+        return None
+
+    # 按 div 嵌套层级找到区块结束位置
+    depth = 1
+    end = len(page)
+    for tag in _DIV_TAG.finditer(page, start.end()):
+        depth += -1 if tag.group(1) else 1
+        if depth == 0:
+            end = tag.start()
+            break
+
+    block = _NON_TEXT.sub('', page[start.end():end])
+    pieces = (html_lib.unescape(piece).strip() for piece in _TAG.split(block))
+    return ''.join(piece for piece in pieces if piece)
+
+
+def _match_nav(text: str) -> Optional[Tuple[float, str]]:
+    """从区块文本中匹配净值和日期"""
+    nav_match = NAV_PATTERN.search(text)
+    if not nav_match:
+        return None
+
+    return float(nav_match.group(2)), nav_match.group(1)
@@ -5,6 +5,9 @@ import logging
 from typing import Optional, Dict, Any
 from abc import ABC, abstractmethod
 
+from .metrics import metrics
+from .quote import Quote
+
 try:
     from loguru import logger as log
 except:
@@ -127,6 +130,8 @@ class NotificationManager:
         """
         self.config = config
         self.notifiers = []
+        # 按渠道预先解析的 (发送成功, 丢弃) 计数器
+        self._counters: Dict[str, tuple] = {}
         self._init_notifiers()
 
     def _init_notifiers(self):
@@ -167,6 +172,15 @@ class NotificationManager:
                 self.notifiers.append(ConsoleNotifier())
                 log.info("控制台通知已启用")
 
+    def _channel_counters(self, channel: str) -> tuple:
+        counters = self._counters.get(channel)
+        if counters is None:
+            counters = self._counters[channel] = (
+                metrics.counter('notifications', {'channel': channel, 'result': 'sent'}),
+                metrics.counter('notifications', {'channel': channel, 'result': 'dropped'}),
+            )
+        return counters
+
     def send(self, title: str, message: str, **kwargs) -> bool:
         """
         发送通知到所有已配置的渠道
@@ -181,16 +195,21 @@ class NotificationManager:
         """
         if not self.notifiers:
             log.warning("没有启用的通知渠道")
+            self._channel_counters('none')[1].inc()
             return False
 
         success_count = 0
 
         for notifier in self.notifiers:
+            channel = notifier.__class__.__name__
+            sent = False
             try:
-                if notifier.send(title, message, **kwargs):
-                    success_count += 1
+                sent = bool(notifier.send(title, message, **kwargs))
             except Exception as e:
-                log.error(f"通知发送失败 ({notifier.__class__.__name__}): {e}")
+                log.error(f"通知发送失败 ({channel}): {e}")
+            self._channel_counters(channel)[0 if sent else 1].inc()
+            if sent:
+                success_count += 1
 
         return success_count > 0
 
@@ -219,6 +238,23 @@ class NotificationManager:
 
         return self.send(title, message)
 
+    def send_quote_opportunity(self, quote: Quote, opportunity_type: str) -> bool:
+        """
+        发送套利机会通知（直接使用行情记录）
+
+        Args:
+            quote: 行情记录
+            opportunity_type: 机会类型 (premium/discount)
+        """
+        return self.send_opportunity(
+            fund_code=quote.code,
+            fund_name=quote.name,
+            opportunity_type=opportunity_type,
+            premium_rate=quote.premium_rate,
+            price=quote.price,
+            nav=quote.iopv or quote.nav
+        )
+
     def send_trade(self, fund_code: str, fund_name: str,
                   action: str, quantity: int, price: float,
                   amount: float) -> bool:
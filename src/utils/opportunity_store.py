@@ -0,0 +1,224 @@
+"""
+套利机会存储
+最近的机会保存在固定容量的内存环形缓冲区中，全部机会由后台线程批量追加写入 SQLite，
+长时间运行时内存占用不随运行时长增长，历史记录按基金代码和时间范围查询
+"""
+import sqlite3
+import threading
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from ..utils.logger import log
+from ..utils.quote import Opportunity
+
+
+class OpportunityStore:
+    """
+    套利机会存储
+
+    - append() 只写入环形缓冲区（超出 capacity 时丢弃最早的记录）和待写队列，不访问磁盘
+    - 后台线程每 flush_interval 秒或待写记录达到 batch_size 条时，一个事务批量写入 SQLite
+    - recent() 只读内存；query() 先写入待写记录，再按 (code, timestamp_ns) / timestamp_ns 索引
+      查询磁盘上的全部历史；未配置 path 时只查询内存中的记录
+    - close() 停止后台线程并写入剩余记录
+    """
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS opportunities (
+            type TEXT NOT NULL,
+            code TEXT NOT NULL,
+            name TEXT NOT NULL DEFAULT '',
+            price REAL NOT NULL,
+            nav REAL NOT NULL,
+            premium_rate REAL NOT NULL,
+            amount REAL NOT NULL,
+            timestamp_ns INTEGER NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_opportunities_code_time ON opportunities (code, timestamp_ns)",
+        "CREATE INDEX IF NOT EXISTS idx_opportunities_time ON opportunities (timestamp_ns)",
+    )
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        capacity: int = 1000,
+        flush_interval: float = 1.0,
+        batch_size: int = 100
+    ):
+        """
+        Args:
+            path: SQLite 文件路径（None 表示只保留内存中的最近记录）
+            capacity: 内存中保留的最近记录数
+            flush_interval: 后台批量写入的间隔（秒）
+            batch_size: 待写记录达到该数量时立即写入
+        """
+        self.path = Path(path) if path else None
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+
+        self._recent: deque = deque(maxlen=capacity)
+        self._pending: List[Tuple] = []
+        self._lock = threading.Lock()       # 环形缓冲区和待写队列
+        self._db_lock = threading.Lock()    # 数据库连接
+        self._conn: Optional[sqlite3.Connection] = None
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        """内存中的记录数"""
+        return len(self._recent)
+
+    def __iter__(self) -> Iterator[Opportunity]:
+        return iter(self.recent())
+
+    def append(self, opportunity: Opportunity):
+        """记录一个机会（磁盘写入由后台线程完成）"""
+        with self._lock:
+            self._recent.append(opportunity)
+            if not self.path:
+                return
+            self._pending.append((
+                opportunity.type, opportunity.code, opportunity.name, opportunity.price,
+                opportunity.nav, opportunity.premium_rate, opportunity.amount, opportunity.timestamp_ns,
+            ))
+            pending = len(self._pending)
+
+        if self._thread is None:
+            self._start_writer()
+        if pending >= self.batch_size:
+            self._wake.set()
+
+    def _start_writer(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+
+            def loop():
+                while not self._stop_event.is_set():
+                    self._wake.wait(self.flush_interval)
+                    self._wake.clear()
+                    self.flush()
+
+            self._thread = threading.Thread(target=loop, name="opportunity-spill", daemon=True)
+            self._thread.start()
+
+    def flush(self):
+        """把待写记录在一个事务中写入 SQLite"""
+        with self._lock:
+            rows, self._pending = self._pending, []
+        if not rows:
+            return
+
+        try:
+            with self._db_lock, self._connect() as conn:
+                conn.executemany("INSERT INTO opportunities VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        except Exception as e:
+            log.warning(f"保存套利机会失败（{len(rows)} 条）: {e}")
+
+    def recent(self, limit: Optional[int] = None) -> List[Opportunity]:
+        """内存中最近的机会（按时间先后，limit 表示只取最后 limit 条）"""
+        with self._lock:
+            records = list(self._recent)
+        return records[-limit:] if limit else records
+
+    def query(
+        self,
+        code: Optional[str] = None,
+        since_ns: Optional[int] = None,
+        until_ns: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Opportunity]:
+        """
+        按基金代码和时间范围查询（按时间先后）
+
+        Args:
+            code: 基金代码，None 表示全部基金
+            since_ns / until_ns: 时间范围 [since_ns, until_ns)（epoch 纳秒）
+            limit: 只取最近的 limit 条
+        """
+        if not self.path:
+            records = [
+                opp for opp in self.recent()
+                if (code is None or opp.code == code)
+                and (since_ns is None or opp.timestamp_ns >= since_ns)
+                and (until_ns is None or opp.timestamp_ns < until_ns)
+            ]
+            return records[-limit:] if limit else records
+
+        conditions, params = [], []
+        if code is not None:
+            conditions.append("code = ?")
+            params.append(code)
+        if since_ns is not None:
+            conditions.append("timestamp_ns >= ?")
+            params.append(since_ns)
+        if until_ns is not None:
+            conditions.append("timestamp_ns < ?")
+            params.append(until_ns)
+
+        sql = "SELECT * FROM opportunities"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY timestamp_ns DESC, rowid DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        self.flush()
+        with self._db_lock, self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [Opportunity(*row) for row in reversed(rows)]
+
+    def count(self, code: Optional[str] = None) -> int:
+        """累计记录数（未配置 path 时为内存中的记录数）"""
+        if not self.path:
+            return sum(1 for opp in self.recent() if code is None or opp.code == code)
+
+        sql, params = "SELECT COUNT(*) FROM opportunities", ()
+        if code is not None:
+            sql, params = sql + " WHERE code = ?", (code,)
+        self.flush()
+        with self._db_lock, self._connect() as conn:
+            return conn.execute(sql, params).fetchone()[0]
+
+    def clear(self):
+        """清空内存中的记录（磁盘上的历史保留）"""
+        with self._lock:
+            self._recent.clear()
+
+    def close(self):
+        """停止后台写入，写入剩余记录并关闭数据库连接"""
+        self._stop_event.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.flush()
+
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        self._stop_event.clear()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        数据库连接（保持打开），退出时提交
+
+        调用方持有 self._db_lock
+        """
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            with self._conn:
+                for statement in self.SCHEMA:
+                    self._conn.execute(statement)
+        with self._conn:
+            yield self._conn
@@ -0,0 +1,148 @@
+"""
+行情记录类型
+单只基金用不可变的 Quote，一次扫描的全部基金用 NumPy 结构化数组存放的 QuoteBatch
+"""
+import math
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+import numpy as np
+
+
+class _RecordAccess:
+    """兼容旧的 dict 访问方式：record['price'] / record.get('volume', 0)"""
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    @property
+    def time(self) -> datetime:
+        """记录时间（本地时间）"""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9)
+
+    def to_dict(self) -> Dict:
+        """转换为 dict（时间转为 ISO 格式字符串，用于输出和持久化）"""
+        data = {f.name: getattr(self, f.name) for f in fields(self)}
+        data['time'] = self.time.isoformat()
+        return data
+
+
+@dataclass(frozen=True, slots=True)
+class Quote(_RecordAccess):
+    """LOF 基金行情（场内价格 + 净值）"""
+
+    code: str
+    name: str
+    price: float          # 场内价格
+    nav: float            # 净值
+    nav_date: str         # 净值日期
+    premium_rate: float   # 溢价率
+    volume: int           # 成交量
+    timestamp_ns: int     # 获取时间（epoch 纳秒）
+    iopv: Optional[float] = None  # 盘中估算净值
+
+
+@dataclass(frozen=True, slots=True)
+class Opportunity(_RecordAccess):
+    """套利机会记录"""
+
+    type: str             # premium / discount
+    code: str
+    name: str
+    price: float
+    nav: float
+    premium_rate: float
+    amount: float         # 计划交易金额
+    timestamp_ns: int
+
+    @classmethod
+    def from_quote(cls, opportunity_type: str, quote: Quote, amount: float) -> "Opportunity":
+        return cls(
+            opportunity_type, quote.code, quote.name, quote.price, quote.nav,
+            quote.premium_rate, amount, time.time_ns()
+        )
+
+
+QUOTE_DTYPE = np.dtype([
+    ('code', 'U6'),
+    ('name', 'O'),  # 名称长度不固定，保存对原字符串的引用
+    ('price', 'f8'),
+    ('nav', 'f8'),
+    ('nav_date', 'U10'),
+    ('premium_rate', 'f8'),
+    ('volume', 'i8'),
+    ('timestamp_ns', 'i8'),
+    ('iopv', 'f8'),  # NaN 表示没有估算净值
+])
+
+
+class QuoteBatch(Mapping):
+    """
+    一次扫描的全部基金行情
+
+    按列存放在 NumPy 结构化数组中，可直接对整列做向量化运算；
+    同时实现只读 Mapping 接口（基金代码 -> Quote），顺序与获取时的输入顺序一致。
+    """
+
+    def __init__(self, records: Optional[np.ndarray] = None):
+        self.records = records if records is not None else np.empty(0, dtype=QUOTE_DTYPE)
+        self._index = {code: i for i, code in enumerate(self.records['code'].tolist())}
+
+    @classmethod
+    def from_quotes(cls, quotes: Iterable[Quote]) -> "QuoteBatch":
+        rows = [
+            (q.code, q.name, q.price, q.nav, q.nav_date, q.premium_rate, q.volume, q.timestamp_ns,
+             math.nan if q.iopv is None else q.iopv)
+            for q in quotes
+        ]
+        return cls(np.array(rows, dtype=QUOTE_DTYPE))
+
+    def __getitem__(self, code: str) -> Quote:
+        row = self.records[self._index[code]]
+        iopv = float(row['iopv'])
+        return Quote(
+            str(row['code']), row['name'], float(row['price']), float(row['nav']),
+            str(row['nav_date']), float(row['premium_rate']), int(row['volume']),
+            int(row['timestamp_ns']), None if math.isnan(iopv) else iopv
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __contains__(self, code: object) -> bool:
+        return code in self._index
+
+    def __repr__(self) -> str:
+        return f"QuoteBatch({list(self._index)})"
+
+    def column(self, name: str) -> np.ndarray:
+        """整列数据（视图，不复制）"""
+        return self.records[name]
+
+    def set_iopv(self, estimates: Dict[str, float]):
+        """写入估算净值，并按估算净值重算溢价率"""
+        rows = [self._index[code] for code in estimates if code in self._index]
+        if not rows:
+            return
+
+        rows = np.asarray(rows)
+        iopv = np.fromiter(
+            (value for code, value in estimates.items() if code in self._index),
+            dtype=float, count=len(rows)
+        )
+        self.records['iopv'][rows] = iopv
+        self.records['premium_rate'][rows] = (self.records['price'][rows] - iopv) / iopv
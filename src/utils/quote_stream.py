@@ -0,0 +1,222 @@
+"""
+实时行情推送
+通过东方财富 SSE 长连接订阅监控列表行情，替代定时轮询
+"""
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional
+
+import requests
+
+from ..utils.data_fetcher import DataFetcher
+from ..utils.logger import log
+from ..utils.rate_limiter import PRIORITY_CRITICAL, PRIORITY_HEADER
+
+
+class StreamError(Exception):
+    """行情推送连续失败，超过重连次数上限"""
+    pass
+
+
+class QuoteStream:
+    """
+    SSE 行情订阅
+
+    首条消息是全量快照，之后只推送变化的字段（按快照中的序号对应基金）。
+    断线后按指数退避（带随机抖动）自动重连。
+
+    用法:
+        stream = QuoteStream(['163406', '161725'])
+        for quote in stream:
+            print(quote)  # {'code': '163406', 'name': '兴全合润', 'price': 2.258, 'volume': 12345}
+    """
+
+    def __init__(
+        self,
+        fund_codes: List[str],
+        push_host: str = DataFetcher.PUSH_HOST,
+        session: Optional[requests.Session] = None,
+        read_timeout: float = 30.0,
+        initial_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        max_failures: Optional[int] = 10
+    ):
+        """
+        Args:
+            fund_codes: 订阅的基金代码
+            push_host: 推送服务地址（测试时可指向本地回放服务）
+            session: 复用的 requests.Session
+            read_timeout: 超过该时间没有收到任何数据则重连（秒）
+            initial_backoff: 首次重连等待时间（秒）
+            max_backoff: 重连等待时间上限（秒）
+            max_failures: 连续失败次数上限，超过后抛出 StreamError（None 表示无限重连）
+        """
+        self.fund_codes = list(fund_codes)
+        self.push_host = push_host
+        self.session = session or requests.Session()
+        self.read_timeout = read_timeout
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.max_failures = max_failures
+
+        self.running = False
+        self.reconnects = 0
+        self._stop_event = threading.Event()
+        self._state: Dict[str, Dict] = {}  # 快照序号 -> 最新字段
+
+    @property
+    def url(self) -> str:
+        secids = ','.join(f"{DataFetcher._get_market(code)}.{code}" for code in self.fund_codes)
+        return f"{self.push_host}/api/qt/ulist/sse?fltt=2&fields=f12,f14,f2,f5&secids={secids}"
+
+    def __iter__(self) -> Iterator[Dict]:
+        return self.stream()
+
+    def stream(self) -> Iterator[Dict]:
+        """持续产出行情更新，直到 stop() 或连续失败超过上限"""
+        self.running = True
+        self._stop_event.clear()
+        failures = 0
+
+        while self.running:
+            try:
+                for quote in self._consume():
+                    failures = 0
+                    yield quote
+                if not self.running:
+                    break
+                raise ConnectionError("推送连接被服务端关闭")
+
+            except Exception as e:
+                if not self.running:
+                    break
+
+                failures += 1
+                if self.max_failures is not None and failures > self.max_failures:
+                    raise StreamError(f"行情推送连续失败 {failures - 1} 次: {e}")
+
+                delay = self._backoff(failures)
+                log.warning(f"行情推送断开: {e}，{delay:.1f} 秒后重连（第 {failures} 次）")
+                self._stop_event.wait(delay)
+                self.reconnects += 1
+
+    def stop(self):
+        """停止订阅"""
+        self.running = False
+        self._stop_event.set()
+
+    def _backoff(self, failures: int) -> float:
+        """指数退避 + 随机抖动（在上限的 50%~100% 之间取值）"""
+        ceiling = min(self.max_backoff, self.initial_backoff * 2 ** (failures - 1))
+        return random.uniform(ceiling / 2, ceiling)
+
+    def _consume(self) -> Iterator[Dict]:
+        """建立一次连接并解析 SSE 消息"""
+        self._state = {}
+        headers = {PRIORITY_HEADER: PRIORITY_CRITICAL}
+        with self.session.get(self.url, stream=True, timeout=(5, self.read_timeout), headers=headers) as resp:
+            resp.raise_for_status()
+            log.info(f"行情推送已连接: {len(self.fund_codes)} 只基金")
+
+            # chunk_size=None：数据到达即处理，不等待缓冲区填满
+            for line in resp.iter_lines(chunk_size=None):
+                if not self.running:
+                    return
+                if not line.startswith(b'data:'):
+                    continue
+
+                message = json.loads(line[5:].decode('utf-8'))
+                yield from self._apply(message)
+
+    def _apply(self, message: Dict) -> Iterator[Dict]:
+        """合并增量字段，产出发生变化的基金行情"""
+        diff = (message.get('data') or {}).get('diff') or {}
+        if isinstance(diff, list):
+            diff = {str(i): item for i, item in enumerate(diff)}
+
+        for key, fields in diff.items():
+            state = self._state.setdefault(key, {})
+            state.update(fields)
+
+            code = state.get('f12')
+            price = state.get('f2')
+            # 停牌或无数据时价格字段为 "-"
+            if not code or not isinstance(price, (int, float)):
+                continue
+
+            volume = state.get('f5')
+            yield {
+                'code': code,
+                'name': state.get('f14', ''),
+                'price': float(price),
+                'volume': volume if isinstance(volume, (int, float)) else 0,
+            }
+
+
+class SSEReplayServer:
+    """
+    本地 SSE 回放服务（测试用）
+
+    按顺序推送预先录制的消息；disconnect_after 条消息后主动断开，
+    用于测试断线重连。
+    """
+
+    def __init__(
+        self,
+        messages: List[Dict],
+        interval: float = 0.0,
+        disconnect_after: Optional[int] = None,
+        port: int = 0
+    ):
+        self.messages = messages
+        self.interval = interval
+        self.disconnect_after = disconnect_after
+        self.connections = 0
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.connections += 1
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Cache-Control', 'no-cache')
+                self.end_headers()
+
+                for i, message in enumerate(server.messages):
+                    if server.disconnect_after is not None and i >= server.disconnect_after:
+                        break
+                    try:
+                        self.wfile.write(f"data: {json.dumps(message, ensure_ascii=False)}\n\n".encode('utf-8'))
+                        self.wfile.flush()
+                    except OSError:
+                        return
+                    time.sleep(server.interval)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self._httpd.daemon_threads = True
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "SSEReplayServer":
+        """从录制文件加载（每行一条 JSON 消息）"""
+        with open(path, 'r', encoding='utf-8') as f:
+            messages = [json.loads(line) for line in f if line.strip()]
+        return cls(messages, **kwargs)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}"
+
+    def start(self) -> "SSEReplayServer":
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
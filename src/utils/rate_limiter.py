@@ -0,0 +1,248 @@
+"""
+请求限速
+进程内所有 DataFetcher 共享的按主机令牌桶，按优先级排队放行
+"""
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from ..utils.hedge import LatencyTracker
+from ..utils.logger import log
+
+# 优先级（数值越小越先放行）
+PRIORITY_CRITICAL = "critical"      # 交易相关的行情刷新
+PRIORITY_NORMAL = "normal"          # 扫描中的净值等请求（默认）
+PRIORITY_BACKGROUND = "background"  # 元数据等后台刷新
+
+PRIORITIES = {PRIORITY_CRITICAL: 0, PRIORITY_NORMAL: 1, PRIORITY_BACKGROUND: 2}
+
+# 通过请求头传递优先级，由 ResilientAdapter 取出后删除，不会发送到服务端
+PRIORITY_HEADER = "X-Request-Priority"
+
+# 协程排队时重新检查的最短间隔（秒）
+ASYNC_POLL_INTERVAL = 0.005
+
+
+class TokenBucket:
+    """令牌桶：平均每秒 rate 个请求，最多累积 burst 个"""
+
+    def __init__(self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.tokens = burst
+        self.updated_at = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def try_take(self) -> bool:
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def time_to_token(self) -> float:
+        """距离下一个令牌可用的时间（秒）"""
+        self._refill()
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+
+class _HostLimiter:
+    """单个主机的令牌桶和等待队列"""
+
+    def __init__(self, rate: float, burst: float):
+        self.bucket = TokenBucket(rate, burst)
+        self.waiters = []  # (优先级, 序号)
+        self.cond = threading.Condition()
+        self.waits: Dict[str, LatencyTracker] = {}
+        self.requests: Dict[str, int] = {}
+        self.max_wait: Dict[str, float] = {}
+
+
+class RequestGovernor:
+    """
+    按主机限速的请求调度器
+
+    - 每个主机一个令牌桶（hosts 中单独配置，其余主机使用默认速率）
+    - 令牌不足时排队，高优先级先放行，同优先级按到达顺序
+    - 记录每个主机、每个优先级的排队延迟
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: float = 20.0,
+        hosts: Optional[Dict[str, Dict]] = None,
+        enabled: bool = True
+    ):
+        """
+        Args:
+            rate: 默认每秒请求数
+            burst: 默认突发请求数（令牌桶容量）
+            hosts: 按主机覆盖，如 {'push2.eastmoney.com': {'rate': 20, 'burst': 40}}
+            enabled: False 时不限速（仍统计请求数）
+        """
+        self.rate = rate
+        self.burst = burst
+        self.hosts = hosts or {}
+        self.enabled = enabled
+
+        self._limiters: Dict[str, _HostLimiter] = {}
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+
+    def _limiter(self, host: str) -> _HostLimiter:
+        with self._lock:
+            if host not in self._limiters:
+                config = self.hosts.get(host, {})
+                self._limiters[host] = _HostLimiter(
+                    config.get('rate', self.rate),
+                    config.get('burst', self.burst)
+                )
+            return self._limiters[host]
+
+    def acquire(self, host: str, priority: str = PRIORITY_NORMAL) -> float:
+        """
+        取得一次请求的许可，令牌不足时阻塞
+
+        Returns:
+            排队等待时间（秒）
+        """
+        limiter = self._limiter(host)
+        priority = priority if priority in PRIORITIES else PRIORITY_NORMAL
+        start = time.perf_counter()
+
+        if self.enabled:
+            waiter = (PRIORITIES[priority], next(self._seq))
+            with limiter.cond:
+                heapq.heappush(limiter.waiters, waiter)
+                while True:
+                    if limiter.waiters[0] == waiter and limiter.bucket.try_take():
+                        heapq.heappop(limiter.waiters)
+                        # 唤醒下一个排队的请求重新检查
+                        limiter.cond.notify_all()
+                        break
+                    limiter.cond.wait(timeout=limiter.bucket.time_to_token() or None)
+
+        return self._finish(host, limiter, priority, start)
+
+    async def acquire_async(self, host: str, priority: str = PRIORITY_NORMAL) -> float:
+        """
+        acquire() 的协程版本：排队时让出事件循环而不是阻塞线程
+
+        与同步请求共用同一个令牌桶和等待队列（AsyncDataFetcher 使用）
+
+        Returns:
+            排队等待时间（秒）
+        """
+        limiter = self._limiter(host)
+        priority = priority if priority in PRIORITIES else PRIORITY_NORMAL
+        start = time.perf_counter()
+
+        if self.enabled:
+            waiter = (PRIORITIES[priority], next(self._seq))
+            with limiter.cond:
+                heapq.heappush(limiter.waiters, waiter)
+            try:
+                while True:
+                    with limiter.cond:
+                        if limiter.waiters[0] == waiter and limiter.bucket.try_take():
+                            heapq.heappop(limiter.waiters)
+                            limiter.cond.notify_all()
+                            break
+                        delay = limiter.bucket.time_to_token()
+                    await asyncio.sleep(max(delay, ASYNC_POLL_INTERVAL))
+            except BaseException:
+                # 协程被取消：移出等待队列，避免阻塞后面的请求
+                with limiter.cond:
+                    if waiter in limiter.waiters:
+                        limiter.waiters.remove(waiter)
+                        heapq.heapify(limiter.waiters)
+                    limiter.cond.notify_all()
+                raise
+
+        return self._finish(host, limiter, priority, start)
+
+    def _finish(self, host: str, limiter: _HostLimiter, priority: str, start: float) -> float:
+        waited = time.perf_counter() - start
+        self._record(limiter, priority, waited)
+        if waited > 1:
+            log.debug(f"{host} 请求排队 {waited:.2f} 秒（{priority}）")
+        return waited
+
+    def _record(self, limiter: _HostLimiter, priority: str, waited: float):
+        with limiter.cond:
+            if priority not in limiter.waits:
+                limiter.waits[priority] = LatencyTracker()
+            limiter.requests[priority] = limiter.requests.get(priority, 0) + 1
+            limiter.max_wait[priority] = max(limiter.max_wait.get(priority, 0.0), waited)
+        limiter.waits[priority].record(waited)
+
+    def queue_depths(self) -> Dict[str, int]:
+        """各主机当前排队的请求数"""
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {host: len(limiter.waiters) for host, limiter in limiters.items()}
+
+    def stats(self) -> Dict[str, Dict[str, Dict]]:
+        """
+        排队延迟统计
+
+        Returns:
+            {'push2.eastmoney.com': {'critical': {'requests': 120, 'wait_p50': 0.0,
+                                                  'wait_p95': 0.05, 'wait_max': 0.2}}}
+        """
+        with self._lock:
+            limiters = dict(self._limiters)
+
+        result = {}
+        for host, limiter in limiters.items():
+            with limiter.cond:
+                requests = dict(limiter.requests)
+                max_wait = dict(limiter.max_wait)
+                waits = dict(limiter.waits)
+            result[host] = {
+                priority: {
+                    'requests': count,
+                    'wait_p50': waits[priority].percentile(50),
+                    'wait_p95': waits[priority].percentile(95),
+                    'wait_max': max_wait[priority],
+                }
+                for priority, count in requests.items()
+            }
+        return result
+
+
+# 进程内共享的限速器
+_governor = RequestGovernor()
+
+
+def get_governor() -> RequestGovernor:
+    """进程内共享的请求限速器"""
+    return _governor
+
+
+def configure_governor(config: Optional[Dict] = None) -> RequestGovernor:
+    """
+    按配置重建共享限速器（启动时调用一次）
+
+    Args:
+        config: {'enabled': True, 'rate': 10, 'burst': 20, 'hosts': {...}}
+    """
+    global _governor
+    config = config or {}
+    _governor = RequestGovernor(
+        rate=config.get('rate', 10.0),
+        burst=config.get('burst', 20.0),
+        hosts=config.get('hosts'),
+        enabled=config.get('enabled', True)
+    )
+    log.info(f"请求限速: 默认 {_governor.rate}/秒, 突发 {_governor.burst}")
+    return _governor
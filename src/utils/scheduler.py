@@ -0,0 +1,112 @@
+"""
+定频调度
+按单调时钟的固定节拍执行任务：周期不随任务耗时漂移，
+任务超时时合并错过的节拍，并记录延迟和超时次数
+"""
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from ..utils.logger import log
+from ..utils.metrics import metrics
+
+
+class FixedRateScheduler:
+    """
+    定频调度器
+
+    第 n 次执行的计划时间为 start + n * interval：
+    - 任务耗时小于 interval 时，等待到下一个节拍（而不是再等一个完整的 interval）
+    - 任务超过 interval（超时）时，错过的节拍不补跑，直接对齐到下一个未来的节拍
+    - 每次执行记录实际开始时间相对计划时间的延迟（metrics 中的 scheduler.lateness）
+    - 提供 interval_fn 时每次执行后由它决定下一个间隔（如按交易阶段调整）
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        name: str = "scan",
+        clock: Callable[[], float] = time.monotonic,
+        wait: Optional[Callable[[float], bool]] = None,
+        interval_fn: Optional[Callable[[], float]] = None
+    ):
+        """
+        Args:
+            interval: 节拍间隔（秒）
+            name: 任务名（用于日志和指标标签）
+            clock: 单调时钟
+            wait: 等待函数，返回 True 表示被 stop() 唤醒（默认使用内部 Event）
+            interval_fn: 返回下一个间隔（秒），None 时固定使用 interval
+        """
+        self.interval = interval
+        self.name = name
+        self.clock = clock
+        self._stop = threading.Event()
+        self.wait = wait or self._stop.wait
+        self.interval_fn = interval_fn
+
+        self.ticks = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.max_lateness = 0.0
+
+    def run(self, task: Callable[[], None], should_continue: Callable[[], bool] = lambda: True):
+        """
+        按固定节拍执行 task，直到 stop() 或 should_continue() 返回 False
+
+        task 抛出的异常会被记录，不会中断调度
+        """
+        self._stop.clear()
+        next_tick = self.clock()
+
+        while should_continue() and not self._stop.is_set():
+            delay = next_tick - self.clock()
+            if delay > 0 and self.wait(delay):
+                break
+            if self._stop.is_set() or not should_continue():
+                break
+
+            started = self.clock()
+            lateness = max(0.0, started - next_tick)
+            self.ticks += 1
+            self.max_lateness = max(self.max_lateness, lateness)
+            metrics.observe(f"scheduler.{self.name}.lateness", lateness)
+
+            try:
+                task()
+            except Exception as e:
+                log.error(f"定时任务 {self.name} 出错: {e}")
+
+            interval = self.interval_fn() if self.interval_fn else self.interval
+            next_tick += interval
+            now = self.clock()
+            if now > next_tick and interval > 0:
+                # 超时：错过的节拍合并为一次，对齐到下一个未来的节拍
+                missed = int((now - next_tick) // interval) + 1
+                next_tick += missed * interval
+                self.overruns += 1
+                self.skipped += missed
+                metrics.inc('scheduler_overruns', {'task': self.name})
+                metrics.inc('scheduler_skipped_ticks', {'task': self.name}, missed)
+                log.warning(
+                    f"定时任务 {self.name} 耗时 {now - started:.1f} 秒，超过间隔 {interval:.0f} 秒，"
+                    f"跳过 {missed} 个节拍"
+                )
+
+    def stop(self):
+        """停止调度（正在等待时立即返回）"""
+        self._stop.set()
+
+    def stats(self) -> Dict:
+        """
+        调度统计
+
+        Returns:
+            {'ticks': 120, 'overruns': 2, 'skipped': 3, 'max_lateness': 0.004}
+        """
+        return {
+            'ticks': self.ticks,
+            'overruns': self.overruns,
+            'skipped': self.skipped,
+            'max_lateness': self.max_lateness,
+        }
@@ -0,0 +1,177 @@
+"""
+交易日历
+沪深交易所的交易阶段（集合竞价、连续竞价、午休、收盘集合竞价、休市）和休市日，
+按阶段决定扫描间隔，休市时休眠到下一个扫描阶段
+"""
+from datetime import date, datetime, time, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import yaml
+
+from ..utils.logger import log
+
+# 北京时间（无夏令时）
+CST = timezone(timedelta(hours=8))
+
+PHASE_CLOSED = "closed"                    # 非交易日、开盘前、收盘后
+PHASE_CALL_AUCTION = "call_auction"        # 09:15-09:25 开盘集合竞价
+PHASE_PRE_OPEN = "pre_open"                # 09:25-09:30 撮合完成，等待连续竞价
+PHASE_CONTINUOUS = "continuous"            # 09:30-11:30, 13:00-14:57 连续竞价
+PHASE_LUNCH_BREAK = "lunch_break"          # 11:30-13:00 午间休市
+PHASE_CLOSING_AUCTION = "closing_auction"  # 14:57-15:00 收盘集合竞价
+
+# 交易日内各阶段的开始时间（按时间排序），15:00 之后为休市
+SESSIONS = (
+    (time(9, 15), PHASE_CALL_AUCTION),
+    (time(9, 25), PHASE_PRE_OPEN),
+    (time(9, 30), PHASE_CONTINUOUS),
+    (time(11, 30), PHASE_LUNCH_BREAK),
+    (time(13, 0), PHASE_CONTINUOUS),
+    (time(14, 57), PHASE_CLOSING_AUCTION),
+    (time(15, 0), PHASE_CLOSED),
+)
+
+
+class TradingCalendar:
+    """
+    沪深交易日历
+
+    交易日按年预先计算为位图（每天 1 位，周末和休市日为 0），
+    判断是否交易日只需一次位运算；未配置休市日的年份只排除周末
+    """
+
+    def __init__(self, holidays: Iterable[date] = ()):
+        self.holidays = set(holidays)
+        self._bitmaps: Dict[int, bytearray] = {}
+        for year in {day.year for day in self.holidays}:
+            self._bitmap(year)
+
+    def _bitmap(self, year: int) -> bytearray:
+        bitmap = self._bitmaps.get(year)
+        if bitmap is None:
+            bitmap = bytearray(46)  # 366 位
+            day = date(year, 1, 1)
+            while day.year == year:
+                if day.weekday() < 5 and day not in self.holidays:
+                    index = day.timetuple().tm_yday - 1
+                    bitmap[index >> 3] |= 1 << (index & 7)
+                day += timedelta(days=1)
+            self._bitmaps[year] = bitmap
+        return bitmap
+
+    def is_trading_day(self, day: date) -> bool:
+        index = day.timetuple().tm_yday - 1
+        return bool(self._bitmap(day.year)[index >> 3] & (1 << (index & 7)))
+
+    def next_trading_day(self, day: date) -> date:
+        """day 之后（不含）的第一个交易日"""
+        day += timedelta(days=1)
+        while not self.is_trading_day(day):
+            day += timedelta(days=1)
+        return day
+
+    def previous_trading_day(self, day: date) -> date:
+        """day 之前（不含）的最后一个交易日"""
+        day -= timedelta(days=1)
+        while not self.is_trading_day(day):
+            day -= timedelta(days=1)
+        return day
+
+    @staticmethod
+    def to_local(moment: datetime) -> datetime:
+        """转换为北京时间（不带时区的时间视为北京时间）"""
+        if moment.tzinfo is None:
+            return moment.replace(tzinfo=CST)
+        return moment.astimezone(CST)
+
+    def phase(self, moment: datetime) -> str:
+        """moment 所处的交易阶段"""
+        moment = self.to_local(moment)
+        if not self.is_trading_day(moment.date()):
+            return PHASE_CLOSED
+
+        current = PHASE_CLOSED
+        for start, phase in SESSIONS:
+            if moment.time() < start:
+                break
+            current = phase
+        return current
+
+    def next_phase_change(self, moment: datetime) -> datetime:
+        """moment 之后下一个阶段切换的时间（北京时间）"""
+        moment = self.to_local(moment)
+        day = moment.date()
+        if self.is_trading_day(day):
+            for start, _ in SESSIONS:
+                if moment.time() < start:
+                    return datetime.combine(day, start, tzinfo=CST)
+
+        return datetime.combine(self.next_trading_day(day), SESSIONS[0][0], tzinfo=CST)
+
+
+class SessionPacer:
+    """
+    按交易阶段决定扫描间隔
+
+    intervals 中阶段对应的值为 None（或未列出且不是交易阶段）时该阶段不扫描，
+    interval() 返回距离下一个扫描阶段开始的秒数
+    """
+
+    DEFAULT_PHASES = (PHASE_CALL_AUCTION, PHASE_CONTINUOUS, PHASE_CLOSING_AUCTION)
+
+    def __init__(self, calendar: TradingCalendar, default_interval: float, intervals: Optional[Dict] = None):
+        self.calendar = calendar
+        self.intervals = {phase: default_interval for phase in self.DEFAULT_PHASES}
+        self.intervals.update(intervals or {})
+
+    def should_scan(self, moment: datetime) -> bool:
+        return self.intervals.get(self.calendar.phase(moment)) is not None
+
+    def next_scan_start(self, moment: datetime) -> datetime:
+        """moment 之后第一个扫描阶段的开始时间"""
+        change = self.calendar.next_phase_change(moment)
+        # 阶段数有限，最多跨过一个长假也只需要几十次
+        for _ in range(1000):
+            if self.should_scan(change):
+                return change
+            change = self.calendar.next_phase_change(change)
+        raise ValueError("交易日历中没有需要扫描的阶段")
+
+    def interval(self, moment: datetime) -> float:
+        """
+        下一次扫描前的等待时间（秒）
+
+        扫描阶段内为该阶段的间隔（不超过到阶段结束的时间），否则为到下一个扫描阶段开始的时间
+        """
+        local = self.calendar.to_local(moment)
+        seconds = self.intervals.get(self.calendar.phase(local))
+        if seconds is not None:
+            # 阶段切换时立即按新阶段的间隔扫描（如收盘集合竞价的间隔更短）
+            until_change = (self.calendar.next_phase_change(local) - local).total_seconds()
+            return max(0.0, min(seconds, until_change))
+
+        return max(0.0, (self.next_scan_start(local) - local).total_seconds())
+
+
+def load_holidays(path: str) -> list:
+    """
+    从 YAML 加载休市日
+
+    文件格式:
+        holidays:
+          - 2026-01-01
+          - 2026-01-02
+    """
+    file = Path(path)
+    if not file.exists():
+        log.warning(f"休市日文件不存在: {path}，仅按周末判断交易日")
+        return []
+
+    with open(file, 'r', encoding='utf-8') as f:
+        data = yaml.safe_load(f) or {}
+
+    holidays = []
+    for value in data.get('holidays', []):
+        holidays.append(value if isinstance(value, date) else date.fromisoformat(str(value)))
+    return holidays
@@ -0,0 +1,207 @@
+"""
+HTTP 传输层
+为 requests.Session 提供按主机的重试退避与熔断保护
+"""
+import random
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..utils.logger import log
+from ..utils.metrics import metrics
+from ..utils.rate_limiter import PRIORITY_HEADER, PRIORITY_NORMAL, RequestGovernor, get_governor
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """熔断器打开，请求被直接拒绝"""
+    pass
+
+
+class CircuitBreaker:
+    """
+    熔断器
+
+    - closed: 正常放行，连续失败达到 failure_threshold 次后打开
+    - open: 直接拒绝请求，recovery_timeout 秒后进入半开
+    - half_open: 只放行一个探测请求，成功则关闭，失败则重新打开
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.clock = clock
+
+        self.state = self.CLOSED
+        self.failures = 0  # 连续失败次数
+        self.opened_at = 0.0
+        self.rejected = 0  # 熔断期间拒绝的请求数
+        self.trips = 0  # 打开次数
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """是否放行请求"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+
+            if self.state == self.OPEN and self.clock() - self.opened_at >= self.recovery_timeout:
+                self.state = self.HALF_OPEN
+                self._probing = False
+
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.trips += 1
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+                self._probing = False
+
+    def snapshot(self) -> Dict:
+        """当前状态（用于监控）"""
+        with self._lock:
+            return {
+                'state': self.state,
+                'failures': self.failures,
+                'rejected': self.rejected,
+                'trips': self.trips,
+            }
+
+
+class ResilientAdapter(HTTPAdapter):
+    """
+    带重试与熔断的 HTTPAdapter
+
+    - 连接错误、超时和 retry_statuses 中的状态码视为失败
+    - 幂等请求（GET/HEAD）失败后按指数退避（带随机抖动）重试
+    - 每个主机一个熔断器，熔断期间直接抛出 CircuitOpenError，不占用超时时间
+    - 每次发送（含重试）前向请求限速器取得许可，优先级由 X-Request-Priority 请求头指定
+    """
+
+    IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+
+    def __init__(
+        self,
+        retries: int = 2,
+        backoff_base: float = 0.2,
+        backoff_max: float = 2.0,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        retry_statuses: Iterable[int] = (429, 500, 502, 503, 504),
+        governor: Optional[RequestGovernor] = None,
+        **kwargs
+    ):
+        """
+        Args:
+            retries: 失败后的重试次数
+            backoff_base: 首次重试等待时间（秒），之后每次翻倍
+            backoff_max: 重试等待时间上限（秒）
+            failure_threshold: 连续失败多少次后熔断
+            recovery_timeout: 熔断持续时间（秒），之后放行一个探测请求
+            retry_statuses: 视为失败的 HTTP 状态码
+            governor: 请求限速器（None 表示使用进程内共享的限速器）
+            **kwargs: 传给 HTTPAdapter（如 pool_maxsize）
+        """
+        super().__init__(**kwargs)
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.retry_statuses = frozenset(retry_statuses)
+        self.governor = governor
+
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._breakers_lock = threading.Lock()
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        """获取主机对应的熔断器"""
+        with self._breakers_lock:
+            if host not in self.breakers:
+                self.breakers[host] = CircuitBreaker(self.failure_threshold, self.recovery_timeout)
+            return self.breakers[host]
+
+    def states(self) -> Dict[str, Dict]:
+        """全部主机的熔断器状态"""
+        with self._breakers_lock:
+            breakers = dict(self.breakers)
+        return {host: breaker.snapshot() for host, breaker in breakers.items()}
+
+    def send(self, request, **kwargs):
+        host = urlparse(request.url).netloc
+        breaker = self.breaker(host)
+        priority = request.headers.pop(PRIORITY_HEADER, PRIORITY_NORMAL)
+        governor = self.governor or get_governor()
+        attempts = 1 + (self.retries if request.method in self.IDEMPOTENT_METHODS else 0)
+
+        error: Optional[Exception] = None
+
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+
+            if not breaker.allow():
+                raise CircuitOpenError(f"{host} 熔断中，请求被拒绝", request=request)
+
+            governor.acquire(host, priority)
+
+            try:
+                response = super().send(request, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                metrics.inc('http_requests', {'host': host, 'status': 'error'})
+                breaker.record_failure()
+                error = e
+            except BaseException:
+                # 其他异常不重试，但必须记录结果：否则半开状态的探测请求永远不结束，熔断器一直拒绝请求
+                metrics.inc('http_requests', {'host': host, 'status': 'error'})
+                breaker.record_failure()
+                raise
+            else:
+                metrics.inc('http_requests', {'host': host, 'status': str(response.status_code)})
+                if response.status_code not in self.retry_statuses:
+                    breaker.record_success()
+                    return response
+
+                breaker.record_failure()
+                if last_attempt:
+                    return response
+                response.close()
+
+            if not last_attempt:
+                delay = self._backoff(attempt)
+                log.debug(f"{host} 请求失败，{delay:.2f} 秒后重试（第 {attempt + 1} 次）")
+                time.sleep(delay)
+
+        raise error
+
+    def _backoff(self, attempt: int) -> float:
+        """指数退避 + 随机抖动（在上限的 50%~100% 之间取值）"""
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        return random.uniform(ceiling / 2, ceiling)
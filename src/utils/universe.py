@@ -0,0 +1,103 @@
+"""
+LOF 全市场筛选
+批量拉取全部上市 LOF 行情，用向量化运算初筛，只有候选基金进入逐只净值流程
+"""
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..utils.data_fetcher import DataFetcher
+from ..utils.logger import log
+from ..utils.nav_cache import NavCache
+
+
+class LOFUniverse:
+    """
+    LOF 基金池
+
+    初筛使用净值缓存中已知的最新净值估算溢价率；
+    尚无净值的基金按成交额排序补充为候选，逐步填充净值缓存。
+    """
+
+    COLUMNS = ['code', 'name', 'market', 'price', 'volume', 'amount']
+
+    def __init__(
+        self,
+        data_fetcher: DataFetcher,
+        nav_cache: Optional[NavCache] = None,
+        min_volume: float = 100,
+        near_ratio: float = 0.5,
+        max_candidates: int = 50
+    ):
+        """
+        Args:
+            data_fetcher: 数据获取器
+            nav_cache: 净值缓存（提供已知净值）
+            min_volume: 最小成交量（手），低于该值不参与筛选
+            near_ratio: 溢价率达到阈值的该比例即视为候选
+            max_candidates: 每次筛选最多返回的候选数
+        """
+        self.data_fetcher = data_fetcher
+        self.nav_cache = nav_cache
+        self.min_volume = min_volume
+        self.near_ratio = near_ratio
+        self.max_candidates = max_candidates
+
+        self.frame = pd.DataFrame(columns=self.COLUMNS + ['nav', 'premium_rate'])
+
+    def refresh(self) -> pd.DataFrame:
+        """拉取全部 LOF 行情并计算估算溢价率"""
+        rows = self.data_fetcher.get_lof_list()
+        frame = pd.DataFrame.from_records(rows, columns=self.COLUMNS)
+
+        navs = {}
+        if self.nav_cache:
+            for code in frame['code']:
+                known = self.nav_cache.peek(code)
+                if known:
+                    navs[code] = known[0]
+
+        frame['nav'] = frame['code'].map(navs).astype(float)
+        frame['premium_rate'] = frame['price'] / frame['nav'] - 1
+
+        self.frame = frame
+        log.debug(f"LOF 基金池: {len(frame)} 只，已知净值 {len(navs)} 只")
+        return frame
+
+    def screen(self, min_premium_rate: float, min_discount_rate: float) -> List[str]:
+        """
+        向量化初筛
+
+        Returns:
+            候选基金代码：溢价/折价接近阈值的按偏离程度排序在前，
+            其余名额留给尚无净值的基金（按成交额排序）
+        """
+        frame = self.frame
+        if frame.empty:
+            return []
+
+        price = frame['price'].to_numpy(dtype=float)
+        volume = frame['volume'].to_numpy(dtype=float)
+        premium = frame['premium_rate'].to_numpy(dtype=float)
+        amount = frame['amount'].to_numpy(dtype=float)
+
+        tradable = (price > 0) & (volume >= self.min_volume)
+        unknown = np.isnan(premium)
+        with np.errstate(invalid='ignore'):
+            near = (
+                (premium >= min_premium_rate * self.near_ratio)
+                | (premium <= -min_discount_rate * self.near_ratio)
+            )
+
+        near_idx = np.flatnonzero(tradable & near)
+        near_idx = near_idx[np.argsort(-np.abs(premium[near_idx]), kind='stable')]
+
+        unknown_idx = np.flatnonzero(tradable & unknown)
+        unknown_idx = unknown_idx[np.argsort(-amount[unknown_idx], kind='stable')]
+
+        selected = np.concatenate([near_idx, unknown_idx])[:self.max_candidates]
+        codes = frame['code'].to_numpy()[selected].tolist()
+
+        log.debug(f"初筛候选: {len(codes)} 只（接近阈值 {len(near_idx)}，缺少净值 {len(unknown_idx)}）")
+        return codes
@@ -0,0 +1,170 @@
+"""
+账户状态缓存测试脚本
+"""
+from src.api.account_cache import AccountStateCache
+from src.api.broker_base import OrderType
+from src.api.sim_broker import SimulatedBroker
+from src.strategies.lof_arbitrage import LOFArbitrage
+from src.utils.quote import Quote
+
+
+class CountingBroker(SimulatedBroker):
+    """记录余额、持仓查询次数的模拟券商"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.balance_calls = 0
+        self.position_calls = 0
+
+    def get_balance(self):
+        self.balance_calls += 1
+        return super().get_balance()
+
+    def get_position(self):
+        self.position_calls += 1
+        return super().get_position()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_cache(ttl=30):
+    broker = CountingBroker(initial_cash=100000)
+    broker.connect()
+    clock = FakeClock()
+    return broker, clock, AccountStateCache(broker, ttl=ttl, clock=clock)
+
+
+def test_ttl():
+    """有效期内读缓存，过期后重新查询"""
+    broker, clock, cache = make_cache()
+    assert cache.balance()['available'] == 100000
+    cache.balance()
+    cache.position('163406')
+    cache.position('161725')
+    assert broker.balance_calls == 1
+    assert broker.position_calls == 1
+
+    clock.now = 30
+    cache.balance()
+    assert broker.balance_calls == 2
+
+
+def test_fill_patches_cache():
+    """限价成交后就地更新余额和持仓，不再查询券商"""
+    broker, clock, cache = make_cache()
+    cache.balance()
+    cache.positions()
+
+    order = cache.place_order('163406', OrderType.BUY, 1000, 2.0)
+    assert order['status'] == 'filled'
+
+    balance = cache.balance()
+    assert balance['available'] == 98000
+    assert balance['market_value'] == 2000
+    position = cache.position('163406')
+    assert position['quantity'] == 1000
+    assert position['available'] == 0  # T+1
+    assert position['cost'] == 2.0
+    assert broker.balance_calls == 1
+    assert broker.position_calls == 1
+
+    # 修改返回值不影响缓存
+    position['quantity'] = 0
+    cache.positions()['163406']['quantity'] = 0
+    cache.positions().pop('163406')
+    assert cache.position('163406')['quantity'] == 1000
+
+
+def test_market_fill_patches_cache():
+    """市价成交按券商回报的成交价更新缓存"""
+    broker, clock, cache = make_cache()
+    cache.balance()
+    order = cache.place_order('163406', OrderType.BUY, 1000)
+
+    assert cache.balance()['available'] == broker.cash == 100000 - 1000 * order['price']
+    assert broker.balance_calls == 1
+
+
+class NoFillPriceBroker(CountingBroker):
+    """成交回报不带成交价的券商"""
+
+    def place_order(self, *args, **kwargs):
+        order = super().place_order(*args, **kwargs)
+        order.pop('price', None)
+        return order
+
+
+def test_market_order_invalidates():
+    """市价成交但成交价未知时缓存失效，下次读取以券商为准"""
+    broker = NoFillPriceBroker(initial_cash=100000)
+    broker.connect()
+    cache = AccountStateCache(broker, clock=FakeClock())
+    cache.balance()
+    cache.place_order('163406', OrderType.BUY, 1000)
+
+    assert cache.balance()['available'] == broker.cash
+    assert broker.balance_calls == 2
+
+
+def test_rejected_keeps_cache():
+    """被拒绝的委托不影响缓存"""
+    broker, clock, cache = make_cache()
+    cache.positions()
+    order = cache.place_order('163406', OrderType.SELL, 100, 2.0)
+    assert order['status'] == 'rejected'
+    assert cache.position('163406') is None
+    assert broker.position_calls == 1
+
+
+def test_strategy_reads_cache():
+    """多次发现机会时余额只查询一次券商"""
+    broker = CountingBroker(initial_cash=100000)
+    broker.connect()
+    config = {'nav_cache': {'enabled': False}, 'fund_meta': {'enabled': False}}
+    strategy = LOFArbitrage(broker, config, simulate=True)
+    strategy.notifier = None
+
+    for code in ('163406', '161725', '160000'):
+        strategy.check_arbitrage_opportunity(Quote(code, code, 1.05, 1.0, '2026-01-02', 0.05, 1000, 0))
+
+    assert len(strategy.opportunities) == 3
+    assert broker.balance_calls == 1
+
+
+def test_live_order_patches_cache():
+    """实盘模式按市价下单，成交后按券商回报的成交价就地更新缓存，不再查询券商"""
+    broker = CountingBroker(initial_cash=100000)
+    broker.connect()
+    broker.place_order('163406', OrderType.BUY, 1000, 1.0)
+    orders = []
+    place_order = broker.place_order
+    broker.place_order = lambda *args: orders.append(args) or place_order(*args)
+
+    config = {'nav_cache': {'enabled': False}, 'fund_meta': {'enabled': False}}
+    strategy = LOFArbitrage(broker, config, simulate=False)
+    strategy.notifier = None
+    strategy.account.balance()
+
+    strategy.execute_discount_arbitrage(Quote('163406', '163406', 0.98, 1.0, '2026-01-02', -0.02, 1000, 0), 9800)
+    assert orders == [('163406', OrderType.BUY, 10000, None)]
+    assert strategy.account.position('163406')['quantity'] == 11000
+    assert strategy.account.balance()['available'] == broker.cash
+    assert broker.balance_calls == 1
+    assert broker.position_calls == 1
+
+
+if __name__ == "__main__":
+    test_ttl()
+    test_fill_patches_cache()
+    test_market_fill_patches_cache()
+    test_market_order_invalidates()
+    test_rejected_keeps_cache()
+    test_strategy_reads_cache()
+    test_live_order_patches_cache()
+    print("✅ 账户状态缓存测试通过")
@@ -0,0 +1,140 @@
+"""
+AsyncDataFetcher 测试脚本
+启动本地 HTTP 服务替代东方财富接口，不访问真实网络
+"""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from src.utils.async_data_fetcher import AsyncDataFetcher
+from src.utils.rate_limiter import RequestGovernor
+
+FUND_PAGE = """<html><body>
+<div class="dataOfFund">
+  <dl class="dataItem02">
+    <dt><p><span class="sp01">单位净值</span> (<span>2026-02-13</span>)</p></dt>
+    <dd class="dataNums"><span class="ui-num">2.0000</span><span class="ui-num">+0.50%</span></dd>
+  </dl>
+</div>
+</body></html>"""
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """模拟 push2 行情接口和基金主页"""
+
+    protocol_version = "HTTP/1.1"  # 支持长连接
+    page_delay = 0.1
+    clients = set()
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with self.lock:
+            self.clients.add(self.client_address)
+
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+
+        if url.path == '/api/qt/ulist.np/get':
+            codes = [secid.split('.')[1] for secid in query['secids'][0].split(',')]
+            diff = [{'f12': code, 'f14': f'基金{code}', 'f2': 2.1, 'f5': 100} for code in codes]
+            self._send(json.dumps({'rc': 0, 'data': {'total': len(diff), 'diff': diff}}), 'text/plain')
+        elif url.path == '/api/qt/stock/get':
+            code = query['secid'][0].split('.')[1]
+            self._send(json.dumps({'rc': 0, 'data': {'f43': 2100, 'f47': 100, 'f58': f'基金{code}'}}), 'text/plain')
+        elif url.path.endswith('.html'):
+            time.sleep(self.page_delay)
+            self._send(FUND_PAGE, 'text/html; charset=utf-8')
+        else:
+            self.send_error(404)
+
+    def _send(self, body: str, content_type: str):
+        data = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def run_batch(base_url: str, codes: list) -> tuple:
+    # 本测试只关心连接池并发，限速放宽到不影响耗时
+    governor = RequestGovernor(rate=10000, burst=10000)
+    async with AsyncDataFetcher(limit_per_host=50, push_host=base_url, fund_host=base_url,
+                                governor=governor) as fetcher:
+        start = time.perf_counter()
+        results = await fetcher.get_lof_realtime_prices(codes)
+        elapsed = time.perf_counter() - start
+
+        # 第二轮复用已有连接
+        single = await fetcher.get_lof_realtime_price(codes[0])
+        return results, single, elapsed
+
+
+def test_async_fetcher():
+    """并发轮询 200 只基金：总耗时接近单个页面延迟，连接数受连接池限制"""
+    server = start_server()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    codes = [str(160000 + i) for i in range(200)]
+
+    try:
+        results, single, elapsed = asyncio.run(run_batch(base_url, codes))
+    finally:
+        server.shutdown()
+
+    print(f"获取 {len(results)} 只基金耗时 {elapsed:.2f} 秒，连接数 {len(StandInHandler.clients)}")
+
+    assert list(results) == codes
+    assert results['160000']['nav'] == 2.0
+    assert abs(results['160000']['premium_rate'] - 0.05) < 1e-9
+    assert single['price'] == 2.1
+
+    # 200 个页面每个 0.1 秒，顺序获取需要 20 秒
+    assert elapsed < 2.0
+    assert len(StandInHandler.clients) <= 50
+
+
+def test_async_fetcher_throttled():
+    """并发请求同样受共享限速器约束：20 个页面、每秒 20 个、突发 5 个，至少需要 0.75 秒"""
+    server = start_server()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    codes = [str(161000 + i) for i in range(20)]
+    governor = RequestGovernor(rate=20, burst=5)
+
+    async def run():
+        async with AsyncDataFetcher(limit_per_host=50, push_host=base_url, fund_host=base_url,
+                                    governor=governor) as fetcher:
+            start = time.perf_counter()
+            results = await fetcher.get_lof_realtime_prices(codes)
+            return results, time.perf_counter() - start
+
+    try:
+        results, elapsed = asyncio.run(run())
+    finally:
+        server.shutdown()
+
+    assert list(results) == codes
+    # 1 次行情请求 + 20 个净值页面 = 21 个请求，超出突发的 16 个按每秒 20 个放行
+    assert elapsed >= 0.75
+    host = base_url.split('//', 1)[1]
+    stats = governor.stats()[host]
+    assert stats['critical']['requests'] == 1
+    assert stats['normal']['requests'] == 20
+    assert stats['normal']['wait_max'] > 0.5
+
+
+if __name__ == "__main__":
+    test_async_fetcher()
+    test_async_fetcher_throttled()
+    print("✅ AsyncDataFetcher 测试通过")
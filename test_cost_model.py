@@ -0,0 +1,180 @@
+"""
+交易成本模型测试脚本
+"""
+import numpy as np
+
+from src.api.sim_broker import SimulatedBroker
+from src.strategies.lof_arbitrage import LOFArbitrage
+from src.utils.cost_model import CostModel, load_cost_model
+from src.utils.evaluator import DISCOUNT, PREMIUM, OpportunityEvaluator
+from src.utils.fund_meta import FundMeta, FundMetaStore
+from src.utils.quote import Quote, QuoteBatch
+
+
+def make_batch(rows):
+    """rows: [(代码, 溢价率), ...]"""
+    return QuoteBatch.from_quotes(
+        Quote(code, code, 1.0 + premium, 1.0, '2026-01-02', premium, 100, 0)
+        for code, premium in rows
+    )
+
+
+def make_store():
+    store = FundMetaStore(path=None)
+    store.put(FundMeta(
+        code='163406', secid='0.163406',
+        purchase_fees=((0, 0.012, 0), (1000000, 0.008, 0), (5000000, 0, 1000)),
+        redemption_fees=((0, 0.015), (7, 0.005), (365, 0.0)),
+    ))
+    return store
+
+
+def test_default_rates():
+    """没有元数据时使用默认费率，最低佣金使小额档位成本更高"""
+    model = CostModel(sizes=(5000, 10000, 50000), carry_rate=0.0)
+    premium, discount = model.costs(np.array(['160001']))
+    assert premium.shape == (1, 3)
+
+    # 10000 元：佣金 5 元（最低佣金）= 0.05%，申购费 1.5% 外扣
+    assert abs(premium[0, 1] - (0.0005 + 0.015 / 1.015)) < 1e-12
+    assert abs(discount[0, 1] - (0.0005 + 0.005)) < 1e-12
+    # 5000 元档位佣金占比翻倍，50000 元档位按费率 0.025%
+    assert premium[0, 0] > premium[0, 1] > premium[0, 2]
+    assert abs(discount[0, 2] - (0.00025 + 0.005)) < 1e-12
+
+
+def test_fee_tiers_and_carry():
+    """按元数据的费率档位和持有天数计算，资金占用按天数计入"""
+    model = CostModel(make_store(), sizes=(10000, 2000000), carry_rate=0.0365, holding_days=30)
+    premium, discount = model.costs(np.array(['163406', '160001']))
+
+    carry = 0.0365 * 2 / 365
+    assert abs(premium[0, 0] - (0.0005 + 0.012 / 1.012 + carry)) < 1e-12
+    assert abs(premium[0, 1] - (0.00025 + 0.008 / 1.008 + carry)) < 1e-12
+    # 持有 30 天赎回费 0.5%
+    assert abs(discount[0, 0] - (0.0005 + 0.005 + 0.0365 * 4 / 365)) < 1e-12
+    # 没有元数据的基金使用默认申购费率
+    assert premium[1, 0] > premium[0, 0]
+
+
+def test_bucket_and_scalar():
+    """金额档位取不小于金额的最小档位，逐条判定与成本表一致"""
+    model = CostModel(sizes=(5000, 10000, 20000))
+    assert model.bucket(100) == 0
+    assert model.bucket(5000) == 0
+    assert model.bucket(8000) == 1
+    assert model.bucket(1e9) == 2
+
+    premium, discount = model.costs(np.array(['160001']))
+    assert model.fund_cost('160001', 8000) == (premium[0, 1], discount[0, 1])
+
+
+def test_net_edges_and_evaluate():
+    """扣除成本后按净收益判定：毛溢价过阈值但不够覆盖成本的基金不再命中"""
+    model = CostModel(sizes=(10000,), carry_rate=0.0)
+    batch = make_batch([('160001', 0.02), ('160002', 0.016), ('160003', -0.012), ('160004', -0.008)])
+
+    premium_edge, discount_edge = model.net_edges(batch)
+    assert premium_edge.shape == discount_edge.shape == (4, 1)
+    assert abs(premium_edge[0, 0] - (0.02 - 0.0005 - 0.015 / 1.015)) < 1e-12
+
+    evaluator = OpportunityEvaluator(0.003, 0.003)
+    assert evaluator.evaluate_edges(batch, premium_edge, discount_edge) == [('160001', PREMIUM, 0), ('160003', DISCOUNT, 0)]
+    premium_costs, discount_costs = model.costs(batch.column('code'))
+    hits = evaluator.evaluate(batch, premium_costs[:, 0], discount_costs[:, 0])
+    assert hits == [('160001', PREMIUM), ('160003', DISCOUNT)]
+    assert evaluator.classify(batch['160002'], *model.fund_cost('160002', 10000)) is None
+
+
+def test_meta_refresh():
+    """元数据更新后成本表自动重算，相同基金列表复用缓存"""
+    store = FundMetaStore(path=None)
+    model = CostModel(store, sizes=(10000,), carry_rate=0.0)
+    codes = np.array(['163406'])
+
+    before = model.costs(codes)
+    assert model.costs(codes) is before
+
+    store.put(make_store().get('163406'))
+    premium, _ = model.costs(codes)
+    assert abs(premium[0, 0] - (0.0005 + 0.012 / 1.012)) < 1e-12
+
+
+def test_load_config():
+    """按配置创建"""
+    model = load_cost_model({'sizes': [20000, 5000], 'min_commission': 0.1})
+    assert model.sizes.tolist() == [5000, 20000]
+    assert model.min_commission == 0.1
+    assert model.costs(np.array([], dtype=str))[0].shape == (0, 2)
+
+
+class StubFetcher:
+    """返回固定行情的数据获取器"""
+
+    nav_cache = None
+
+    def get_lof_realtime_prices(self, codes):
+        premiums = {'163406': 0.02, '161725': 0.016, '160642': -0.012}
+        return make_batch([(code, premiums[code]) for code in codes])
+
+
+def test_strategy_scan():
+    """策略按账户可用资金所在档位扣除成本后判定"""
+    broker = SimulatedBroker(initial_cash=100000)
+    broker.connect()
+    config = {
+        'watchlist': ['163406', '161725', '160642'],
+        'nav_cache': {'enabled': False},
+        'fund_meta': {'enabled': False},
+        'max_trade_amount': 10000,
+        'costs': {'enabled': True, 'sizes': [10000, 50000], 'carry_rate': 0.0},
+    }
+    strategy = LOFArbitrage(broker, config, simulate=True)
+    strategy.notifier = None
+    strategy.data_fetcher = StubFetcher()
+
+    assert strategy.planned_trade_amount() == 10000
+    strategy.scan_opportunities()
+    # 161725 毛溢价 1.6% 超过初筛阈值 1.5%，但扣除申购费和佣金后不足 0.3%
+    assert [(o.code, o.type, o.amount) for o in strategy.opportunities] == [
+        ('163406', PREMIUM, 10000), ('160642', DISCOUNT, 10000)
+    ]
+
+
+def test_strategy_picks_largest_bucket():
+    """按各金额档位的净收益判定，交易金额取可用资金内金额最大的盈利档位"""
+    broker = SimulatedBroker(initial_cash=100000)
+    broker.connect()
+    config = {
+        'watchlist': ['163406', '161725', '160642'],
+        'nav_cache': {'enabled': False},
+        'fund_meta': {'enabled': False},
+        'max_trade_amount': 50000,
+        # 最低佣金 50 元：10000 元档位佣金 0.5%，50000 元档位 0.1%
+        'costs': {'enabled': True, 'sizes': [10000, 50000, 100000], 'carry_rate': 0.0, 'min_commission': 50},
+    }
+    strategy = LOFArbitrage(broker, config, simulate=True)
+    strategy.notifier = None
+    strategy.data_fetcher = StubFetcher()
+
+    premium_edges, discount_edges = strategy.costs.net_edges(StubFetcher().get_lof_realtime_prices(['163406', '160642']))
+    assert premium_edges[0, 0] < 0.003 < premium_edges[0, 1]
+    assert discount_edges[1, 0] < 0.003 < discount_edges[1, 1]
+
+    strategy.scan_opportunities()
+    # 10000 元档位扣除成本后都不足 0.3%，50000 元档位满足；100000 元档位超出可用资金
+    assert [(o.code, o.type, o.amount) for o in strategy.opportunities] == [
+        ('163406', PREMIUM, 50000), ('160642', DISCOUNT, 50000)
+    ]
+
+
+if __name__ == "__main__":
+    test_default_rates()
+    test_fee_tiers_and_carry()
+    test_bucket_and_scalar()
+    test_net_edges_and_evaluate()
+    test_meta_refresh()
+    test_load_config()
+    test_strategy_scan()
+    test_strategy_picks_largest_bucket()
+    print("✅ 交易成本模型测试通过")
@@ -0,0 +1,189 @@
+"""
+DataFetcher 离线测试脚本
+使用伪造的 session 返回固定响应，不访问真实接口
+"""
+import json
+import time
+
+from src.utils.data_fetcher import DataFetcher
+from src.utils.nav_cache import NavCache
+
+
+FUND_PAGE = """<html><body>
+<div class="dataOfFund">
+  <dl class="dataItem02">
+    <dt><p><span class="sp01">单位净值</span> (<span>2026-02-13</span>)</p></dt>
+    <dd class="dataNums"><span class="ui-num">2.2030</span><span class="ui-num">-0.73%</span></dd>
+  </dl>
+</div>
+</body></html>"""
+
+
+class FakeResponse:
+    """模拟 requests.Response"""
+
+    def __init__(self, body, status_code: int = 200):
+        # bytes 表示非 UTF-8 编码的原始响应（如新浪的 GBK）
+        self.content = body if isinstance(body, bytes) else body.encode('utf-8')
+        self.text = body if isinstance(body, str) else body.decode('latin-1')
+        self.status_code = status_code
+        self.encoding = 'utf-8'
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class FakeSession:
+    """按 URL 片段返回固定响应，并记录请求"""
+
+    def __init__(self, routes: dict, delay: float = 0.0):
+        self.routes = routes
+        self.delay = delay
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append(url)
+        if self.delay and 'fund.eastmoney.com' in url:
+            time.sleep(self.delay)
+        for fragment, body in self.routes.items():
+            if fragment in url:
+                return body if isinstance(body, FakeResponse) else FakeResponse(body)
+        raise ConnectionError(f"未配置的 URL: {url}")
+
+
+def make_fetcher(routes: dict, max_workers: int = 1, delay: float = 0.0) -> DataFetcher:
+    fetcher = DataFetcher(source="eastmoney", max_workers=max_workers)
+    fetcher.session = FakeSession(routes, delay)
+    return fetcher
+
+
+def make_ulist(codes: list) -> str:
+    diff = [{'f12': code, 'f14': f'基金{code}', 'f2': 2.258, 'f5': 100} for code in codes]
+    return json.dumps({'rc': 0, 'data': {'total': len(diff), 'diff': diff}})
+
+
+def test_batch_prices():
+    """批量行情：一次 ulist 请求覆盖整个监控列表"""
+    ulist = {
+        'rc': 0,
+        'data': {
+            'total': 3,
+            'diff': [
+                {'f12': '163406', 'f14': '兴全合润', 'f2': 2.258, 'f5': 12345},
+                {'f12': '161725', 'f14': '招商白酒', 'f2': 1.100, 'f5': 500},
+                {'f12': '160642', 'f14': '停牌基金', 'f2': '-', 'f5': '-'},
+            ]
+        }
+    }
+    fetcher = make_fetcher({
+        'ulist.np/get': json.dumps(ulist),
+        'fund.eastmoney.com': FUND_PAGE,
+    })
+
+    results = fetcher.get_lof_realtime_prices(['163406', '161725', '160642'])
+
+    price_calls = [url for url in fetcher.session.calls if 'push2' in url]
+    assert len(price_calls) == 1
+    assert 'secids=0.163406,0.161725,0.160642' in price_calls[0]
+
+    # 停牌基金没有价格，不返回
+    assert set(results) == {'163406', '161725'}
+
+    data = results['163406']
+    assert data['name'] == '兴全合润'
+    assert data['price'] == 2.258
+    assert data['nav'] == 2.203
+    assert data['nav_date'] == '2026-02-13'
+    assert abs(data['premium_rate'] - (2.258 - 2.203) / 2.203) < 1e-12
+    print(f"批量行情: {results}")
+
+
+def test_batch_prices_failure():
+    """批量行情接口失败时返回空结果"""
+    fetcher = make_fetcher({})
+    assert fetcher.get_lof_realtime_prices(['163406']) == {}
+
+
+def test_concurrent_nav_fetch():
+    """并发获取净值：总耗时接近单只基金，结果顺序与输入一致"""
+    codes = ['163406', '161725', '160642', '165520', '160215', '161226']
+    fetcher = make_fetcher(
+        {'ulist.np/get': make_ulist(codes), 'fund.eastmoney.com': FUND_PAGE},
+        max_workers=len(codes),
+        delay=0.2
+    )
+
+    start = time.perf_counter()
+    results = fetcher.get_lof_realtime_prices(codes)
+    elapsed = time.perf_counter() - start
+
+    print(f"并发获取 {len(codes)} 只基金耗时: {elapsed:.2f} 秒")
+    assert list(results) == codes
+    assert elapsed < 0.2 * len(codes) / 2
+
+
+def test_nav_cache_skips_fund_page():
+    """净值缓存命中后，不再下载基金主页"""
+    codes = ['163406', '161725']
+    fetcher = make_fetcher({'ulist.np/get': make_ulist(codes), 'fund.eastmoney.com': FUND_PAGE})
+    fetcher.nav_cache = NavCache(path=None)
+
+    fetcher.get_lof_realtime_prices(codes)
+    fetcher.get_lof_realtime_prices(codes)
+
+    page_calls = [url for url in fetcher.session.calls if 'fund.eastmoney.com' in url]
+    assert len(page_calls) == len(codes)
+    assert fetcher.nav_cache.stats()['hits'] == len(codes)
+
+
+SINA_QUOTE = 'var hq_str_sz163406="兴全合润,2.250,2.248,2.258,2.260,2.245,2.257,2.258,1234500,2780000.000";\n'
+
+
+def test_sina_source():
+    """新浪数据源：GBK 响应解析为场内价格，净值来自基金主页"""
+    fetcher = DataFetcher(source="sina")
+    fetcher.session = FakeSession({
+        'hq.sinajs.cn': SINA_QUOTE.encode('gbk'),
+        'fund.eastmoney.com': FUND_PAGE,
+    })
+
+    data = fetcher.get_lof_realtime_price('163406')
+    assert data['name'] == '兴全合润'
+    assert data['price'] == 2.258
+    assert data['volume'] == 12345
+    assert data['nav'] == 2.203
+
+
+def test_sina_batch():
+    """新浪批量行情：一次 list= 请求覆盖多只基金，按批次大小拆分请求"""
+    body = (
+        SINA_QUOTE
+        + 'var hq_str_sz161725="招商白酒,1.100,1.098,1.102,1.110,1.090,1.101,1.102,50000,55100.000";\n'
+        + 'var hq_str_sz160642="";\n'
+    )
+    fetcher = DataFetcher(source="sina")
+    fetcher.session = FakeSession({'hq.sinajs.cn': body.encode('gbk'), 'fund.eastmoney.com': FUND_PAGE})
+
+    results = fetcher.get_lof_realtime_prices(['163406', '161725', '160642'])
+
+    sina_calls = [url for url in fetcher.session.calls if 'sinajs' in url]
+    assert sina_calls == ['http://hq.sinajs.cn/list=sz163406,sz161725,sz160642']
+    assert list(results) == ['163406', '161725']
+    assert results['161725'].name == '招商白酒'
+    assert results['161725'].price == 1.102
+    assert results['161725'].volume == 500
+
+    fetcher.session.calls.clear()
+    fetcher.SINA_BATCH_SIZE = 2
+    assert set(fetcher._get_prices_from_sina(['163406', '161725', '160642'])) == {'163406', '161725'}
+    assert len(fetcher.session.calls) == 2
+
+
+if __name__ == "__main__":
+    test_batch_prices()
+    test_batch_prices_failure()
+    test_concurrent_nav_fetch()
+    test_nav_cache_skips_fund_page()
+    test_sina_source()
+    test_sina_batch()
+    print("✅ DataFetcher 测试通过")
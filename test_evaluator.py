@@ -0,0 +1,93 @@
+"""
+套利机会判定测试脚本
+"""
+import time
+
+import numpy as np
+
+from src.utils.evaluator import DISCOUNT, PREMIUM, OpportunityEvaluator
+from src.utils.quote import Quote, QuoteBatch
+
+
+def make_batch(rows):
+    """rows: [(代码, 溢价率, 净值, 成交量), ...]"""
+    return QuoteBatch.from_quotes(
+        Quote(code, code, nav * (1 + premium), nav, '2026-01-02', premium, volume, 0)
+        for code, premium, nav, volume in rows
+    )
+
+
+def test_evaluate():
+    """整批判定与逐条判定结果一致"""
+    batch = make_batch([
+        ('160001', 0.02, 1.0, 100),    # 溢价
+        ('160002', 0.005, 1.0, 100),   # 无
+        ('160003', -0.012, 1.0, 100),  # 折价
+        ('160004', 0.03, 0.0, 100),    # 净值为 0
+        ('160005', -0.03, 1.0, 0),     # 无成交
+        ('160006', 0.015, 1.0, 100),   # 恰好等于阈值
+    ])
+    evaluator = OpportunityEvaluator(0.015, 0.01)
+
+    hits = evaluator.evaluate(batch)
+    assert hits == [('160001', PREMIUM), ('160003', DISCOUNT), ('160006', PREMIUM)]
+    assert [(code, evaluator.classify(batch[code])) for code in batch if evaluator.classify(batch[code])] == hits
+    assert evaluator.evaluate(QuoteBatch()) == []
+
+
+def test_overrides_and_costs():
+    """按基金阈值和成本数组"""
+    batch = make_batch([('160001', 0.02, 1.0, 100), ('160002', 0.02, 1.0, 100), ('160003', -0.012, 1.0, 100)])
+    evaluator = OpportunityEvaluator(0.015, 0.01, overrides={'160002': {'min_premium_rate': 0.03}})
+
+    assert evaluator.evaluate(batch) == [('160001', PREMIUM), ('160003', DISCOUNT)]
+    assert evaluator.classify(batch['160002']) is None
+
+    # 160001 扣除 1% 成本后不足阈值，160003 折价扣除成本后仍满足
+    costs = np.array([0.01, 0.0, 0.0])
+    assert evaluator.evaluate(batch, premium_costs=costs, discount_costs=0.001) == [('160003', DISCOUNT)]
+
+
+def test_evaluate_edges():
+    """按金额档位的净收益判定，选出金额最大的盈利档位（不超过 max_bucket）"""
+    batch = make_batch([
+        ('160001', 0.02, 1.0, 100),
+        ('160002', -0.02, 1.0, 100),
+        ('160003', 0.03, 0.0, 100),   # 净值为 0
+        ('160004', 0.0, 1.0, 100),
+    ])
+    premium_edges = np.array([[0.001, 0.004, 0.002], [-0.03, -0.03, -0.03], [0.01, 0.01, 0.01], [0.0, 0.0, 0.0]])
+    discount_edges = np.array([[0.0, 0.0, 0.0], [0.002, 0.003, 0.005], [0.0, 0.0, 0.0], [0.0, 0.0, 0.0]])
+    evaluator = OpportunityEvaluator(0.003, 0.003)
+
+    assert evaluator.evaluate_edges(batch, premium_edges, discount_edges) == [
+        ('160001', PREMIUM, 1), ('160002', DISCOUNT, 2)
+    ]
+    assert evaluator.evaluate_edges(batch, premium_edges, discount_edges, max_bucket=1) == [
+        ('160001', PREMIUM, 1), ('160002', DISCOUNT, 1)
+    ]
+    assert evaluator.evaluate_edges(batch, premium_edges, discount_edges, max_bucket=0) == []
+
+
+def test_large_universe():
+    """上千只基金的判定耗时在毫秒级以内"""
+    rng = np.random.default_rng(0)
+    premiums = rng.normal(0, 0.01, 2000)
+    batch = make_batch([(str(160000 + i), float(p), 1.0, 100) for i, p in enumerate(premiums)])
+    evaluator = OpportunityEvaluator(0.015, 0.01)
+
+    start = time.perf_counter()
+    hits = evaluator.evaluate(batch)
+    elapsed = time.perf_counter() - start
+
+    expected = int(((premiums >= 0.015) | (premiums <= -0.01)).sum())
+    assert len(hits) == expected
+    assert elapsed < 0.01
+
+
+if __name__ == "__main__":
+    test_evaluate()
+    test_overrides_and_costs()
+    test_evaluate_edges()
+    test_large_universe()
+    print("✅ 套利机会判定测试通过")
@@ -0,0 +1,183 @@
+"""
+基金元数据存储测试脚本
+"""
+import json
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from src.api.sim_broker import SimulatedBroker
+from src.strategies.lof_arbitrage import LOFArbitrage
+from src.utils.fund_meta import FundMeta, FundMetaStore
+from src.utils.quote import QuoteBatch
+from test_data_fetcher import FUND_PAGE, FakeResponse, make_fetcher
+
+
+PROFILE_PAGE = """<html><body>
+<table class="info w790">
+  <tr><th>基金全称</th><td>招商中证白酒指数证券投资基金(LOF)</td><th>基金简称</th><td>招商中证白酒指数(LOF)A</td></tr>
+  <tr><th>基金代码</th><td>161725（前端）</td><th>基金类型</th><td>指数型-股票</td></tr>
+  <tr><th>业绩比较基准</th><td>中证白酒指数收益率*95%+...</td><th>跟踪标的</th><td>中证白酒指数</td></tr>
+</table>
+</body></html>"""
+
+FEE_PAGE = """<html><body>
+<div class="boxitem w790">
+  <h4 class="t"><label class="left">申购费率（前端）</label></h4>
+  <div class="box"><table class="w650 comm jjfl">
+    <thead><tr><th>适用金额</th><th>适用期限</th><th>原费率</th></tr></thead>
+    <tbody>
+      <tr><td>小于100万元</td><td>---</td><td>1.00%</td></tr>
+      <tr><td>大于等于100万元，小于500万元</td><td>---</td><td>0.60%</td></tr>
+      <tr><td>大于等于500万元</td><td>---</td><td>每笔1000元</td></tr>
+    </tbody>
+  </table></div>
+</div>
+<div class="boxitem w790">
+  <h4 class="t"><label class="left">赎回费率</label></h4>
+  <div class="box"><table class="w650 comm jjfl">
+    <tbody>
+      <tr><td>---</td><td>小于7天</td><td>1.50%</td></tr>
+      <tr><td>---</td><td>大于等于7天，小于1年</td><td>0.50%</td></tr>
+      <tr><td>---</td><td>大于等于1年</td><td>0.00%</td></tr>
+    </tbody>
+  </table></div>
+</div>
+</body></html>"""
+
+
+def test_fetch_fund_meta():
+    """概况页和费率页解析为元数据"""
+    fetcher = make_fetcher({'jbgk_161725': PROFILE_PAGE, 'jjfl_161725': FEE_PAGE})
+    meta = fetcher.get_fund_meta('161725')
+
+    assert meta.secid == '0.161725'
+    assert meta.name == '招商中证白酒指数(LOF)A'
+    assert meta.fund_type == '指数型-股票'
+    assert meta.tracked_index == '中证白酒指数'
+    assert meta.purchase_fees == ((0.0, 0.01, 0.0), (1e6, 0.006, 0.0), (5e6, 0.0, 1000.0))
+    assert meta.redemption_fees == ((0, 0.015), (7, 0.005), (365, 0.0))
+
+    assert abs(meta.purchase_fee(10100) - 100) < 1e-9
+    assert meta.purchase_fee(6e6) == 1000
+    assert meta.redemption_rate(3) == 0.015
+    assert meta.redemption_rate(30) == 0.005
+
+
+def test_fetch_market_from_quote():
+    """交易所取自行情接口的市场字段，不再按代码规则猜测"""
+    # 上交所 LOF，按代码规则会被判断为深交所
+    ulist = {'rc': 0, 'data': {'total': 1, 'diff': [{'f12': '506000', 'f13': 1, 'f14': '科创板基金'}]}}
+    fetcher = make_fetcher({
+        'jbgk_506000': PROFILE_PAGE, 'jjfl_506000': FEE_PAGE, 'ulist.np/get': json.dumps(ulist)
+    })
+    meta = fetcher.get_fund_meta('506000')
+
+    assert meta.secid == '1.506000'
+    assert any('secids=0.506000,1.506000' in url for url in fetcher.session.calls)
+
+
+def test_fetch_error_pages():
+    """错误状态码或解析不出名称、费率的页面不生成元数据，也不覆盖已有记录"""
+    fetcher = make_fetcher({'jbgk_161725': FakeResponse('Service Unavailable', 503), 'jjfl_161725': FEE_PAGE})
+    assert fetcher.get_fund_meta('161725') is None
+
+    fetcher = make_fetcher({'jbgk_161725': '<html>系统繁忙</html>', 'jjfl_161725': '<html></html>'})
+    assert fetcher.get_fund_meta('161725') is None
+
+    store = FundMetaStore(path=None, max_age_hours=0)
+    good = FundMeta('161725', '0.161725', '招商白酒', redemption_fees=((0, 0.015),))
+    store.put(good)
+    assert store.refresh(['161725'], fetcher.get_fund_meta) == 0
+    assert store.refresh(['161725'], lambda code: FundMeta(code, '0.161725', updated_at=time.time())) == 0
+    assert store.get('161725') is good
+
+
+def test_store_warm_load_and_refresh():
+    """元数据写入 SQLite，重启后整体加载；只刷新缺失或过期的记录"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "fund_meta.db")
+        fetched = []
+
+        def fetch(code):
+            fetched.append(code)
+            return FundMeta(code, f'0.{code}', f'基金{code}', redemption_fees=((0, 0.015),), updated_at=time.time())
+
+        store = FundMetaStore(path=path, max_age_hours=24)
+        assert store.refresh(['163406', '161725'], fetch) == 2
+        assert store.refresh(['163406', '161725'], fetch) == 0
+
+        # 过期记录重新抓取
+        store.put(FundMeta('161725', '0.161725', '基金161725', updated_at=time.time() - 2 * 86400))
+        assert store.stale(['163406', '161725']) == ['161725']
+
+        restored = FundMetaStore(path=path)
+        assert len(restored) == 2
+        assert restored.get('163406').redemption_fees == ((0, 0.015),)
+        assert fetched == ['163406', '161725']
+
+
+def test_hot_path_uses_store():
+    """元数据齐全时 secid 和名称来自内存，行情请求不取名称字段"""
+    store = FundMetaStore(path=None)
+    # 上交所 LOF，按代码规则会被判断为深交所
+    store.put(FundMeta('506000', '1.506000', '科创板基金'))
+
+    ulist = {'rc': 0, 'data': {'total': 1, 'diff': [{'f12': '506000', 'f2': 1.2, 'f5': 100}]}}
+    fetcher = make_fetcher({'ulist.np/get': json.dumps(ulist), 'fund.eastmoney.com': FUND_PAGE})
+    fetcher.fund_meta = store
+
+    quotes = fetcher.get_lof_realtime_prices(['506000'])
+    assert 'secids=1.506000' in fetcher.session.calls[0]
+    assert 'f14' not in fetcher.session.calls[0]
+    assert quotes['506000'].name == '科创板基金'
+
+
+class MetaStubFetcher:
+    """记录元数据抓取的数据获取器"""
+
+    nav_cache = None
+
+    def __init__(self):
+        self.fetched = threading.Event()
+
+    def get_fund_meta(self, code):
+        self.fetched.set()
+        return FundMeta(code, f'0.{code}', f'基金{code}', redemption_fees=((0, 0.015),), updated_at=time.time())
+
+    def get_lof_realtime_prices(self, codes):
+        return QuoteBatch()
+
+
+def test_refresh_starts_with_empty_store():
+    """首次运行（元数据库为空）时后台刷新同样启动"""
+    broker = SimulatedBroker(initial_cash=100000)
+    config = {
+        'watchlist': ['163406'],
+        'nav_cache': {'enabled': False},
+        'fund_meta': {'enabled': True, 'path': None},
+    }
+    strategy = LOFArbitrage(broker, config, simulate=True)
+    strategy.notifier = None
+    strategy.data_fetcher = MetaStubFetcher()
+    assert len(strategy.fund_meta) == 0
+
+    runner = threading.Thread(target=strategy.run, daemon=True)
+    runner.start()
+    try:
+        assert strategy.data_fetcher.fetched.wait(timeout=5)
+    finally:
+        strategy.stop()
+        runner.join(timeout=5)
+    assert strategy.fund_meta.get('163406') is not None
+
+
+if __name__ == "__main__":
+    test_fetch_fund_meta()
+    test_fetch_market_from_quote()
+    test_fetch_error_pages()
+    test_store_warm_load_and_refresh()
+    test_hot_path_uses_store()
+    test_refresh_starts_with_empty_store()
+    print("✅ 基金元数据测试通过")
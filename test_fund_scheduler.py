@@ -0,0 +1,218 @@
+"""
+基金轮询优先级调度测试脚本
+"""
+import random
+import time
+
+from src.api.sim_broker import SimulatedBroker
+from src.strategies.lof_arbitrage import LOFArbitrage
+from src.utils.fund_scheduler import FundScheduler
+from src.utils.scheduler import FixedRateScheduler
+from src.utils.quote import Quote, QuoteBatch
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_scheduler(clock, budget=1.0, **kwargs):
+    return FundScheduler(0.015, 0.01, budget=budget, min_period=1, max_period=600,
+                         default_period=60, clock=clock, **kwargs)
+
+
+def test_near_threshold_polled_more():
+    """接近阈值的基金周期更短，越过阈值的按最短周期"""
+    clock = FakeClock()
+    scheduler = make_scheduler(clock, budget=0.1)
+    scheduler.sync(['near', 'far', 'hot'])
+    assert sorted(scheduler.due()) == ['far', 'hot', 'near']
+
+    # 预算缩放系数在所有基金都有数据后稳定，跑两轮
+    for _ in range(2):
+        scheduler.update('near', 0.014)
+        scheduler.update('far', 0.001)
+        scheduler.update('hot', 0.02)
+
+    periods = scheduler.periods()
+    assert periods['hot'] <= periods['near'] < periods['far']
+
+
+def test_volatility_shortens_period():
+    """溢价波动大的基金周期更短"""
+    clock = FakeClock()
+    scheduler = make_scheduler(clock, budget=0.1)
+    scheduler.sync(['calm', 'jumpy'])
+    for premium in (0.005, 0.005, 0.005):
+        scheduler.update('calm', premium)
+    for premium in (0.005, 0.0, 0.005):
+        scheduler.update('jumpy', premium)
+
+    periods = scheduler.periods()
+    assert periods['jumpy'] < periods['calm']
+
+
+def test_budget():
+    """各基金轮询频率之和等于预算（未触及周期上下限时）"""
+    clock = FakeClock()
+    scheduler = make_scheduler(clock, budget=0.5)
+    codes = [str(i) for i in range(10)]
+    scheduler.sync(codes)
+    premiums = [0.0, 0.002, 0.004, 0.006, 0.008, 0.01, 0.012, -0.002, -0.004, -0.006]
+    for _ in range(2):
+        for code, premium in zip(codes, premiums):
+            scheduler.update(code, premium)
+
+    total = sum(1 / period for period in scheduler.periods().values())
+    assert abs(total - 0.5) / 0.5 < 0.05
+
+
+def test_due_order():
+    """按到期时间取出，未到期的不取出；失败的按默认周期重试"""
+    clock = FakeClock()
+    scheduler = make_scheduler(clock, budget=100)
+    scheduler.sync(['a', 'b'])
+    scheduler.due()
+    scheduler.update('a', 0.02)   # 最短周期 1 秒
+    scheduler.failed('b')         # 60 秒后重试
+
+    assert scheduler.due() == []
+    assert 0 < scheduler.time_until_due() <= 1
+
+    clock.now = 1
+    assert scheduler.due() == ['a']
+    clock.now = 60
+    assert scheduler.due() == ['b']
+
+    # 移出监控列表的基金不再到期
+    scheduler.update('a', 0.02)
+    scheduler.sync(['b'])
+    clock.now = 1000
+    assert scheduler.due() == []
+    assert list(scheduler.periods()) == ['b']
+
+
+def simulate_hour(tick, funds=50, interval=60):
+    """
+    按策略的轮询方式模拟一小时：定频调度器按最早到期的基金唤醒，每个有到期基金的节拍发一次批量请求
+
+    Returns:
+        (批量请求次数, 各基金被轮询的次数)
+    """
+    clock = FakeClock()
+    rng = random.Random(0)
+    codes = [str(160000 + i) for i in range(funds)]
+    premiums = {code: rng.uniform(-0.012, 0.016) for code in codes}
+    scheduler = FundScheduler(0.015, 0.01, budget=funds / interval, min_period=10,
+                              default_period=interval, tick=tick, clock=clock)
+    scheduler.sync(codes)
+    polls = dict.fromkeys(codes, 0)
+    requests = []
+
+    def wait(delay):
+        clock.now += delay
+        return False
+
+    def poll():
+        due = scheduler.due()
+        if not due:
+            return
+        requests.append(clock.now)
+        for code in due:
+            polls[code] += 1
+            premiums[code] += rng.gauss(0, 0.001)
+            scheduler.update(code, premiums[code])
+
+    runner = FixedRateScheduler(interval, name="test", clock=clock, wait=wait,
+                                interval_fn=lambda: min(interval, scheduler.time_until_due()))
+    runner.run(poll, lambda: clock.now < 3600)
+    return len(requests), polls
+
+
+def test_request_budget():
+    """批量请求次数按节拍计：默认与等间隔轮询相同，到期的基金合并到同一次请求"""
+    requests, polls = simulate_hour(tick=60)
+    assert requests <= 61
+    assert sum(polls.values()) <= 50 * 61
+
+    # 每分钟 6 次请求：请求数不超过预算，接近阈值的基金轮询得更频繁
+    requests, polls = simulate_hour(tick=10)
+    assert requests <= 361
+    assert max(polls.values()) > 3 * min(polls.values())
+
+
+class StubFetcher:
+    """返回固定溢价率的数据获取器"""
+
+    nav_cache = None
+
+    def __init__(self, premiums):
+        self.premiums = premiums
+        self.requested = []
+
+    def get_lof_realtime_prices(self, codes):
+        self.requested.append(list(codes))
+        return QuoteBatch.from_quotes(
+            Quote(code, f'基金{code}', 1 + self.premiums[code], 1.0, '2026-01-02',
+                  self.premiums[code], 1000, time.time_ns())
+            for code in codes
+        )
+
+
+def test_strategy_scans_due_funds():
+    """优先级轮询模式每次只扫描到期的基金"""
+    broker = SimulatedBroker(initial_cash=100000)
+    broker.connect()
+    config = {
+        'watchlist': ['163406', '161725'],
+        'nav_cache': {'enabled': False},
+        'fund_meta': {'enabled': False},
+        'priority_scan': {'enabled': True, 'min_period': 10},
+    }
+    strategy = LOFArbitrage(broker, config, simulate=True)
+    strategy.notifier = None
+    strategy.data_fetcher = StubFetcher({'163406': 0.014, '161725': 0.0})
+
+    strategy.scan_opportunities()
+    assert strategy.data_fetcher.requested == [['163406', '161725']]
+
+    # 两只基金都已重新排期，立即再次扫描时没有到期的基金
+    strategy.scan_opportunities()
+    assert len(strategy.data_fetcher.requested) == 1
+    periods = strategy.fund_scheduler.periods()
+    assert periods['163406'] < periods['161725']
+
+
+def test_strategy_hot_tier_default_tick():
+    """未配置请求预算时节拍取 min_period，接近阈值的基金比 interval_seconds 更频繁地轮询"""
+    broker = SimulatedBroker(initial_cash=100000)
+    broker.connect()
+    config = {
+        'watchlist': ['163406', '161725'],
+        'interval_seconds': 60,
+        'nav_cache': {'enabled': False},
+        'fund_meta': {'enabled': False},
+        'priority_scan': {'enabled': True, 'min_period': 10, 'requests_per_minute': None},
+    }
+    strategy = LOFArbitrage(broker, config, simulate=True)
+    strategy.notifier = None
+    strategy.data_fetcher = StubFetcher({'163406': 0.014, '161725': 0.0})
+
+    assert strategy.fund_scheduler.tick == 10
+    strategy.scan_opportunities()
+    periods = strategy.fund_scheduler.periods()
+    assert periods['163406'] < strategy.interval < periods['161725']
+
+
+if __name__ == "__main__":
+    test_near_threshold_polled_more()
+    test_volatility_shortens_period()
+    test_budget()
+    test_due_order()
+    test_request_budget()
+    test_strategy_scans_due_funds()
+    test_strategy_hot_tier_default_tick()
+    print("✅ 基金轮询优先级调度测试通过")
@@ -0,0 +1,96 @@
+"""
+对冲请求测试脚本
+"""
+import time
+
+from src.utils.hedge import Hedger
+
+
+def slow(value, delay):
+    def call():
+        time.sleep(delay)
+        return value
+    return call
+
+
+def test_fast_primary_not_hedged():
+    """主数据源及时返回：不发备用请求"""
+    hedger = Hedger(initial_delay=0.2)
+    secondary_calls = []
+
+    result = hedger.call(slow('em', 0.01), lambda: secondary_calls.append(1) or 'sina', names=('eastmoney', 'sina'))
+
+    assert result == 'em'
+    assert secondary_calls == []
+    assert hedger.stats()['hedged'] == 0
+    assert hedger.stats()['wins'] == {'eastmoney': 1}
+
+
+def test_slow_primary_hedged():
+    """主数据源超过对冲延迟：备用数据源先返回"""
+    hedger = Hedger(initial_delay=0.05)
+
+    start = time.perf_counter()
+    result = hedger.call(slow('em', 0.5), slow('sina', 0.05), names=('eastmoney', 'sina'))
+    elapsed = time.perf_counter() - start
+
+    stats = hedger.stats()
+    print(f"对冲统计: {stats}")
+    assert result == 'sina'
+    assert elapsed < 0.3
+    assert stats['hedged'] == 1
+    assert stats['wins'] == {'sina': 1}
+
+
+def test_invalid_primary_falls_back():
+    """主数据源返回无效结果：立即请求备用数据源"""
+    hedger = Hedger(initial_delay=1.0)
+
+    start = time.perf_counter()
+    result = hedger.call(lambda: {}, slow({'163406': 1}, 0.01))
+    assert result == {'163406': 1}
+    assert time.perf_counter() - start < 0.5
+
+    # 两个数据源都失败
+    def broken():
+        raise ConnectionError("down")
+    assert hedger.call(broken, lambda: None) is None
+    assert hedger.stats()['failures'] == 1
+
+
+def test_delay_follows_p95():
+    """对冲延迟跟随主数据源 p95 延迟"""
+    hedger = Hedger(initial_delay=0.5, min_samples=20, min_delay=0.001)
+    for _ in range(20):
+        hedger.call(slow('em', 0.01), slow('sina', 0.01))
+    time.sleep(0.05)
+
+    delay = hedger.hedge_delay()
+    print(f"对冲延迟: {delay * 1000:.1f} ms")
+    assert 0.005 < delay < 0.1
+
+
+def test_failures_not_sampled():
+    """立即失败的主请求不计入延迟统计，不会把对冲延迟压到下限"""
+    hedger = Hedger(initial_delay=0.5, min_samples=20, min_delay=0.001)
+    for _ in range(20):
+        hedger.call(slow('em', 0.02), slow('sina', 0.02))
+
+    def broken():
+        raise ConnectionError("refused")
+    for _ in range(50):
+        hedger.call(broken, lambda: 'sina')
+        hedger.call(lambda: None, lambda: 'sina')
+    time.sleep(0.05)
+
+    assert len(hedger.primary_latency) == 20
+    assert hedger.hedge_delay() >= 0.015
+
+
+if __name__ == "__main__":
+    test_fast_primary_not_hedged()
+    test_slow_primary_hedged()
+    test_invalid_primary_falls_back()
+    test_delay_follows_p95()
+    test_failures_not_sampled()
+    print("✅ 对冲请求测试通过")
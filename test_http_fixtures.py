@@ -0,0 +1,90 @@
+"""
+HTTP 录制与回放测试脚本
+先对本地替身服务录制一次扫描，再关闭服务离线回放
+"""
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from src.utils.data_fetcher import DataFetcher
+from src.utils.http_fixtures import REPLAY_ENV, FixtureArchive, record_session, replay_session
+from test_async_data_fetcher import StandInHandler, start_server
+
+CODES = ['163406', '161725', '160642']
+
+
+def make_fetcher(base_url: str) -> DataFetcher:
+    fetcher = DataFetcher(source="eastmoney")
+    fetcher.PUSH_HOST = fetcher.FUND_HOST = base_url
+    return fetcher
+
+
+def record_scan(path: str) -> tuple:
+    server = start_server()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        fetcher = make_fetcher(base_url)
+        archive = record_session(fetcher.session, FixtureArchive(path))
+        live = fetcher.get_lof_realtime_prices(CODES)
+        archive.save()
+    finally:
+        server.shutdown()
+    return base_url, live
+
+
+def test_record_and_replay():
+    """回放结果与录制时一致，且不访问网络"""
+    assert StandInHandler.page_delay >= 0.05
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "scan.jsonl.gz")
+        base_url, live = record_scan(path)
+
+        archive = FixtureArchive.load(path)
+        assert len(archive.entries) == 1 + len(CODES)
+        assert all(entry['latency'] > 0 for entry in archive.entries)
+
+        fetcher = make_fetcher(base_url)
+        adapter = replay_session(fetcher.session, path)
+
+        start = time.perf_counter()
+        replayed = fetcher.get_lof_realtime_prices(CODES)
+        fast = time.perf_counter() - start
+
+        assert list(replayed) == list(live)
+        for code in CODES:
+            assert replayed[code].price == live[code].price
+            assert replayed[code].nav == live[code].nav
+        assert adapter.served == len(archive.entries) and adapter.missed == 0
+
+        # 按原始延迟回放：每个基金主页约 0.05 秒
+        fetcher = make_fetcher(base_url)
+        replay_session(fetcher.session, path, latency_scale=1.0)
+        start = time.perf_counter()
+        fetcher.get_lof_realtime_prices(CODES)
+        slow = time.perf_counter() - start
+
+        print(f"回放耗时: 无延迟 {fast:.3f} 秒, 原始延迟 {slow:.3f} 秒")
+        assert slow >= 0.05 * len(CODES) > fast
+
+
+def test_replay_env_and_missing():
+    """环境变量开启回放；档案中没有的请求按网络故障处理"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "scan.jsonl.gz")
+        base_url, _ = record_scan(path)
+
+        os.environ[REPLAY_ENV] = path
+        try:
+            fetcher = make_fetcher(base_url)
+        finally:
+            del os.environ[REPLAY_ENV]
+
+        assert set(fetcher.get_lof_realtime_prices(CODES)) == set(CODES)
+        assert fetcher.get_lof_realtime_prices(['999999']) == {}
+
+
+if __name__ == "__main__":
+    test_record_and_replay()
+    test_replay_env_and_missing()
+    print("✅ HTTP 录制与回放测试通过")
@@ -0,0 +1,120 @@
+"""
+估算净值（IOPV）引擎测试脚本
+"""
+from datetime import datetime
+
+import numpy as np
+
+from src.api.sim_broker import SimulatedBroker
+from src.strategies.lof_arbitrage import LOFArbitrage
+from src.utils.iopv import IOPVEngine
+from src.utils.quote import Quote, QuoteBatch
+from src.utils.trading_calendar import CST, TradingCalendar
+
+
+HOLDINGS = {
+    '161725': {
+        'position': 0.9,
+        'weights': {'1.600519': 0.3, '0.000858': 0.3},
+    },
+    '163406': {
+        'weights': {'1.600519': 0.1, '1.601318': 0.5},
+    },
+}
+
+
+def test_iopv_estimate():
+    """估算净值 = 基准净值 × (1 + Σ 权重 × 涨跌幅)"""
+    engine = IOPVEngine(HOLDINGS)
+    engine.set_base_navs({'161725': 1.0, '163406': 2.0})
+
+    changed = engine.update_quotes({
+        '1.600519': {'price': 110.0, 'prev_close': 100.0},  # +10%
+        '0.000858': {'price': 95.0, 'prev_close': 100.0},   # -5%
+        '1.601318': {'price': 50.0, 'prev_close': 50.0},    # 平
+    })
+    assert sorted(changed) == ['161725', '163406']
+
+    # 161725 只配置了 60% 的权重，按 90% 仓位放大为各 45%
+    assert abs(engine.estimate('161725') - 1.0 * (1 + 0.45 * 0.10 - 0.45 * 0.05)) < 1e-12
+    assert abs(engine.estimate('163406') - 2.0 * (1 + 0.1 * 0.10)) < 1e-12
+    assert engine.estimate('160642') is None
+
+
+def test_iopv_incremental_matches_full():
+    """增量更新与全量重算结果一致，且只影响持有该成分股的基金"""
+    engine = IOPVEngine(HOLDINGS)
+    engine.set_base_navs({'161725': 1.0, '163406': 2.0})
+
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        secid = rng.choice(engine.secids)
+        engine.update_quotes({secid: {'price': 100 * (1 + rng.normal(0, 0.01)), 'prev_close': 100.0}})
+
+    incremental = engine.estimates()
+    engine.recompute()
+    full = engine.estimates()
+    for code in full:
+        assert abs(incremental[code] - full[code]) < 1e-12
+
+    # 价格不变时不触发重算
+    assert engine.update_quotes({'0.000858': {'price': 101.0, 'prev_close': 100.0}}) == ['161725']
+    assert engine.update_quotes({'0.000858': {'price': 101.0, 'prev_close': 100.0}}) == []
+
+
+def test_iopv_periodic_recompute():
+    """每 recompute_every 次增量更新和基准净值变化时全量重算"""
+    engine = IOPVEngine(HOLDINGS, recompute_every=3)
+    engine.set_base_navs({'161725': 1.0})
+    for i in range(2):
+        engine.update_quotes({'1.600519': {'price': 101.0 + i, 'prev_close': 100.0}})
+    assert engine._updates_since_recompute == 2
+    engine.update_quotes({'1.600519': {'price': 105.0, 'prev_close': 100.0}})
+    assert engine._updates_since_recompute == 0
+
+    engine.update_quotes({'1.600519': {'price': 106.0, 'prev_close': 100.0}})
+    engine.set_base_navs({'161725': 1.0})   # 基准未变
+    assert engine._updates_since_recompute == 1
+    engine.set_base_navs({'161725': 1.01})
+    assert engine._updates_since_recompute == 0
+    assert abs(engine.estimate('161725') - 1.01 * (1 + 0.45 * 0.06)) < 1e-12
+
+
+class StubFetcher:
+    nav_cache = None
+
+    def get_security_quotes(self, secids):
+        return {secid: {'price': 110.0, 'prev_close': 100.0} for secid in secids}
+
+
+def test_strategy_iopv_base_date():
+    """只有上一交易日的净值作为估算基准；当日已公布或滞后的净值不估算"""
+    broker = SimulatedBroker(initial_cash=100000)
+    config = {'watchlist': [], 'nav_cache': {'enabled': False}, 'fund_meta': {'enabled': False}}
+    strategy = LOFArbitrage(broker, config, simulate=True)
+    strategy.iopv = IOPVEngine(HOLDINGS)
+    strategy.calendar = TradingCalendar()
+    strategy.data_fetcher = StubFetcher()
+
+    today = datetime.now(CST).date()
+    base = strategy.calendar.previous_trading_day(today)
+    stale = strategy.calendar.previous_trading_day(base)
+    quotes = QuoteBatch.from_quotes([
+        Quote('161725', '', 1.1, 1.0, base.isoformat(), 0.1, 100, 0),
+        Quote('163406', '', 2.2, 2.0, today.isoformat(), 0.1, 100, 0),
+    ])
+    strategy.apply_iopv(quotes)
+    assert abs(quotes['161725'].iopv - (1 + 0.45 * 0.1 + 0.45 * 0.1)) < 1e-12
+    assert quotes['163406'].iopv is None
+
+    lagged = QuoteBatch.from_quotes([Quote('163406', '', 2.2, 2.0, stale.isoformat(), 0.1, 100, 0)])
+    strategy.apply_iopv(lagged)
+    assert lagged['163406'].iopv is None
+
+
+if __name__ == "__main__":
+    test_iopv_estimate()
+    test_iopv_incremental_matches_full()
+    test_iopv_periodic_recompute()
+    test_strategy_iopv_base_date()
+    print("✅ 估算净值引擎测试通过")
@@ -0,0 +1,116 @@
+"""
+耗时统计测试脚本
+"""
+import time
+
+from src.api.sim_broker import SimulatedBroker
+from src.strategies.lof_arbitrage import LOFArbitrage
+from src.utils.metrics import Histogram, Metrics, metrics
+from src.utils.quote import Quote, QuoteBatch
+
+
+def test_histogram_percentiles():
+    """分桶误差在子桶精度以内"""
+    histogram = Histogram()
+    for ms in range(1, 1001):
+        histogram.record(ms / 1000)
+
+    assert histogram.count == 1000
+    assert abs(histogram.percentile(50) - 0.5) / 0.5 < 0.07
+    assert abs(histogram.percentile(99) - 0.99) / 0.99 < 0.07
+    assert histogram.percentile(100) == 1.0
+    assert histogram.snapshot()['max'] == 1.0
+
+    # 小于 32µs 的值精确计数
+    small = Histogram()
+    small.record(5e-6)
+    assert small.percentile(50) == 5e-6
+    assert Histogram().percentile(50) == 0.0
+
+
+def test_histogram_cumulative():
+    """按固定上界导出的累计计数"""
+    histogram = Histogram()
+    for seconds in (0.001, 0.001, 0.01, 0.1):
+        histogram.record(seconds)
+
+    assert histogram.cumulative([0.0005, 0.005, 0.05, 0.5]) == [0, 2, 3, 4]
+    assert histogram.cumulative([]) == []
+
+
+def test_span_and_slowest():
+    """span 记录阶段耗时，end_cycle 返回本轮最慢的基金并清空"""
+    registry = Metrics(slowest_n=2)
+    with registry.span('fetch.nav_page'):
+        time.sleep(0.01)
+
+    snapshot = registry.snapshot()['fetch.nav_page']
+    assert snapshot['count'] == 1
+    assert 0.009 < snapshot['max'] < 0.1
+
+    registry.fund('163406', 0.3)
+    registry.fund('161725', 0.1)
+    registry.fund('160000', 0.2)
+    registry.fund('161725', 0.15)
+    assert registry.end_cycle() == [('163406', 0.3), ('161725', 0.25)]
+    assert '163406' in registry.report()
+    assert registry.end_cycle() == []
+
+
+def test_disabled():
+    """关闭后不记录"""
+    registry = Metrics(enabled=False)
+    with registry.span('scan.total'):
+        pass
+    registry.fund('163406', 1.0)
+    assert registry.snapshot() == {}
+    assert registry.end_cycle() == []
+
+
+class StubFetcher:
+    """返回固定行情的数据获取器"""
+
+    nav_cache = None
+
+    def get_lof_realtime_prices(self, codes):
+        return QuoteBatch.from_quotes(
+            Quote(code, f'基金{code}', 1.05, 1.0, '2026-01-02', 0.05, 1000, time.time_ns())
+            for code in codes
+        )
+
+
+def test_scan_stages():
+    """一轮扫描记录各阶段耗时和每只基金的耗时"""
+    metrics.reset()
+    broker = SimulatedBroker(initial_cash=100000)
+    broker.connect()
+    config = {
+        'watchlist': ['163406', '161725'],
+        'nav_cache': {'enabled': False},
+        'fund_meta': {'enabled': False},
+    }
+    strategy = LOFArbitrage(broker, config, simulate=True)
+    strategy.notifier = None
+    strategy.data_fetcher = StubFetcher()
+
+    strategy.scan_opportunities()
+
+    snapshot = metrics.snapshot()
+    for stage in ('scan.total', 'scan.codes', 'scan.quotes'):
+        assert snapshot[stage]['count'] == 1, stage
+    # 两只基金都超过溢价阈值，余额只查询一次券商（第二次来自账户状态缓存）
+    assert snapshot['scan.evaluate']['count'] == 1
+    assert snapshot['scan.dispatch']['count'] == 2
+    assert snapshot['broker.get_balance']['count'] == 1
+    assert {code for code, _ in metrics.last_slowest} == {'163406', '161725'}
+    assert len(strategy.opportunities) == 2
+    metrics.reset()
+
+
+if __name__ == "__main__":
+    test_histogram_percentiles()
+    test_histogram_cumulative()
+    test_span_and_slowest()
+    test_disabled()
+    test_scan_stages()
+    print("✅ 耗时统计测试通过")
@@ -0,0 +1,85 @@
+"""
+指标接口测试脚本
+"""
+import requests
+
+from src.utils.metrics import Metrics
+from src.utils.metrics_server import MetricsServer, render
+from src.utils.notifier import NotificationManager, NotifierBase
+
+
+def test_render():
+    """直方图、计数器和采集项按 Prometheus 文本格式输出"""
+    registry = Metrics()
+    registry.observe('scan.total', 0.3)
+    registry.observe('scan.total', 2.0)
+    registry.inc('scans')
+    registry.inc('http_requests', {'host': 'push2.eastmoney.com', 'status': '200'})
+    registry.inc('http_requests', {'host': 'push2.eastmoney.com', 'status': '200'})
+    registry.inc('http_requests', {'host': 'fund.eastmoney.com', 'status': 'error'})
+    registry.register('queue_depth', lambda: [({'host': 'fund.eastmoney.com'}, 3)])
+    registry.register('cache_lookups', lambda: [({'result': 'hit'}, 5)], kind='counter')
+
+    text = render(registry)
+    lines = text.splitlines()
+
+    assert '# TYPE arbitrage_stage_duration_seconds histogram' in lines
+    assert 'arbitrage_stage_duration_seconds_bucket{stage="scan.total",le="0.25"} 0' in lines
+    assert 'arbitrage_stage_duration_seconds_bucket{stage="scan.total",le="0.5"} 1' in lines
+    assert 'arbitrage_stage_duration_seconds_bucket{stage="scan.total",le="+Inf"} 2' in lines
+    assert 'arbitrage_stage_duration_seconds_count{stage="scan.total"} 2' in lines
+    assert 'arbitrage_scans_total 1' in lines
+    assert 'arbitrage_http_requests_total{host="push2.eastmoney.com",status="200"} 2' in lines
+    assert 'arbitrage_http_requests_total{host="fund.eastmoney.com",status="error"} 1' in lines
+    assert 'arbitrage_queue_depth{host="fund.eastmoney.com"} 3' in lines
+    # 采集的计数器同样以 _total 结尾
+    assert '# TYPE arbitrage_cache_lookups_total counter' in lines
+    assert 'arbitrage_cache_lookups_total{result="hit"} 5' in lines
+
+
+class FailingNotifier(NotifierBase):
+    def send(self, title: str, message: str, **kwargs) -> bool:
+        raise RuntimeError("网络错误")
+
+
+def test_notification_counts():
+    """通知按渠道记录发送成功和丢弃"""
+    from src.utils.metrics import metrics
+
+    metrics.reset()
+    manager = NotificationManager({'enabled': False})
+    manager.notifiers = [FailingNotifier()]
+    manager.send("标题", "内容")
+
+    manager.send("标题", "内容")
+
+    counters = metrics.collect()[1]
+    assert counters[('notifications', (('channel', 'FailingNotifier'), ('result', 'dropped')))] == 2
+    assert 'arbitrage_notifications_total{channel="FailingNotifier",result="dropped"} 2' in render(metrics)
+    metrics.reset()
+    assert ('notifications', (('channel', 'FailingNotifier'), ('result', 'dropped'))) not in metrics.collect()[1]
+
+
+def test_server():
+    """后台线程提供 /metrics，其他路径返回 404"""
+    registry = Metrics()
+    registry.inc('scans', value=3)
+    server = MetricsServer(port=0, registry=registry).start()
+    try:
+        host, port = server.address
+        resp = requests.get(f"http://{host}:{port}/metrics", timeout=5)
+        assert resp.status_code == 200
+        assert resp.headers['Content-Type'].startswith('text/plain')
+        assert 'arbitrage_scans_total 3' in resp.text
+        assert 'arbitrage_threads ' in resp.text
+
+        assert requests.get(f"http://{host}:{port}/", timeout=5).status_code == 404
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    test_render()
+    test_notification_counts()
+    test_server()
+    print("✅ 指标接口测试通过")
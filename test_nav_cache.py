@@ -0,0 +1,120 @@
+"""
+净值缓存测试脚本
+"""
+import os
+import tempfile
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+from src.utils.nav_cache import NavCache
+from src.utils.trading_calendar import CST, TradingCalendar
+
+
+def ts(text: str) -> float:
+    """'2026-02-13 10:00'（北京时间） -> 时间戳"""
+    return datetime.strptime(text, '%Y-%m-%d %H:%M').replace(tzinfo=CST).timestamp()
+
+
+def test_nav_cache_refresh_window():
+    """交易时段内命中缓存，晚间公布窗口内按间隔重新检查"""
+    cache = NavCache(path=None, publish_hour=18, recheck_minutes=30)
+
+    # 2026-02-13 是周五，上午抓到 2 月 12 日的净值
+    cache.put('163406', 2.203, '2026-02-12', now=ts('2026-02-13 09:35'))
+
+    # 当天白天：不会有新净值
+    assert cache.get('163406', now=ts('2026-02-13 14:50')) == (2.203, '2026-02-12')
+
+    # 18:00 之后：需要重新抓取
+    assert cache.get('163406', now=ts('2026-02-13 18:05')) is None
+
+    # 公布窗口内抓到的仍是旧净值，30 分钟内不再重复抓取
+    cache.put('163406', 2.203, '2026-02-12', now=ts('2026-02-13 18:06'))
+    assert cache.get('163406', now=ts('2026-02-13 18:20')) is not None
+    assert cache.get('163406', now=ts('2026-02-13 18:40')) is None
+
+    # 拿到当日净值后，整个周末都有效
+    cache.put('163406', 2.215, '2026-02-13', now=ts('2026-02-13 19:10'))
+    assert cache.get('163406', now=ts('2026-02-14 10:00')) == (2.215, '2026-02-13')
+    assert cache.get('163406', now=ts('2026-02-16 09:30')) == (2.215, '2026-02-13')
+
+    # 周一晚间再次需要刷新
+    assert cache.get('163406', now=ts('2026-02-16 18:30')) is None
+
+    stats = cache.stats()
+    print(f"缓存统计: {stats}")
+    assert stats['hits'] == 4
+    assert stats['misses'] == 3
+
+
+def test_nav_cache_late_publish():
+    """午夜前没拿到当日净值时，次日继续按间隔检查"""
+    cache = NavCache(path=None, publish_hour=18, recheck_minutes=30)
+    cache.put('163406', 2.203, '2026-02-12', now=ts('2026-02-13 23:50'))
+
+    assert cache.get('163406', now=ts('2026-02-14 00:10')) is not None
+    assert cache.get('163406', now=ts('2026-02-14 09:00')) is None
+
+    cache.put('163406', 2.215, '2026-02-13', now=ts('2026-02-14 09:00'))
+    assert cache.get('163406', now=ts('2026-02-15 12:00')) == (2.215, '2026-02-13')
+
+
+def test_nav_cache_holidays_and_lag():
+    """休市日不公布净值；QDII 基金的净值晚一个交易日公布"""
+    # 2026-02-16 ~ 2026-02-20 春节休市
+    holidays = [date(2026, 2, day) for day in range(16, 21)]
+    cache = NavCache(
+        path=None, publish_hour=18, recheck_minutes=30,
+        calendar=TradingCalendar(holidays), publish_lags={'160215': 1}
+    )
+
+    cache.put('163406', 2.215, '2026-02-13', now=ts('2026-02-13 19:10'))
+    assert cache.get('163406', now=ts('2026-02-16 18:30')) == (2.215, '2026-02-13')
+    assert cache.get('163406', now=ts('2026-02-20 21:00')) == (2.215, '2026-02-13')
+    assert cache.get('163406', now=ts('2026-02-23 18:30')) is None
+
+    # 周五晚上拿到周四的净值即为最新，不再反复检查
+    cache.put('160215', 1.532, '2026-02-12', now=ts('2026-02-13 18:10'))
+    assert cache.get('160215', now=ts('2026-02-13 23:00')) == (1.532, '2026-02-12')
+    assert cache.get('160215', now=ts('2026-02-16 10:00')) == (1.532, '2026-02-12')
+    # 节后第一个交易日晚间应有周五的净值
+    assert cache.get('160215', now=ts('2026-02-23 18:30')) is None
+
+
+def test_nav_cache_persistence():
+    """缓存写入磁盘，重启后直接命中"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "nav_cache.json"
+
+        cache = NavCache(path=str(path))
+        cache.put('161725', 1.085, '2026-02-13', now=ts('2026-02-13 20:00'))
+        cache.save()
+
+        restored = NavCache(path=str(path))
+        assert restored.peek('161725') == (1.085, '2026-02-13')
+        assert restored.get('161725', now=ts('2026-02-16 10:00')) == (1.085, '2026-02-13')
+
+
+def test_nav_cache_utc_server():
+    """服务器时区为 UTC 时公布窗口仍按北京时间判断"""
+    original = os.environ.get('TZ')
+    os.environ['TZ'] = 'UTC'
+    time.tzset()
+    try:
+        test_nav_cache_refresh_window()
+    finally:
+        if original is None:
+            del os.environ['TZ']
+        else:
+            os.environ['TZ'] = original
+        time.tzset()
+
+
+if __name__ == "__main__":
+    test_nav_cache_refresh_window()
+    test_nav_cache_late_publish()
+    test_nav_cache_holidays_and_lag()
+    test_nav_cache_persistence()
+    test_nav_cache_utc_server()
+    print("✅ 净值缓存测试通过")
@@ -0,0 +1,42 @@
+"""
+净值解析测试脚本
+校验快速路径与 BeautifulSoup 解析结果一致
+"""
+from pathlib import Path
+
+from src.utils.nav_parser import extract_nav_bs4, extract_nav_fast, parse_nav
+
+PAGES_DIR = Path(__file__).parent / "benchmarks" / "pages"
+
+
+def test_fast_matches_bs4():
+    """保存的基金主页：两条路径输出相同的净值和日期"""
+    pages = sorted(PAGES_DIR.glob("*.html"))
+    assert pages
+
+    for path in pages:
+        page = path.read_text(encoding='utf-8')
+        fast = extract_nav_fast(page)
+        print(f"{path.name}: {fast}")
+        assert fast is not None
+        assert fast == extract_nav_bs4(page)
+
+
+def test_fallback_to_bs4():
+    """快速路径无法定位区块时回退到 BeautifulSoup"""
+    page = '<div class=dataOfFund><p>单位净值(2026-02-13)1.2340+0.10%</p></div>'
+
+    assert extract_nav_fast(page) is None
+    assert parse_nav(page) == (1.234, '2026-02-13')
+
+
+def test_missing_block():
+    """页面中没有净值区块"""
+    assert parse_nav('<html><body><div class="other">单位净值</div></body></html>') is None
+
+
+if __name__ == "__main__":
+    test_fast_matches_bs4()
+    test_fallback_to_bs4()
+    test_missing_block()
+    print("✅ 净值解析测试通过")
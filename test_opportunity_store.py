@@ -0,0 +1,101 @@
+"""
+套利机会存储测试脚本
+"""
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from src.utils.opportunity_store import OpportunityStore
+from src.utils.quote import Opportunity
+
+
+def make_opportunity(code, timestamp_ns, opportunity_type='premium'):
+    return Opportunity(opportunity_type, code, f'基金{code}', 1.05, 1.0, 0.05, 10000, timestamp_ns)
+
+
+def test_ring_buffer():
+    """内存只保留最近 capacity 条"""
+    store = OpportunityStore(capacity=3)
+    for i in range(5):
+        store.append(make_opportunity('163406', i))
+
+    assert len(store) == 3
+    assert [opp.timestamp_ns for opp in store.recent()] == [2, 3, 4]
+    assert [opp.timestamp_ns for opp in store.recent(2)] == [3, 4]
+    assert [opp.timestamp_ns for opp in store] == [2, 3, 4]
+
+    # 未配置 path 时只查询内存
+    assert [opp.timestamp_ns for opp in store.query(since_ns=3)] == [3, 4]
+    assert store.count() == 3
+
+    store.clear()
+    assert store.recent() == []
+
+
+def test_spill_and_query():
+    """全部历史写入 SQLite，按代码和时间范围查询"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "opportunities.db"
+        store = OpportunityStore(path=str(path), capacity=2)
+        for i in range(6):
+            store.append(make_opportunity('163406' if i % 2 else '161725', i * 1000, 'discount' if i == 3 else 'premium'))
+
+        assert len(store) == 2
+        assert store.count() == 6
+        assert store.count('163406') == 3
+
+        history = store.query(code='163406')
+        assert [opp.timestamp_ns for opp in history] == [1000, 3000, 5000]
+        assert history[1] == make_opportunity('163406', 3000, 'discount')
+
+        assert [opp.timestamp_ns for opp in store.query(since_ns=2000, until_ns=5000)] == [2000, 3000, 4000]
+        assert [opp.timestamp_ns for opp in store.query(limit=2)] == [4000, 5000]
+        assert [opp.code for opp in store.query(code='163406', since_ns=4000)] == ['163406']
+        store.close()
+
+        # 重新打开后历史仍在，内存从空开始
+        reopened = OpportunityStore(path=str(path))
+        assert len(reopened) == 0
+        assert reopened.count() == 6
+        reopened.close()
+
+
+def disk_rows(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM opportunities").fetchone()[0]
+    except sqlite3.OperationalError:
+        return 0
+    finally:
+        conn.close()
+
+
+def test_batched_spill():
+    """append 不写磁盘：后台线程按批写入，close 时写入剩余记录"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "opportunities.db"
+        store = OpportunityStore(path=str(path), flush_interval=60, batch_size=5)
+        for i in range(3):
+            store.append(make_opportunity('163406', i))
+        assert disk_rows(path) == 0
+
+        # 待写记录达到 batch_size 时唤醒后台线程写入
+        for i in range(3, 5):
+            store.append(make_opportunity('163406', i))
+        deadline = time.monotonic() + 5
+        while disk_rows(path) < 5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert disk_rows(path) == 5
+
+        store.append(make_opportunity('161725', 5))
+        assert disk_rows(path) == 5
+        store.close()
+        assert disk_rows(path) == 6
+
+
+if __name__ == "__main__":
+    test_ring_buffer()
+    test_spill_and_query()
+    test_batched_spill()
+    print("✅ 套利机会存储测试通过")
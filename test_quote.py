@@ -0,0 +1,106 @@
+"""
+行情记录类型测试脚本
+"""
+import io
+import time
+from contextlib import redirect_stdout
+
+import pytest
+
+from src.api.sim_broker import SimulatedBroker
+from src.strategies.lof_arbitrage import LOFArbitrage
+from src.utils.dashboard import Dashboard, ProgressTracker
+from src.utils.quote import Opportunity, Quote, QuoteBatch
+from test_data_fetcher import FUND_PAGE, FakeSession, make_ulist
+
+
+def make_quote(code: str, price: float, nav: float = 2.0) -> Quote:
+    return Quote(code, f'基金{code}', price, nav, '2026-02-13', (price - nav) / nav, 100, time.time_ns())
+
+
+def test_quote_record():
+    """Quote 不可变、没有 __dict__，同时兼容 dict 方式读取"""
+    quote = make_quote('163406', 2.1)
+
+    assert quote['price'] == quote.price == 2.1
+    assert quote.get('iopv') is None
+    assert quote.get('missing', 0) == 0
+    with pytest.raises(KeyError):
+        quote['missing']
+    with pytest.raises(AttributeError):
+        quote.price = 2.2
+    assert not hasattr(quote, '__dict__')
+
+    data = quote.to_dict()
+    assert data['code'] == '163406' and data['time'].startswith(quote.time.strftime('%Y-%m-%d'))
+
+
+def test_quote_batch():
+    """QuoteBatch 按输入顺序保存，取出的 Quote 与原记录一致"""
+    quotes = [make_quote('163406', 2.1), make_quote('161725', 1.9), make_quote('160642', 2.0)]
+    batch = QuoteBatch.from_quotes(quotes)
+
+    assert list(batch) == ['163406', '161725', '160642']
+    assert batch['161725'] == quotes[1]
+    assert '999999' not in batch and batch.get('999999') is None
+    assert QuoteBatch() == {}
+
+    # 估算净值按整列写入，溢价率随之重算
+    batch.set_iopv({'163406': 2.05, '999999': 1.0})
+    assert batch['163406'].iopv == 2.05
+    assert abs(batch['163406'].premium_rate - (2.1 - 2.05) / 2.05) < 1e-12
+    assert batch['161725'].iopv is None
+
+
+def test_strategy_consumes_quotes():
+    """策略直接使用 Quote 检查机会，记录为 Opportunity"""
+    config = {
+        'min_premium_rate': 0.01,
+        'min_discount_rate': 0.01,
+        'watchlist': ['163406', '161725'],
+        'nav_cache': {'enabled': False},
+    }
+    broker = SimulatedBroker(initial_cash=100000)
+    strategy = LOFArbitrage(broker, config, simulate=True)
+    strategy.notifier = None
+    strategy.data_fetcher.session = FakeSession({
+        'ulist.np/get': make_ulist(['163406', '161725']),
+        'fund.eastmoney.com': FUND_PAGE,
+    })
+
+    strategy.scan_opportunities()
+
+    opportunities = strategy.get_opportunities()
+    assert [opp.code for opp in opportunities] == ['163406', '161725']
+    assert all(isinstance(opp, Opportunity) and opp['type'] == 'premium' for opp in opportunities)
+    assert opportunities[0].amount == 20000
+
+
+def test_dashboard_quotes():
+    """看板刷新时显示行情，按溢价率绝对值排序"""
+    dashboard = Dashboard(ProgressTracker(), quote_limit=2)
+    dashboard._clear_screen = lambda: None
+
+    def render():
+        out = io.StringIO()
+        with redirect_stdout(out):
+            dashboard.show()
+        return out.getvalue()
+
+    assert 'LOF 行情' not in render()
+
+    dashboard.update_quotes(QuoteBatch.from_quotes([
+        make_quote('163406', 2.02), make_quote('161725', 1.8), make_quote('160642', 2.1),
+    ]))
+    out = render()
+    assert '共 3 只' in out
+    assert out.index('161725') < out.index('160642')
+    assert '163406' not in out
+
+
+if __name__ == "__main__":
+    test_quote_record()
+    test_quote_batch()
+    test_strategy_consumes_quotes()
+    test_dashboard_quotes()
+    print("✅ 行情记录类型测试通过")
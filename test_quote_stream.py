@@ -0,0 +1,89 @@
+"""
+行情推送测试脚本
+使用本地 SSE 回放服务，不访问真实接口
+"""
+import threading
+
+from src.utils.quote_stream import QuoteStream, SSEReplayServer, StreamError
+
+MESSAGES = [
+    # 全量快照
+    {'rc': 0, 'data': {'total': 2, 'diff': {
+        '0': {'f12': '163406', 'f14': '兴全合润', 'f2': 2.258, 'f5': 100},
+        '1': {'f12': '161725', 'f14': '招商白酒', 'f2': 1.100, 'f5': 50},
+    }}},
+    # 增量：只推送变化的字段
+    {'rc': 0, 'data': {'diff': {'1': {'f2': 1.105}}}},
+    {'rc': 0, 'data': {'diff': {'0': {'f2': 2.260, 'f5': 120}}}},
+]
+
+
+def test_stream_merges_diffs():
+    """快照 + 增量合并为完整行情"""
+    server = SSEReplayServer(MESSAGES).start()
+    stream = QuoteStream(['163406', '161725'], push_host=server.url, max_failures=0)
+
+    quotes = []
+    for quote in stream:
+        quotes.append(quote)
+        if len(quotes) == 4:
+            stream.stop()
+    server.stop()
+
+    print(f"收到行情: {quotes}")
+    assert quotes[2] == {'code': '161725', 'name': '招商白酒', 'price': 1.105, 'volume': 50}
+    assert quotes[3] == {'code': '163406', 'name': '兴全合润', 'price': 2.26, 'volume': 120}
+
+
+def test_stream_reconnects():
+    """服务端断开后自动重连"""
+    server = SSEReplayServer(MESSAGES, disconnect_after=1).start()
+    stream = QuoteStream(['163406', '161725'], push_host=server.url, initial_backoff=0.01)
+
+    received = 0
+    for _ in stream:
+        received += 1
+        if received == 6:
+            stream.stop()
+    server.stop()
+
+    assert server.connections >= 3
+    assert stream.reconnects >= 2
+
+
+def test_stream_gives_up():
+    """连续失败超过上限时抛出 StreamError，由调用方回退到轮询"""
+    server = SSEReplayServer([], disconnect_after=0).start()
+    stream = QuoteStream(['163406'], push_host=server.url, initial_backoff=0.01, max_failures=2)
+
+    try:
+        for _ in stream:
+            pass
+        raise AssertionError("应当抛出 StreamError")
+    except StreamError as e:
+        print(f"推送失败: {e}")
+    finally:
+        server.stop()
+
+    assert server.connections == 3
+
+
+def test_stream_stop_from_other_thread():
+    """其他线程调用 stop() 可以结束订阅"""
+    server = SSEReplayServer(MESSAGES, interval=0.05).start()
+    stream = QuoteStream(['163406', '161725'], push_host=server.url, initial_backoff=0.01)
+
+    timer = threading.Timer(0.3, stream.stop)
+    timer.start()
+    count = sum(1 for _ in stream)
+    server.stop()
+
+    assert count >= 2
+
+
+if __name__ == "__main__":
+    test_stream_merges_diffs()
+    test_stream_reconnects()
+    test_stream_gives_up()
+    test_stream_stop_from_other_thread()
+    print("✅ 行情推送测试通过")
@@ -0,0 +1,138 @@
+"""
+请求限速测试脚本
+"""
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from src.utils.rate_limiter import (
+    PRIORITY_BACKGROUND, PRIORITY_CRITICAL, PRIORITY_HEADER, RequestGovernor, TokenBucket
+)
+from src.utils.transport import ResilientAdapter
+
+
+def test_token_bucket():
+    """突发额度用完后按速率补充令牌"""
+    now = [0.0]
+    bucket = TokenBucket(rate=2, burst=3, clock=lambda: now[0])
+
+    assert all(bucket.try_take() for _ in range(3))
+    assert not bucket.try_take()
+    assert abs(bucket.time_to_token() - 0.5) < 1e-9
+
+    now[0] = 0.5
+    assert bucket.try_take()
+    assert not bucket.try_take()
+
+
+def test_governor_rate():
+    """超过突发额度的请求排队，总耗时由速率决定"""
+    governor = RequestGovernor(rate=50, burst=5)
+
+    start = time.perf_counter()
+    for _ in range(15):
+        governor.acquire('push2.eastmoney.com')
+    elapsed = time.perf_counter() - start
+
+    # 前 5 个立即放行，其余 10 个按 50/秒 放行
+    assert 0.15 < elapsed < 0.5
+    stats = governor.stats()['push2.eastmoney.com']['normal']
+    assert stats['requests'] == 15
+    assert stats['wait_max'] > 0
+
+
+def test_governor_priority():
+    """排队时高优先级先放行，即使到达更晚"""
+    governor = RequestGovernor(rate=5, burst=1)
+    governor.acquire('fund.eastmoney.com')  # 用掉突发额度
+
+    order = []
+
+    def worker(priority):
+        governor.acquire('fund.eastmoney.com', priority)
+        order.append(priority)
+
+    threads = [threading.Thread(target=worker, args=(PRIORITY_BACKGROUND,)) for _ in range(2)]
+    for t in threads:
+        t.start()
+    time.sleep(0.05)
+    critical = threading.Thread(target=worker, args=(PRIORITY_CRITICAL,))
+    critical.start()
+
+    for t in threads + [critical]:
+        t.join(timeout=5)
+
+    assert order == [PRIORITY_CRITICAL, PRIORITY_BACKGROUND, PRIORITY_BACKGROUND]
+
+
+class HeaderHandler(BaseHTTPRequestHandler):
+    """记录收到的请求头"""
+
+    headers_seen = []
+
+    def do_GET(self):
+        HeaderHandler.headers_seen.append(dict(self.headers))
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_adapter_uses_governor():
+    """适配器按请求头中的优先级排队，优先级请求头不发送到服务端"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), HeaderHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host = f"127.0.0.1:{server.server_address[1]}"
+
+    governor = RequestGovernor(rate=100, burst=10)
+    session = requests.Session()
+    session.mount('http://', ResilientAdapter(governor=governor))
+
+    try:
+        session.get(f"http://{host}/", headers={PRIORITY_HEADER: PRIORITY_CRITICAL}, timeout=2)
+        session.get(f"http://{host}/", timeout=2)
+    finally:
+        server.shutdown()
+
+    assert all(PRIORITY_HEADER not in headers for headers in HeaderHandler.headers_seen)
+    assert set(governor.stats()[host]) == {'critical', 'normal'}
+
+
+def test_acquire_async():
+    """协程排队按优先级放行，被取消的协程移出等待队列"""
+    governor = RequestGovernor(rate=20, burst=1)
+    order = []
+
+    async def request(name, priority):
+        await governor.acquire_async('example.com', priority)
+        order.append(name)
+
+    async def run():
+        await governor.acquire_async('example.com')  # 用掉突发额度
+        background = asyncio.create_task(request('background', PRIORITY_BACKGROUND))
+        await asyncio.sleep(0)
+        cancelled = asyncio.create_task(request('cancelled', PRIORITY_CRITICAL))
+        await asyncio.sleep(0)
+        critical = asyncio.create_task(request('critical', PRIORITY_CRITICAL))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.gather(background, critical, return_exceptions=True)
+
+    asyncio.run(run())
+    assert order == ['critical', 'background']
+    assert governor.queue_depths() == {'example.com': 0}
+
+
+if __name__ == "__main__":
+    test_token_bucket()
+    test_governor_rate()
+    test_governor_priority()
+    test_adapter_uses_governor()
+    test_acquire_async()
+    print("✅ 请求限速测试通过")
@@ -0,0 +1,109 @@
+"""
+定频调度测试脚本
+"""
+import threading
+import time
+
+from src.utils.scheduler import FixedRateScheduler
+
+
+class FakeClock:
+    """可手动推进的时钟，wait 直接推进时间"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def wait(self, seconds):
+        self.now += seconds
+        return False
+
+
+def test_fixed_rate():
+    """周期不随任务耗时漂移"""
+    clock = FakeClock()
+    scheduler = FixedRateScheduler(10, clock=clock, wait=clock.wait)
+    starts = []
+
+    def task():
+        starts.append(clock.now)
+        clock.now += 3  # 每次耗时 3 秒
+
+    scheduler.run(task, lambda: len(starts) < 4)
+
+    assert starts == [0, 10, 20, 30]
+    assert scheduler.stats()['overruns'] == 0
+
+
+def test_overrun_skips_ticks():
+    """超时时合并错过的节拍，对齐到下一个未来节拍"""
+    clock = FakeClock()
+    scheduler = FixedRateScheduler(10, clock=clock, wait=clock.wait)
+    durations = [25, 1, 1]
+    starts = []
+
+    def task():
+        starts.append(clock.now)
+        clock.now += durations[len(starts) - 1]
+
+    scheduler.run(task, lambda: len(starts) < 3)
+
+    # 第一次耗时 25 秒，错过 10、20 两个节拍，下一次在 30 秒
+    assert starts == [0, 30, 40]
+    stats = scheduler.stats()
+    assert stats['overruns'] == 1
+    assert stats['skipped'] == 2
+    assert stats['ticks'] == 3
+
+
+def test_task_error():
+    """任务异常不中断调度"""
+    clock = FakeClock()
+    scheduler = FixedRateScheduler(1, clock=clock, wait=clock.wait)
+    calls = []
+
+    def task():
+        calls.append(clock.now)
+        raise RuntimeError("扫描失败")
+
+    scheduler.run(task, lambda: len(calls) < 3)
+    assert len(calls) == 3
+
+
+def test_interval_fn():
+    """interval_fn 按每次执行后的返回值决定下一个间隔"""
+    clock = FakeClock()
+    intervals = iter([5, 3600, 5, 60])
+    scheduler = FixedRateScheduler(60, clock=clock, wait=clock.wait, interval_fn=lambda: next(intervals))
+    starts = []
+
+    scheduler.run(lambda: starts.append(clock.now), lambda: len(starts) < 4)
+    assert starts == [0, 5, 3605, 3610]
+
+
+def test_stop_wakes_wait():
+    """stop() 立即结束等待"""
+    scheduler = FixedRateScheduler(60)
+    calls = []
+    thread = threading.Thread(target=scheduler.run, args=(lambda: calls.append(1),))
+    thread.start()
+
+    time.sleep(0.1)
+    start = time.perf_counter()
+    scheduler.stop()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert time.perf_counter() - start < 1
+    assert calls == [1]
+
+
+if __name__ == "__main__":
+    test_fixed_rate()
+    test_overrun_skips_ticks()
+    test_task_error()
+    test_interval_fn()
+    test_stop_wakes_wait()
+    print("✅ 定频调度测试通过")
@@ -0,0 +1,81 @@
+"""
+交易日历测试脚本
+"""
+from datetime import date, datetime, timezone
+
+from src.utils.trading_calendar import (
+    CST, PHASE_CALL_AUCTION, PHASE_CLOSED, PHASE_CLOSING_AUCTION, PHASE_CONTINUOUS,
+    PHASE_LUNCH_BREAK, PHASE_PRE_OPEN, SessionPacer, TradingCalendar, load_holidays
+)
+
+# 2026-10-01 ~ 10-07 国庆休市，10-08（周四）开市
+CALENDAR = TradingCalendar([date(2026, 10, d) for d in (1, 2, 5, 6, 7)])
+
+
+def test_trading_days():
+    """周末和休市日不是交易日"""
+    assert CALENDAR.is_trading_day(date(2026, 9, 30))
+    assert not CALENDAR.is_trading_day(date(2026, 10, 1))
+    assert not CALENDAR.is_trading_day(date(2026, 10, 3))  # 周六
+    assert CALENDAR.is_trading_day(date(2026, 10, 8))
+    # 未配置休市日的年份只排除周末
+    assert CALENDAR.is_trading_day(date(2030, 1, 1))
+    assert not CALENDAR.is_trading_day(date(2030, 1, 5))
+    assert CALENDAR.next_trading_day(date(2026, 9, 30)) == date(2026, 10, 8)
+    assert CALENDAR.previous_trading_day(date(2026, 10, 8)) == date(2026, 9, 30)
+
+
+def test_phases():
+    """交易日内的各阶段"""
+    day = (2026, 9, 30)
+    assert CALENDAR.phase(datetime(*day, 9, 0)) == PHASE_CLOSED
+    assert CALENDAR.phase(datetime(*day, 9, 15)) == PHASE_CALL_AUCTION
+    assert CALENDAR.phase(datetime(*day, 9, 27)) == PHASE_PRE_OPEN
+    assert CALENDAR.phase(datetime(*day, 10, 0)) == PHASE_CONTINUOUS
+    assert CALENDAR.phase(datetime(*day, 12, 0)) == PHASE_LUNCH_BREAK
+    assert CALENDAR.phase(datetime(*day, 13, 0)) == PHASE_CONTINUOUS
+    assert CALENDAR.phase(datetime(*day, 14, 58)) == PHASE_CLOSING_AUCTION
+    assert CALENDAR.phase(datetime(*day, 15, 0)) == PHASE_CLOSED
+    assert CALENDAR.phase(datetime(2026, 10, 1, 10, 0)) == PHASE_CLOSED
+
+    # 带时区的时间换算为北京时间：UTC 02:00 = 北京 10:00
+    assert CALENDAR.phase(datetime(*day, 2, 0, tzinfo=timezone.utc)) == PHASE_CONTINUOUS
+
+
+def test_pacer_intervals():
+    """扫描阶段按配置间隔，非扫描阶段休眠到下一个扫描阶段"""
+    pacer = SessionPacer(CALENDAR, 60, {'closing_auction': 15, 'pre_open': None})
+
+    assert pacer.interval(datetime(2026, 9, 30, 10, 0)) == 60
+    # 不超过到阶段切换的时间
+    assert pacer.interval(datetime(2026, 9, 30, 14, 56, 30)) == 30
+    assert pacer.interval(datetime(2026, 9, 30, 14, 58)) == 15
+
+    # 午休：休眠到 13:00
+    assert pacer.interval(datetime(2026, 9, 30, 12, 0)) == 3600
+    assert not pacer.should_scan(datetime(2026, 9, 30, 12, 0))
+
+    # 开盘集合竞价后的 pre_open 不扫描，休眠到 09:30
+    assert pacer.interval(datetime(2026, 9, 30, 9, 26)) == 240
+
+    # 收盘后跨过国庆长假，到 10-08 09:15 开盘集合竞价
+    after_close = datetime(2026, 9, 30, 15, 0, tzinfo=CST)
+    expected = datetime(2026, 10, 8, 9, 15, tzinfo=CST)
+    assert pacer.next_scan_start(after_close) == expected
+    assert pacer.interval(after_close) == (expected - after_close).total_seconds()
+
+
+def test_load_holidays():
+    """仓库中的休市日文件可以加载"""
+    holidays = load_holidays('config/holidays.yml')
+    assert date(2026, 10, 1) in holidays
+    assert all(day.weekday() < 5 for day in holidays)
+    assert load_holidays('config/not_exists.yml') == []
+
+
+if __name__ == "__main__":
+    test_trading_days()
+    test_phases()
+    test_pacer_intervals()
+    test_load_holidays()
+    print("✅ 交易日历测试通过")
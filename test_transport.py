@@ -0,0 +1,165 @@
+"""
+重试与熔断传输层测试脚本
+使用本地 HTTP 服务模拟故障接口
+"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.utils.transport import CircuitBreaker, CircuitOpenError, ResilientAdapter
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """前 fail_count 次请求返回 503，之后返回 200"""
+
+    fail_count = 0
+    requests_seen = 0
+
+    def do_GET(self):
+        FlakyHandler.requests_seen += 1
+        status = 503 if FlakyHandler.requests_seen <= FlakyHandler.fail_count else 200
+        self.send_response(status)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(fail_count: int) -> ThreadingHTTPServer:
+    FlakyHandler.fail_count = fail_count
+    FlakyHandler.requests_seen = 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_session(**kwargs) -> requests.Session:
+    session = requests.Session()
+    adapter = ResilientAdapter(backoff_base=0.01, backoff_max=0.02, **kwargs)
+    session.mount('http://', adapter)
+    return session
+
+
+def test_retry_recovers():
+    """临时故障：重试后成功，熔断器保持关闭"""
+    server = start_server(fail_count=2)
+    session = make_session(retries=2)
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    resp = session.get(url, timeout=2)
+    server.shutdown()
+
+    assert resp.status_code == 200
+    assert FlakyHandler.requests_seen == 3
+    state = session.get_adapter(url).states()
+    print(f"熔断器状态: {state}")
+    assert list(state.values())[0]['state'] == CircuitBreaker.CLOSED
+
+
+def test_circuit_opens_and_fails_fast():
+    """持续故障：熔断后直接拒绝，不再访问主机"""
+    server = start_server(fail_count=1000)
+    session = make_session(retries=1, failure_threshold=4, recovery_timeout=60)
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    # 两次请求（各重试一次）共 4 次失败，熔断器打开
+    for _ in range(2):
+        assert session.get(url, timeout=2).status_code == 503
+    assert FlakyHandler.requests_seen == 4
+
+    start = time.perf_counter()
+    for _ in range(10):
+        try:
+            session.get(url, timeout=2)
+            raise AssertionError("应当抛出 CircuitOpenError")
+        except CircuitOpenError:
+            pass
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+
+    assert FlakyHandler.requests_seen == 4
+    assert elapsed < 0.1
+    state = list(session.get_adapter(url).states().values())[0]
+    assert state['state'] == CircuitBreaker.OPEN
+    assert state['rejected'] == 10
+
+
+def test_half_open_probe():
+    """熔断恢复期过后只放行一个探测请求"""
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=30, clock=lambda: now[0])
+
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    now[0] = 31
+    assert breaker.allow()        # 探测请求
+    assert not breaker.allow()    # 探测期间其他请求仍被拒绝
+
+    # 探测失败：重新打开
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    # 再次探测成功：关闭
+    now[0] = 62
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+
+def test_probe_unexpected_error():
+    """探测请求抛出其他异常时同样记录失败，熔断器不会卡在半开状态"""
+    session = make_session(retries=0, failure_threshold=1, recovery_timeout=0.05)
+    url = "http://127.0.0.1:1/"
+
+    with mock.patch.object(HTTPAdapter, 'send', side_effect=ValueError("bad response")):
+        for _ in range(2):
+            try:
+                session.get(url)
+                raise AssertionError("应当抛出 ValueError")
+            except ValueError:
+                pass
+            breaker = list(session.get_adapter(url).breakers.values())[0]
+            assert breaker.state == CircuitBreaker.OPEN
+            time.sleep(0.06)   # 恢复期后的下一次请求是探测请求
+
+    # 探测失败后重新打开，恢复期后仍会放行新的探测请求
+    assert breaker.allow()
+
+
+def test_fetcher_metrics():
+    """熔断器状态和对冲统计注册为采集指标"""
+    from src.utils.data_fetcher import DataFetcher
+    from src.utils.metrics import metrics
+    from src.utils.metrics_server import render
+
+    fetcher = DataFetcher(source="hedged")
+    fetcher.adapter.breaker('push2.eastmoney.com').record_failure()
+    fetcher.register_metrics()
+    text = render(metrics)
+    fetcher.hedger.shutdown()
+
+    assert 'arbitrage_circuit_breaker_state{host="push2.eastmoney.com"} 0' in text
+    assert 'arbitrage_circuit_breaker_trips_total{host="push2.eastmoney.com"} 0' in text
+    assert '# TYPE arbitrage_circuit_breaker_rejected_total counter' in text
+    assert 'arbitrage_hedge_requests_total{kind="calls"} 0' in text
+    assert 'arbitrage_hedge_delay_seconds ' in text
+
+
+if __name__ == "__main__":
+    test_retry_recovers()
+    test_circuit_opens_and_fails_fast()
+    test_half_open_probe()
+    test_probe_unexpected_error()
+    test_fetcher_metrics()
+    print("✅ 传输层测试通过")
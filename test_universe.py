@@ -0,0 +1,64 @@
+"""
+LOF 全市场筛选测试脚本
+"""
+import json
+
+from src.utils.nav_cache import NavCache
+from src.utils.universe import LOFUniverse
+from test_data_fetcher import make_fetcher
+
+
+def make_clist(items: list, total: int) -> str:
+    diff = [
+        {'f12': code, 'f13': 0, 'f14': f'基金{code}', 'f2': price, 'f5': volume, 'f6': amount}
+        for code, price, volume, amount in items
+    ]
+    return json.dumps({'rc': 0, 'data': {'total': total, 'diff': diff}})
+
+
+def test_lof_list_paging():
+    """全部 LOF 分页拉取，停牌字段按 0 处理"""
+    fetcher = make_fetcher({
+        'pn=1&': make_clist([('163406', 2.258, 12345, 2.8e6), ('161725', 1.1, 500, 5.5e4)], total=3),
+        'pn=2&': make_clist([('160642', '-', '-', '-')], total=3),
+    })
+
+    funds = fetcher.get_lof_list(page_size=2)
+    assert [f['code'] for f in funds] == ['163406', '161725', '160642']
+    assert funds[2]['price'] == 0.0 and funds[2]['volume'] == 0
+    assert len(fetcher.session.calls) == 2
+
+
+def test_universe_screen():
+    """接近阈值的按偏离程度排在前面，缺少净值的按成交额补充"""
+    fetcher = make_fetcher({
+        'clist/get': make_clist([
+            ('100001', 1.030, 1000, 1e5),   # 溢价 3%
+            ('100002', 1.001, 1000, 1e5),   # 溢价 0.1%，远离阈值
+            ('100003', 0.980, 1000, 1e5),   # 折价 2%
+            ('100004', 1.050, 10, 1e3),     # 溢价 5%，但成交量不足
+            ('100005', 1.000, 1000, 1e5),   # 没有净值，成交额小
+            ('100006', 1.000, 1000, 9e5),   # 没有净值，成交额大
+            ('100007', 0.000, 0, 0),        # 停牌
+        ], total=7),
+    })
+
+    cache = NavCache(path=None)
+    for code in ['100001', '100002', '100003', '100004']:
+        cache.put(code, 1.0, '2026-02-13')
+
+    universe = LOFUniverse(fetcher, nav_cache=cache, min_volume=100, near_ratio=0.5)
+    frame = universe.refresh()
+    assert len(frame) == 7
+
+    candidates = universe.screen(min_premium_rate=0.03, min_discount_rate=0.02)
+    assert candidates == ['100001', '100003', '100006', '100005']
+
+    universe.max_candidates = 2
+    assert universe.screen(0.03, 0.02) == ['100001', '100003']
+
+
+if __name__ == "__main__":
+    test_lof_list_paging()
+    test_universe_screen()
+    print("✅ LOF 全市场筛选测试通过")